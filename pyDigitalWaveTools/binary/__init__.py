@@ -0,0 +1,4 @@
+"""
+A module for producing and loading of wave data in a compact block structured binary format
+(:mod:`pyDigitalWaveTools.binary.block`)
+"""
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Block structured binary wave format
+
+.. code-block:: text
+
+    b"PDWTBIN1"
+    block*                  compressed, each block contains changes of a single signal
+    index                   zlib compressed json:
+                            {"header": <columnar json header>, "compression": "zlib"|"lzma"|"none",
+                             "blocks": {"<signal id>": [[offset, size, first time, last time, count], ...]}}
+    trailer                 uint64 LE index offset, uint64 LE index size, b"PDWTBIN1"
+
+Block before compression:
+
+.. code-block:: text
+
+    varint count
+    varint first time, varint time deltas (count - 1)
+    values as utf-8 json array
+
+The blocks of a single signal are in time order so the reader can load only
+the blocks which intersect with the requested time window.
+"""
+
+import json
+import lzma
+import struct
+from typing import List, Tuple
+import zlib
+
+BINARY_WAVE_MAGIC = b"PDWTBIN1"
+BINARY_WAVE_TRAILER = struct.Struct("<QQ8s")
+BINARY_WAVE_COMPRESSIONS = ("zlib", "lzma", "none")
+
+
+def encodeVarints(values, buff: bytearray):
+    """
+    Append unsigned LEB128 encoded values to buff
+    """
+    append = buff.append
+    for v in values:
+        while v >= 0x80:
+            append((v & 0x7f) | 0x80)
+            v >>= 7
+        append(v)
+
+
+def decodeVarints(buff: bytes, count: int, pos: int=0) -> Tuple[List[int], int]:
+    """
+    :return: tuple (list of decoded values, position after last value)
+    """
+    res = []
+    append = res.append
+    for _ in range(count):
+        v = 0
+        shift = 0
+        while True:
+            b = buff[pos]
+            pos += 1
+            v |= (b & 0x7f) << shift
+            if b < 0x80:
+                break
+            shift += 7
+        append(v)
+    return res, pos
+
+
+def compressBlock(data: bytes, compression: str, level: int) -> bytes:
+    if compression == "zlib":
+        return zlib.compress(data, level)
+    elif compression == "lzma":
+        return lzma.compress(data, preset=level)
+    elif compression == "none":
+        return data
+    else:
+        raise ValueError("Unknown compression", compression)
+
+
+def decompressBlock(data: bytes, compression: str) -> bytes:
+    if compression == "zlib":
+        return zlib.decompress(data)
+    elif compression == "lzma":
+        return lzma.decompress(data)
+    elif compression == "none":
+        return data
+    else:
+        raise ValueError("Unknown compression", compression)
+
+
+def encodeBlock(data: List[Tuple[int, object]]) -> bytes:
+    """
+    Encode list of tuples (time, value), the values have to be json serializable
+    """
+    buff = bytearray()
+    encodeVarints((len(data),), buff)
+    prevT = 0
+    deltas = []
+    for t, _ in data:
+        deltas.append(t - prevT)
+        prevT = t
+    encodeVarints(deltas, buff)
+    buff += json.dumps([d[1] for d in data], separators=(",", ":")).encode()
+    return bytes(buff)
+
+
+def decodeBlock(buff: bytes) -> Tuple[List[int], List[object]]:
+    """
+    :return: tuple (times, values)
+    """
+    (count,), pos = decodeVarints(buff, 1)
+    deltas, pos = decodeVarints(buff, count, pos)
+    times = []
+    t = 0
+    for d in deltas:
+        t += d
+        times.append(t)
+    values = json.loads(buff[pos:])
+    return times, values
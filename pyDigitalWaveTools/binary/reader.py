@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_right
+import json
+from typing import Dict, List, Optional, Tuple, Union
+import zlib
+
+from pyDigitalWaveTools.binary.block import BINARY_WAVE_MAGIC, \
+    BINARY_WAVE_TRAILER, decodeBlock, decompressBlock
+from pyDigitalWaveTools.json.parser import JsonParser
+from pyDigitalWaveTools.vcd.common import VcdVarInfo, VcdVarScope
+from pyDigitalWaveTools.vcd.parser import VcdVarParsingInfo
+
+
+class BinaryWaveReader():
+    """
+    Reader of the files produced by :class:`BinaryWaveWriter`, only the index is read
+    when the file is opened, the blocks are read on demand.
+
+    .. code-block:: python
+
+        with open("wave.bin", "rb") as f:
+            r = BinaryWaveReader(f)
+            r.loadSignal("top.sig", 1000, 2000)
+
+    :ivar ~.scope: root VcdVarScope, variables are VcdVarParsingInfo with empty data
+        until :meth:`~.load` is called
+    :ivar ~.idcode2var: dictionary {signal id: VcdVarParsingInfo}
+    :ivar ~.compression: compression of blocks
+    """
+
+    def __init__(self, iFile):
+        self._iFile = iFile
+        iFile.seek(0)
+        if iFile.read(len(BINARY_WAVE_MAGIC)) != BINARY_WAVE_MAGIC:
+            raise ValueError("Not a binary wave file")
+        iFile.seek(-BINARY_WAVE_TRAILER.size, 2)
+        indexOffset, indexSize, magic = BINARY_WAVE_TRAILER.unpack(iFile.read(BINARY_WAVE_TRAILER.size))
+        if magic != BINARY_WAVE_MAGIC:
+            raise ValueError("Truncated binary wave file")
+        iFile.seek(indexOffset)
+        index = json.loads(zlib.decompress(iFile.read(indexSize)))
+
+        self.compression = index["compression"]
+        # {signal id: list of blocks [offset, size, first time, last time, count]}
+        self._blocks: Dict[int, List[list]] = {int(k): v for k, v in index["blocks"].items()}
+        p = JsonParser()
+        p.parse_obj(index["header"])
+        self.scope = p.scope
+        self.idcode2var: Dict[int, VcdVarParsingInfo] = p.idcode2var
+
+    def _resolveVar(self, var: Union[str, VcdVarInfo]) -> VcdVarParsingInfo:
+        if isinstance(var, str):
+            o = self.scope
+            for name in var.split("."):
+                o = o.children[name]
+            if isinstance(o, VcdVarScope):
+                raise KeyError("Not a variable", var)
+            var = o
+        while isinstance(var.vcdId, VcdVarInfo):
+            var = var.vcdId
+        return var
+
+    def _readBlock(self, block: list) -> Tuple[List[int], List[object]]:
+        f = self._iFile
+        f.seek(block[0])
+        return decodeBlock(decompressBlock(f.read(block[1]), self.compression))
+
+    def loadSignal(self, var: Union[str, VcdVarInfo], t0: Optional[int]=None,
+                   t1: Optional[int]=None) -> List[Tuple[int, object]]:
+        """
+        Read changes of a single signal in time window [t0, t1], only the blocks
+        which intersect with the window are read
+
+        :param var: variable or its path (names separated by ".", without root)
+        :return: list of tuples (time, value), the first item is the last change at or before t0 (if any)
+            so the value at t0 is known
+        """
+        var = self._resolveVar(var)
+        blocks = self._blocks.get(var.vcdId, [])
+        if t0 is None:
+            first = 0
+        else:
+            # last block which starts before or at t0
+            first = max(bisect_right([b[2] for b in blocks], t0) - 1, 0)
+
+        res = []
+        for b in blocks[first:]:
+            if t1 is not None and b[2] > t1:
+                break
+            times, values = self._readBlock(b)
+            res.extend(zip(times, values))
+
+        if t0 is not None:
+            # keep the last change at or before t0
+            i = bisect_right([d[0] for d in res], t0) - 1
+            if i > 0:
+                res = res[i:]
+        if t1 is not None:
+            res = res[:bisect_right([d[0] for d in res], t1)]
+        return res
+
+    def load(self, variables: Optional[List[Union[str, VcdVarInfo]]]=None,
+             t0: Optional[int]=None, t1: Optional[int]=None):
+        """
+        Load data of selected variables (all if None) to VcdVarParsingInfo.data
+
+        :see: :meth:`~.loadSignal`
+        """
+        if variables is None:
+            variables = list(self.idcode2var.values())
+        for v in variables:
+            v = self._resolveVar(v)
+            # in place so the aliases share the data
+            v.data[:] = self.loadSignal(v, t0, t1)
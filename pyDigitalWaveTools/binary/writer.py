@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+from typing import Dict, List, Tuple
+import zlib
+
+from pyDigitalWaveTools.binary.block import BINARY_WAVE_MAGIC, \
+    BINARY_WAVE_TRAILER, BINARY_WAVE_COMPRESSIONS, encodeBlock, compressBlock
+from pyDigitalWaveTools.json.columnar_writer import JsonColumnarWriter
+
+
+class BinaryWaveOutput():
+    """
+    Low level writer of binary wave format (:mod:`pyDigitalWaveTools.binary.block`),
+    same interface as :class:`JsonColumnarOutput`
+
+    :ivar ~.compression: "zlib", "lzma" or "none"
+    :ivar ~.level: compression level
+    """
+
+    def __init__(self, oFile, compression: str="zlib", level: int=6):
+        if compression not in BINARY_WAVE_COMPRESSIONS:
+            raise ValueError("Unknown compression", compression)
+        self._oFile = oFile
+        self.compression = compression
+        self.level = level
+        self._header = None
+        # {varId: [[offset, size, first time, last time, count], ...]}
+        self._blocks: Dict[int, List[list]] = {}
+        oFile.write(BINARY_WAVE_MAGIC)
+        self._offset = len(BINARY_WAVE_MAGIC)
+
+    def writeHeader(self, root: dict):
+        # the header is a part of the index at the end of the file
+        self._header = root
+
+    def writeChunk(self, varId: int, data: List[Tuple[int, object]]):
+        """
+        Write block of data and clear data list
+        """
+        b = compressBlock(encodeBlock(data), self.compression, self.level)
+        self._oFile.write(b)
+        blocks = self._blocks.get(varId, None)
+        if blocks is None:
+            blocks = self._blocks[varId] = []
+        blocks.append([self._offset, len(b), data[0][0], data[-1][0], len(data)])
+        self._offset += len(b)
+        data.clear()
+
+    def close(self):
+        index = zlib.compress(json.dumps({
+            "header": self._header,
+            "compression": self.compression,
+            "blocks": self._blocks,
+        }, separators=(",", ":")).encode())
+        self._oFile.write(index)
+        self._oFile.write(BINARY_WAVE_TRAILER.pack(self._offset, len(index), BINARY_WAVE_MAGIC))
+
+
+class BinaryWaveWriter(JsonColumnarWriter):
+    """
+    Writer of block structured binary wave format, at most blockSize changes per variable are kept in memory.
+    The value formatters are the same as for :class:`JsonWriter`.
+
+    .. code-block:: python
+
+        with open("wave.bin", "wb") as f:
+            w = BinaryWaveWriter(f)
+            with w.varScope("top") as top:
+                top.addVar(sig, "sig", VCD_SIG_TYPE.WIRE, 8, JsonBitsFormatter())
+            w.enddefinitions()
+            w.logChange(0, sig, value, None)
+            w.close()
+
+    :note: the file is opened in binary mode
+    """
+
+    def __init__(self, oFile, blockSize: int=4096, compression: str="zlib", level: int=6):
+        super(BinaryWaveWriter, self).__init__(oFile, chunkSize=blockSize)
+        self._out = BinaryWaveOutput(oFile, compression, level)
@@ -0,0 +1,3 @@
+"""
+A module for reading of Fast Signal Trace (FST) files (format of GTKWave, dumped by Verilator, GHDL, Icarus, ...)
+"""
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pure Python decompressors for the compression formats used in FST files
+which are not available in the standard library (LZ4 block format and FastLZ)
+"""
+
+
+def _copyMatch(dst: bytearray, distance: int, length: int):
+    start = len(dst) - distance
+    if start < 0:
+        raise ValueError("Invalid match distance", distance)
+    if distance >= length:
+        dst += dst[start:start + length]
+    else:
+        # overlapping copy (run)
+        for i in range(start, start + length):
+            dst.append(dst[i])
+
+
+def lz4BlockDecompress(src: bytes) -> bytes:
+    """
+    Decompress data in LZ4 block format (without frame)
+    """
+    dst = bytearray()
+    i = 0
+    n = len(src)
+    while i < n:
+        token = src[i]
+        i += 1
+        litLen = token >> 4
+        if litLen == 15:
+            while True:
+                b = src[i]
+                i += 1
+                litLen += b
+                if b != 255:
+                    break
+        dst += src[i:i + litLen]
+        i += litLen
+        if i >= n:
+            # last sequence contains only literals
+            break
+        distance = src[i] | (src[i + 1] << 8)
+        i += 2
+        matchLen = token & 15
+        if matchLen == 15:
+            while True:
+                b = src[i]
+                i += 1
+                matchLen += b
+                if b != 255:
+                    break
+        _copyMatch(dst, distance, matchLen + 4)
+    return bytes(dst)
+
+
+# max distance for FastLZ level 2 short matches
+_FASTLZ_MAX_L2_DISTANCE = 8191
+
+
+def fastlzDecompress(src: bytes) -> bytes:
+    """
+    Decompress FastLZ data (level 1 and 2, the level is in the first byte)
+    """
+    if not src:
+        return b""
+    level = (src[0] >> 5) + 1
+    if level not in (1, 2):
+        raise ValueError("Unknown FastLZ level", level)
+    dst = bytearray()
+    n = len(src)
+    ctrl = src[0] & 31
+    i = 1
+    while True:
+        if ctrl >= 32:
+            length = (ctrl >> 5) - 1
+            distance = (ctrl & 31) << 8
+            if length == 6:
+                if level == 1:
+                    length += src[i]
+                    i += 1
+                else:
+                    while True:
+                        b = src[i]
+                        i += 1
+                        length += b
+                        if b != 255:
+                            break
+            code = src[i]
+            i += 1
+            distance += code
+            if level == 2 and code == 255 and distance == (31 << 8) + 255:
+                distance = ((src[i] << 8) | src[i + 1]) + _FASTLZ_MAX_L2_DISTANCE
+                i += 2
+            _copyMatch(dst, distance + 1, length + 3)
+        else:
+            ctrl += 1
+            dst += src[i:i + ctrl]
+            i += ctrl
+        if i >= n:
+            break
+        ctrl = src[i]
+        i += 1
+    return bytes(dst)
@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pure Python reader of Fast Signal Trace (FST) files
+
+.. code-block:: python
+
+    with open("dump.fst", "rb") as f:
+        fst = FstReader(signals={"top.dut.clk"})
+        fst.parse(f)
+    fst.scope.children["top"].children["dut"].children["clk"].data
+
+The file is a sequence of blocks (1B type, 8B big-endian length which includes itself, payload).
+The header, geometry (signal lengths) and hierarchy blocks are read first
+(the hierarchy is usually at the end of the file), then the value change blocks are processed in order.
+Each value change block contains the values of all signals at its start,
+per-signal compressed chains of value changes (zlib, FastLZ or LZ4), a table of positions
+of the chains and a table of times.
+
+The values are converted to the same format as :class:`pyDigitalWaveTools.vcd.parser.VcdParser` produces
+("0", "x", "b0101", "r1.5").
+"""
+
+import gzip
+import io
+import mmap
+import struct
+from typing import Collection, Dict, List, Optional, Tuple
+import zlib
+
+from pyDigitalWaveTools.fst.decompress import fastlzDecompress, lz4BlockDecompress
+from pyDigitalWaveTools.vcd.common import VcdVarScope, VCD_REAL_SIG_TYPES
+from pyDigitalWaveTools.vcd.parser import VcdVarParsingInfo
+
+FST_BL_HDR = 0
+FST_BL_VCDATA = 1
+FST_BL_BLACKOUT = 2
+FST_BL_GEOM = 3
+FST_BL_HIER = 4
+FST_BL_VCDATA_DYN_ALIAS = 5
+FST_BL_HIER_LZ4 = 6
+FST_BL_HIER_LZ4DUO = 7
+FST_BL_VCDATA_DYN_ALIAS2 = 8
+FST_BL_ZWRAPPER = 254
+FST_BL_SKIP = 255
+
+FST_VCDATA_BLOCKS = (FST_BL_VCDATA, FST_BL_VCDATA_DYN_ALIAS, FST_BL_VCDATA_DYN_ALIAS2)
+
+FST_ST_GEN_ATTRBEGIN = 252
+FST_ST_GEN_ATTREND = 253
+FST_ST_VCD_SCOPE = 254
+FST_ST_VCD_UPSCOPE = 255
+
+# names of variable types, index is the FST type code
+FST_VAR_TYPES = (
+    "event", "integer", "parameter", "real", "real_parameter", "reg", "supply0",
+    "supply1", "time", "tri", "triand", "trior", "trireg", "tri0", "tri1",
+    "wand", "wire", "wor", "port", "sparray", "realtime", "string",
+    "bit", "logic", "int", "shortint", "longint", "byte", "enum", "shortreal",
+)
+
+# values of 1 bit signals which are not 0/1
+_FST_RCV_STR = "xzhuwl-?"
+
+_TIMESCALE_UNITS = ((0, "s"), (-3, "ms"), (-6, "us"), (-9, "ns"), (-12, "ps"), (-15, "fs"))
+
+_U64 = struct.Struct(">Q")
+_HEADER = struct.Struct(">QQ8sQQQQQb128s119sBq")
+_ENDIAN_TEST = 2.7182818284590452354
+
+
+def _zstr(buff: bytes, pos: int) -> Tuple[str, int]:
+    end = buff.index(b"\0", pos)
+    return buff[pos:end].decode(), end + 1
+
+
+def _varint(buff: bytes, pos: int) -> Tuple[int, int]:
+    v = 0
+    shift = 0
+    while True:
+        b = buff[pos]
+        pos += 1
+        v |= (b & 0x7f) << shift
+        if b < 0x80:
+            return v, pos
+        shift += 7
+
+
+def _svarint(buff: bytes, pos: int) -> Tuple[int, int]:
+    v = 0
+    shift = 0
+    while True:
+        b = buff[pos]
+        pos += 1
+        v |= (b & 0x7f) << shift
+        shift += 7
+        if b < 0x80:
+            if b & 0x40:
+                v -= 1 << shift
+            return v, pos
+
+
+def fstTimescaleToStr(exponent: int) -> str:
+    """
+    Convert timescale exponent (time unit is 10**exponent s) to VCD format e.g. "100ps"
+    """
+    for unitExp, unit in _TIMESCALE_UNITS:
+        if exponent >= unitExp:
+            return f"{10 ** (exponent - unitExp):d}{unit:s}"
+    return f"1e{exponent:d}s"
+
+
+class FstReader():
+    """
+    Reader of FST files which produces the same data structures as :class:`pyDigitalWaveTools.vcd.parser.VcdParser`
+
+    :ivar ~.signals: None (load all) or collection of paths of signals (names separated by ".",
+        without root, e.g. "top.clk") or scopes whose signals are loaded, the chains of the other
+        signals are not decompressed
+    :ivar ~.scope: root VcdVarScope
+    :ivar ~.idcode2var: dictionary {FST handle: VcdVarParsingInfo}
+    :ivar ~.idcode2series: dictionary {FST handle: list of tuples (time, value)}
+    :ivar ~.start_time: start time from header
+    :ivar ~.end_time: end time from header
+    :ivar ~.timescale: timescale string in VCD format (e.g. "1ps")
+    :ivar ~.version: simulator version from header
+    :ivar ~.date: date from header
+    """
+
+    def __init__(self, signals: Optional[Collection[str]]=None):
+        self.signals = signals
+        self.scope = VcdVarScope("root", None)
+        self.idcode2var: Dict[int, VcdVarParsingInfo] = {}
+        self.idcode2series: Dict[int, List[Tuple[int, str]]] = {}
+        # signal length for each handle (index is handle - 1)
+        self._lens: List[int] = []
+        # True for real signals (index is handle - 1)
+        self._isReal: List[bool] = []
+        self._doubleFmt = struct.Struct("<d")
+
+    def parse(self, file_handle):
+        """
+        :param file_handle: FST file opened in binary mode, the file is memory mapped if possible
+        """
+        try:
+            buff = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            buff = file_handle.read()
+        try:
+            if len(buff) and buff[0] == FST_BL_ZWRAPPER:
+                # whole file is compressed by gzip
+                self.parse_bytes(gzip.decompress(buff[1 + 8 + 8:]))
+            else:
+                self.parse_bytes(buff)
+        finally:
+            if isinstance(buff, mmap.mmap):
+                buff.close()
+
+    def parse_bytes(self, buff: bytes):
+        """
+        Same as :meth:`~.parse` just for bytes
+        """
+        blocks = []
+        pos = 0
+        n = len(buff)
+        while pos < n:
+            blockType = buff[pos]
+            secLen, = _U64.unpack_from(buff, pos + 1)
+            if secLen < 8:
+                raise ValueError("Corrupted FST block", pos, blockType, secLen)
+            blocks.append((blockType, pos + 1, secLen))
+            pos += 1 + secLen
+
+        for blockType, pos, secLen in blocks:
+            if blockType == FST_BL_HDR:
+                self._readHeader(buff, pos + 8)
+        for blockType, pos, secLen in blocks:
+            if blockType == FST_BL_GEOM:
+                self._readGeometry(buff, pos + 8, secLen)
+        for blockType, pos, secLen in blocks:
+            if blockType in (FST_BL_HIER, FST_BL_HIER_LZ4, FST_BL_HIER_LZ4DUO):
+                self._readHierarchy(buff, blockType, pos + 8, secLen)
+
+        selected = self._selectedHandles()
+        lastValues: List[Optional[str]] = [None for _ in self._lens]
+        for blockType, pos, secLen in blocks:
+            if blockType in FST_VCDATA_BLOCKS:
+                self._readValueChanges(buff, blockType, pos, secLen, selected, lastValues)
+
+    def _readHeader(self, buff: bytes, pos: int):
+        (self.start_time, self.end_time, endianTest, _, _, _, _, _, timescale,
+         version, date, _, self.timezero) = _HEADER.unpack_from(buff, pos)
+        if struct.unpack("<d", endianTest)[0] == _ENDIAN_TEST:
+            self._doubleFmt = struct.Struct("<d")
+        else:
+            self._doubleFmt = struct.Struct(">d")
+        self.timescale = fstTimescaleToStr(timescale)
+        self.version = version.split(b"\0", 1)[0].decode()
+        self.date = date.split(b"\0", 1)[0].decode().strip()
+
+    def _readGeometry(self, buff: bytes, pos: int, secLen: int):
+        uclen, maxHandle = struct.unpack_from(">QQ", buff, pos)
+        clen = secLen - 24
+        data = buff[pos + 16:pos + 16 + clen]
+        if clen != uclen:
+            data = zlib.decompress(data)
+        lens = []
+        isReal = []
+        p = 0
+        for _ in range(maxHandle):
+            v, p = _varint(data, p)
+            if v == 0:
+                lens.append(8)
+                isReal.append(True)
+            else:
+                lens.append(0 if v == 0xFFFFFFFF else v)
+                isReal.append(False)
+        self._lens = lens
+        self._isReal = isReal
+
+    def _readHierarchy(self, buff: bytes, blockType: int, pos: int, secLen: int):
+        uclen, = _U64.unpack_from(buff, pos)
+        data = buff[pos + 8:pos - 8 + secLen]
+        if blockType == FST_BL_HIER:
+            data = gzip.decompress(data)
+        elif blockType == FST_BL_HIER_LZ4:
+            data = lz4BlockDecompress(data)
+        else:
+            _, p = _varint(data, 0)
+            data = lz4BlockDecompress(lz4BlockDecompress(data[p:]))
+        if len(data) != uclen:
+            raise ValueError("Corrupted FST hierarchy", len(data), uclen)
+
+        scope = self.scope
+        handle = 0
+        p = 0
+        n = len(data)
+        while p < n:
+            tag = data[p]
+            p += 1
+            if tag == FST_ST_VCD_SCOPE:
+                p += 1  # scope type
+                name, p = _zstr(data, p)
+                _, p = _zstr(data, p)  # component
+                ch = scope.children.get(name, None)
+                if ch is None:
+                    ch = scope.children[name] = VcdVarScope(name, scope)
+                scope = ch
+            elif tag == FST_ST_VCD_UPSCOPE:
+                scope = scope.parent
+            elif tag == FST_ST_GEN_ATTRBEGIN:
+                p += 2  # attr type, subtype
+                _, p = _zstr(data, p)
+                _, p = _varint(data, p)
+            elif tag == FST_ST_GEN_ATTREND:
+                pass
+            elif tag < len(FST_VAR_TYPES):
+                p += 1  # direction
+                name, p = _zstr(data, p)
+                width, p = _varint(data, p)
+                alias, p = _varint(data, p)
+                sigType = FST_VAR_TYPES[tag]
+                if alias:
+                    info = VcdVarParsingInfo(self.idcode2var[alias], name, width, sigType, scope)
+                else:
+                    handle += 1
+                    info = VcdVarParsingInfo(handle, name, width, sigType, scope)
+                    self.idcode2var[handle] = info
+                    self.idcode2series[handle] = info.data
+                    if len(self._lens) < handle:
+                        # geometry block missing
+                        self._lens.append(8 if sigType in VCD_REAL_SIG_TYPES else width)
+                        self._isReal.append(sigType in VCD_REAL_SIG_TYPES)
+                scope.children[name] = info
+            else:
+                raise ValueError("Unknown FST hierarchy tag", tag, p - 1)
+
+    def _selectedHandles(self) -> Optional[List[bool]]:
+        """
+        :return: None if all signals are loaded, else list of flags for each handle - 1
+        """
+        signals = self.signals
+        if signals is None:
+            return None
+        signals = set(signals)
+        selected = [False for _ in self._lens]
+
+        def walk(scope: VcdVarScope, path: str, parentSelected: bool):
+            for name, ch in scope.children.items():
+                p = f"{path:s}.{name:s}" if path else name
+                sel = parentSelected or p in signals
+                if isinstance(ch, VcdVarScope):
+                    walk(ch, p, sel)
+                elif sel:
+                    while not isinstance(ch.vcdId, int):
+                        ch = ch.vcdId
+                    selected[ch.vcdId - 1] = True
+
+        walk(self.scope, "", False)
+        return selected
+
+    def _formatFrameValue(self, handleIndex: int, data: bytes, pos: int) -> Tuple[Optional[str], int]:
+        """
+        :return: tuple (value or None for variable length signals, position after value)
+        """
+        length = self._lens[handleIndex]
+        if self._isReal[handleIndex]:
+            v, = self._doubleFmt.unpack_from(data, pos)
+            return f"r{v!r}", pos + 8
+        elif length == 0:
+            return None, pos
+        v = data[pos:pos + length].decode()
+        pos += length
+        if length == 1:
+            return v, pos
+        else:
+            return "b" + v, pos
+
+    def _readValueChanges(self, buff: bytes, blockType: int, blockPos: int, secLen: int,
+                          selected: Optional[List[bool]], lastValues: List[Optional[str]]):
+        end = blockPos + secLen
+        begTime, _, _ = struct.unpack_from(">QQQ", buff, blockPos + 8)
+        pos = blockPos + 32
+
+        # values of all signals at the start of the block
+        frameUclen, pos = _varint(buff, pos)
+        frameClen, pos = _varint(buff, pos)
+        frameMaxHandle, pos = _varint(buff, pos)
+        frame = buff[pos:pos + frameClen]
+        pos += frameClen
+        if frameUclen != frameClen:
+            frame = zlib.decompress(frame)
+
+        # table of times
+        tsecUclen, tsecClen, tsecNitems = struct.unpack_from(">QQQ", buff, end - 24)
+        tsecPos = end - 24 - tsecClen
+        tdata = buff[tsecPos:tsecPos + tsecClen]
+        if tsecUclen != tsecClen:
+            tdata = zlib.decompress(tdata)
+        times = []
+        t = 0
+        p = 0
+        for _ in range(tsecNitems):
+            d, p = _varint(tdata, p)
+            t += d
+            times.append(t)
+
+        idcode2series = self.idcode2series
+        p = 0
+        for i in range(frameMaxHandle):
+            v, p = self._formatFrameValue(i, frame, p)
+            if v is not None and (selected is None or selected[i]) and lastValues[i] != v:
+                lastValues[i] = v
+                idcode2series[i + 1].append((begTime, v))
+
+        vcMaxHandle, pos = _varint(buff, pos)
+        vcStart = pos
+        packType = chr(buff[pos])
+
+        # table of positions of the chains of value changes
+        chainClen, = _U64.unpack_from(buff, tsecPos - 8)
+        chainPos = tsecPos - 8 - chainClen
+        offsets, lengths = self._readChainTable(buff, blockType, chainPos, chainClen, vcStart, vcMaxHandle)
+
+        for i in range(vcMaxHandle):
+            offset = offsets[i]
+            if not offset or (selected is not None and not selected[i]):
+                continue
+            chainPos = vcStart + offset
+            uclen, p = _varint(buff, chainPos)
+            chain = buff[p:chainPos + lengths[i]]
+            if uclen:
+                if packType == "F":
+                    chain = fastlzDecompress(chain)
+                elif packType == "4":
+                    chain = lz4BlockDecompress(chain)
+                else:
+                    chain = zlib.decompress(chain)
+            self._readChain(i, chain, times, idcode2series[i + 1], lastValues)
+
+    @staticmethod
+    def _readChainTable(buff: bytes, blockType: int, pos: int, clen: int, vcStart: int, vcMaxHandle: int):
+        """
+        :return: tuple (offsets, lengths) of the chains relative to vcStart (offset 0 means no changes)
+        """
+        offsets = []
+        lengths = []
+        end = pos + clen
+        pval = 0
+        prevIdx = None
+        if blockType == FST_BL_VCDATA_DYN_ALIAS2:
+            prevAlias = 0
+            while pos < end:
+                if buff[pos] & 1:
+                    shval, pos = _svarint(buff, pos)
+                    shval >>= 1
+                    if shval > 0:
+                        pval += shval
+                        if prevIdx is not None:
+                            lengths[prevIdx] = pval - offsets[prevIdx]
+                        prevIdx = len(offsets)
+                        offsets.append(pval)
+                        lengths.append(0)
+                    else:
+                        if shval < 0:
+                            prevAlias = shval
+                        offsets.append(0)
+                        lengths.append(prevAlias)
+                else:
+                    val, pos = _varint(buff, pos)
+                    for _ in range(val >> 1):
+                        offsets.append(0)
+                        lengths.append(0)
+        else:
+            while pos < end:
+                val, pos = _varint(buff, pos)
+                if not val:
+                    val, pos = _varint(buff, pos)
+                    offsets.append(0)
+                    lengths.append(-val)
+                elif val & 1:
+                    pval += val >> 1
+                    if prevIdx is not None:
+                        lengths[prevIdx] = pval - offsets[prevIdx]
+                    prevIdx = len(offsets)
+                    offsets.append(pval)
+                    lengths.append(0)
+                else:
+                    for _ in range(val >> 1):
+                        offsets.append(0)
+                        lengths.append(0)
+        if prevIdx is not None:
+            # the last chain ends at the start of the chain table
+            lengths[prevIdx] = end - clen - vcStart - offsets[prevIdx]
+
+        # resolve aliases (negative length is 1-based index of the aliased chain)
+        for i, l in enumerate(lengths):
+            if l < 0 and not offsets[i]:
+                a = -l - 1
+                if a < i:
+                    offsets[i] = offsets[a]
+                    lengths[i] = lengths[a]
+
+        while len(offsets) < vcMaxHandle:
+            offsets.append(0)
+            lengths.append(0)
+        return offsets, lengths
+
+    def _readChain(self, handleIndex: int, chain: bytes, times: List[int],
+                   series: List[Tuple[int, str]], lastValues: List[Optional[str]]):
+        length = self._lens[handleIndex]
+        isReal = self._isReal[handleIndex]
+        doubleFmt = self._doubleFmt
+        timeIndex = 0
+        p = 0
+        n = len(chain)
+        v = lastValues[handleIndex]
+        while p < n:
+            vli, p = _varint(chain, p)
+            if isReal:
+                timeIndex += vli >> 1
+                d, = doubleFmt.unpack_from(chain, p)
+                p += 8
+                v = f"r{d!r}"
+            elif length == 1:
+                if vli & 1:
+                    timeIndex += vli >> 4
+                    v = _FST_RCV_STR[(vli >> 1) & 7]
+                else:
+                    timeIndex += vli >> 2
+                    v = "1" if vli & 2 else "0"
+            elif length == 0:
+                # variable length (string), the value is without prefix as in VcdParser
+                timeIndex += vli >> 1
+                size, p = _varint(chain, p)
+                v = chain[p:p + size].decode()
+                p += size
+            else:
+                timeIndex += vli >> 1
+                if vli & 1:
+                    v = "b" + chain[p:p + length].decode()
+                    p += length
+                else:
+                    byteCnt = (length + 7) // 8
+                    bits = int.from_bytes(chain[p:p + byteCnt], "big") >> (byteCnt * 8 - length)
+                    v = "b" + format(bits, f"0{length:d}b")
+                    p += byteCnt
+            series.append((times[timeIndex], v))
+        lastValues[handleIndex] = v
+
+
+def parseFstFile(fileName: str, signals: Optional[Collection[str]]=None) -> FstReader:
+    """
+    Read FST file
+
+    :see: :class:`~.FstReader`
+    """
+    with open(fileName, "rb") as f:
+        fst = FstReader(signals)
+        fst.parse(f)
+    return fst
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Columnar json format, the data of each signal is stored in chunks
+with separate time and value arrays, the chunks are streamed to the file.
+
+.. code-block:: text
+
+    {"header": {"name": "root", "type": {"name": "struct"}, "children": [
+        {"name": "<signal name>", "type": {"name": "<vcd signal type>", "width": <bit width>}, "id": <signal id>},
+        ...]},
+    "chunks": [
+    {"id": <signal id>, "time": [<time>, ...], "value": [<value>, ...]}
+    ,{"id": <signal id>, "time": [<time>, ...], "value": [<value>, ...]}
+    ]}
+
+The header and each chunk are on a separate line so the file can be read
+incrementally (:class:`pyDigitalWaveTools.json.parser.JsonParser`).
+Chunks of a single signal are in time order.
+"""
+
+import json
+from typing import Callable, List, Tuple, Union
+
+from pyDigitalWaveTools.json.writer import JsonWriter, VarIdScopeJson, \
+    VarWritingScopeJson
+from pyDigitalWaveTools.vcd.common import VcdVarScope, VcdVarInfo
+from pyDigitalWaveTools.vcd.writer import VcdVarWritingScope
+
+
+COLUMNAR_HEADER_PREFIX = '{"header": '
+COLUMNAR_CHUNKS_START = '"chunks": [\n'
+COLUMNAR_END = ']}\n'
+
+
+def scopeToColumnarJson(scope: Union[VcdVarScope, VcdVarInfo], getVarId: Callable[[VcdVarInfo], int]):
+    """
+    Convert scope to header of columnar json format (same as toJson() but without data)
+    """
+    if isinstance(scope, VcdVarScope):
+        return {
+            "name": scope.name,
+            "type": {"name": "struct"},
+            "children": [scopeToColumnarJson(ch, getVarId) for ch in scope.children.values()]
+        }
+    else:
+        return {"name": scope.name,
+                "type": {"width": scope.width,
+                         "name": scope.sigType},
+                "id": getVarId(scope)}
+
+
+class JsonColumnarOutput():
+    """
+    Low level writer of columnar json format
+    """
+
+    def __init__(self, oFile):
+        self._oFile = oFile
+        self._chunkCnt = 0
+
+    def writeHeader(self, root: dict):
+        oFile = self._oFile
+        oFile.write(COLUMNAR_HEADER_PREFIX)
+        json.dump(root, oFile)
+        oFile.write(",\n")
+        oFile.write(COLUMNAR_CHUNKS_START)
+
+    def writeChunk(self, varId: int, data: List[Tuple[int, object]]):
+        """
+        Write chunk of data and clear data list
+        """
+        chunk = {
+            "id": varId,
+            "time": [d[0] for d in data],
+            "value": [d[1] for d in data],
+        }
+        data.clear()
+        s = json.dumps(chunk, separators=(",", ":"))
+        if self._chunkCnt:
+            self._oFile.write(f",{s:s}\n")
+        else:
+            self._oFile.write(f"{s:s}\n")
+        self._chunkCnt += 1
+
+    def close(self):
+        self._oFile.write(COLUMNAR_END)
+
+
+class JsonColumnarWriter(JsonWriter):
+    """
+    Writer of columnar json format which streams the data to file in chunks,
+    at most chunkSize changes per variable are kept in memory.
+    Any number of top scopes is supported.
+
+    :note: uses the same value formatters as :class:`~.JsonWriter`
+    """
+
+    def __init__(self, oFile, chunkSize: int=4096):
+        self._out = JsonColumnarOutput(oFile)
+        self._idScope = VarIdScopeJson()
+        self.scopes = []
+        self.lastTime = -1
+        self.chunkSize = chunkSize
+        self._profiles = None
+
+    def varScope(self, name) -> VcdVarWritingScope:
+        """
+        Create sub variable scope with defined name
+        """
+        vs = VarWritingScopeJson(name, self, parent=self)
+        self.scopes.append(vs)
+        return vs
+
+    def enddefinitions(self):
+        for i, vInf in enumerate(self._idScope.values()):
+            vInf.vcdId = i
+        getVarId = lambda v: v.vcdId
+        self._out.writeHeader({
+            "name": "root",
+            "type": {"name": "struct"},
+            "children": [scopeToColumnarJson(s, getVarId) for s in self.scopes]
+        })
+
+    def logChange(self, time, sig, newVal, valueUpdater):
+        self.setTime(time)
+        varInfo = self._idScope[sig]
+        data = varInfo.data
+        varInfo.valueFormatter(newVal, valueUpdater, time, data)
+        if len(data) >= self.chunkSize:
+            self._out.writeChunk(varInfo.vcdId, data)
+
+    def close(self):
+        """
+        Write rest of the data and finalize the file (the file is not closed)
+        """
+        out = self._out
+        for vInf in self._idScope.values():
+            if vInf.data:
+                out.writeChunk(vInf.vcdId, vInf.data)
+        out.close()
+        self._closeProfiling()
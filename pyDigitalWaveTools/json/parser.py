@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Loader of json wave formats produced by :meth:`VcdVarScope.toJson`/:class:`JsonWriter`
+and :class:`JsonColumnarWriter` back to :class:`VcdVarScope`/:class:`VcdVarParsingInfo` objects
+"""
+
+from io import StringIO
+import json
+from typing import Dict, Iterator, List, Tuple
+
+from pyDigitalWaveTools.json.columnar_writer import COLUMNAR_HEADER_PREFIX, \
+    COLUMNAR_CHUNKS_START, COLUMNAR_END
+from pyDigitalWaveTools.vcd.common import VcdVarScope
+from pyDigitalWaveTools.vcd.parser import VcdVarParsingInfo
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonParser():
+    """
+    A parser of json wave files, the format is resolved automatically.
+    The columnar format is read incrementally chunk by chunk (:meth:`~.iter_chunks`).
+
+    :ivar ~.scope: root VcdVarScope
+    :ivar ~.idcode2var: dictionary {id: VcdVarParsingInfo}, the id is the id from the columnar format
+        or the index of the variable in the tree format
+    :ivar ~.idcode2series: dictionary {id: series} where series are list of tuples (time, value),
+        the list commes from VcdVarParsingInfo object
+    :ivar ~.useFastJson: use orjson if it is installed
+    """
+
+    def __init__(self, useFastJson=True):
+        self.scope = None
+        self.idcode2var: Dict[int, VcdVarParsingInfo] = {}
+        self.idcode2series: Dict[int, List[Tuple[int, object]]] = {}
+        if useFastJson and orjson is not None:
+            self._loads = orjson.loads
+        else:
+            self._loads = json.loads
+
+    def parse_str(self, json_string: str):
+        """
+        Same as :func:`~.parse` just for string
+        """
+        return self.parse(StringIO(json_string))
+
+    def parse(self, file_handle):
+        """
+        Parse json wave file (tree or columnar format)
+        """
+        line = file_handle.readline()
+        if line.startswith(COLUMNAR_HEADER_PREFIX):
+            self._parse_columnar_header(line)
+            idcode2series = self.idcode2series
+            for varId, times, values in self._iter_columnar_chunks(file_handle):
+                idcode2series[varId].extend(zip(times, values))
+        else:
+            self.parse_obj(self._loads(line + file_handle.read()))
+
+    def iter_chunks(self, file_handle) -> Iterator[Tuple[VcdVarParsingInfo, List[int], List[object]]]:
+        """
+        Read the header of columnar file and yield the data chunks without storing
+        them to VcdVarParsingInfo.data
+
+        :return: generator of tuples (variable, list of times, list of values)
+        """
+        line = file_handle.readline()
+        if not line.startswith(COLUMNAR_HEADER_PREFIX):
+            raise ValueError("Not a columnar json wave file")
+        self._parse_columnar_header(line)
+        idcode2var = self.idcode2var
+        for varId, times, values in self._iter_columnar_chunks(file_handle):
+            yield idcode2var[varId], times, values
+
+    def _parse_columnar_header(self, line: str):
+        header = line[len(COLUMNAR_HEADER_PREFIX):].rstrip().rstrip(",")
+        self.scope = self._build_scope(self._loads(header), None)
+
+    def _iter_columnar_chunks(self, file_handle):
+        line = file_handle.readline()
+        if line != COLUMNAR_CHUNKS_START:
+            raise ValueError("Expected start of chunks", line)
+        loads = self._loads
+        for line in file_handle:
+            if line == COLUMNAR_END:
+                return
+            chunk = loads(line[1:] if line[0] == "," else line)
+            yield chunk["id"], chunk["time"], chunk["value"]
+        raise ValueError("Unexpected end of file")
+
+    def parse_obj(self, obj: dict):
+        """
+        Load the tree format from already deserialized json object
+        """
+        self.scope = self._build_scope(obj, None)
+
+    def _build_scope(self, obj: dict, parent: VcdVarScope):
+        name = obj["name"]
+        t = obj["type"]
+        if t["name"] == "struct":
+            s = VcdVarScope(name, parent)
+            children = s.children
+            for ch in obj["children"]:
+                ch = self._build_scope(ch, s)
+                children[ch.name] = ch
+            return s
+        else:
+            varId = obj.get("id", None)
+            if varId is None:
+                varId = len(self.idcode2var)
+            else:
+                aliasOf = self.idcode2var.get(varId, None)
+                if aliasOf is not None:
+                    v = VcdVarParsingInfo(aliasOf, name, t["width"], t["name"], parent)
+                    v.data = aliasOf.data
+                    return v
+
+            v = VcdVarParsingInfo(varId, name, t["width"], t["name"], parent)
+            data = obj.get("data", None)
+            if data:
+                v.data = [tuple(d) for d in data]
+            self.idcode2var[varId] = v
+            self.idcode2series[varId] = v.data
+            return v
+
+
+if __name__ == "__main__":
+    # benchmark of loading of the same content from VCD and json formats
+    import os
+    import sys
+    from tempfile import TemporaryDirectory
+    from time import perf_counter
+    from pyDigitalWaveTools.json.columnar_writer import JsonColumnarOutput, scopeToColumnarJson
+    from pyDigitalWaveTools.vcd.parser import VcdParser
+
+    def _write_columnar(vcd, oFile, chunkSize=4096):
+        out = JsonColumnarOutput(oFile)
+        varIds = {vcdId: i for i, vcdId in enumerate(vcd.idcode2var.keys())}
+
+        def getVarId(v):
+            while not isinstance(v.vcdId, str):
+                v = v.vcdId
+            return varIds[v.vcdId]
+
+        out.writeHeader(scopeToColumnarJson(vcd.scope, getVarId))
+        for vcdId, series in vcd.idcode2series.items():
+            for i in range(0, len(series), chunkSize):
+                out.writeChunk(varIds[vcdId], series[i:i + chunkSize])
+        out.close()
+
+    if len(sys.argv) > 1:
+        fIn = sys.argv[1]
+    else:
+        fIn = os.path.join(os.path.dirname(__file__), "..", "..", "tests", "AxiRegTC_test_write.vcd")
+
+    t0 = perf_counter()
+    with open(fIn) as f:
+        vcd = VcdParser()
+        vcd.parse(f)
+    print(f"VcdParser: {perf_counter() - t0:f}s")
+
+    with TemporaryDirectory() as d:
+        fTree = os.path.join(d, "tree.json")
+        with open(fTree, "w") as f:
+            json.dump(vcd.scope.toJson(), f)
+        fColumnar = os.path.join(d, "columnar.json")
+        with open(fColumnar, "w") as f:
+            _write_columnar(vcd, f)
+
+        for useFastJson in (False, True):
+            if useFastJson and orjson is None:
+                print("orjson not installed")
+                break
+            for fName in (fTree, fColumnar):
+                t0 = perf_counter()
+                with open(fName) as f:
+                    JsonParser(useFastJson=useFastJson).parse(f)
+                print(f"JsonParser(useFastJson={useFastJson}) {os.path.basename(fName):s}: {perf_counter() - t0:f}s")
@@ -7,9 +7,21 @@ from pyDigitalWaveTools.vcd.writer import VcdVarWritingInfo
 
 
 class JsonArrayFormatter(LogValueFormatter):
-    def __init__(self, dimmensions, elm_formatter):
+    """
+    Formatter for arrays, the records are in format (t, ([index, ], value))
+
+    :ivar ~.deltaOnly: if True the last value of each item is kept
+        and only changed items are emitted
+    """
+
+    def __init__(self, dimmensions, elm_formatter, deltaOnly=False):
         self.dimmensions = dimmensions
         self.elm_formatter = elm_formatter
+        self.deltaOnly = deltaOnly
+        # {index or tuple of indexes: last formatted value}
+        self._shadow = {}
+        # tmp buffer for output of elm_formatter
+        self._elmOut = []
 
     def bind_var_info(self, varInfo: VcdVarWritingInfo):
         vi = copy(varInfo)
@@ -20,21 +32,36 @@ class JsonArrayFormatter(LogValueFormatter):
         # updater can assign value of whole array, that is why it does not
         # need to have indexes
         indexes = getattr(updater, "indexes", None)
+        elmFormat = self.elm_formatter.format
+        elmOut = self._elmOut
         if indexes:
             indexes = [int(i) for i in updater.indexes]
             for i in indexes:
                 newVal = newVal[i]
-            self.elm_formatter.format(newVal, updater, t, out) 
-            v = out.pop()
-            v = (t, (indexes, v[1]))
-            out.append(v)
+            elmFormat(newVal, updater, t, elmOut)
+            v = elmOut[0][1]
+            elmOut.clear()
+            if self.deltaOnly:
+                shadow = self._shadow
+                k = indexes[0] if len(indexes) == 1 else tuple(indexes)
+                if k in shadow and shadow[k] == v:
+                    return
+                shadow[k] = v
+            out.append((t, (indexes, v)))
         else:
-            for i, v in enumerate(newVal):
-                self.elm_formatter.format(v, updater, t, out) 
-                v = out.pop()
-                v = (t, ([i,], v[1]))
-                out.append(v)
-                
+            for v in newVal:
+                elmFormat(v, updater, t, elmOut)
+
+            if self.deltaOnly:
+                shadow = self._shadow
+                for i, (_, v) in enumerate(elmOut):
+                    if i not in shadow or shadow[i] != v:
+                        shadow[i] = v
+                        out.append((t, ([i, ], v)))
+            else:
+                out.extend([(t, ([i, ], v)) for i, (_, v) in enumerate(elmOut)])
+            elmOut.clear()
+
 
 class JsonEnumFormatter(LogValueFormatter):
 
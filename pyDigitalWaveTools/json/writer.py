@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from typing import Optional
+
 from pyDigitalWaveTools.vcd.common import VcdVarScope, VCD_SIG_TYPE
 from pyDigitalWaveTools.vcd.parser import VcdVarParsingInfo
 from pyDigitalWaveTools.vcd.value_format import LogValueFormatter
@@ -29,17 +31,19 @@ class VarWritingScopeJson(VcdVarWritingScope):
     """
 
     def addVar(self, sig: object, name: str, sigType: VCD_SIG_TYPE, width: int,
-               valueFormatter: LogValueFormatter):
+               valueFormatter: LogValueFormatter, bitRange: Optional[str]=None):
         """
         Add variable to scope
 
         :ivar ~.sig: user specified object to keep track of VcdVarInfo in change()
         :ivar ~.sigType: vcd type name
         :ivar ~.valueFormatter: value which converts new value in change() to vcd string
+        :ivar ~.bitRange: ignored, json does not store bit ranges
         """
         vInf = self._writer._idScope.registerVariable(sig, name, self, width,
                                                       sigType, valueFormatter)
         self.children[vInf.name] = vInf
+        return vInf
 
     def __enter__(self) -> "VcdVarWritingScope":
         return self
@@ -55,6 +59,7 @@ class JsonWriter(VcdWriter):
         self._idScope = VarIdScopeJson()
         self.lastTime = -1
         self._top_var_scope = None
+        self._profiles = None
 
     def date(self, text):
         pass
@@ -65,11 +70,11 @@ class JsonWriter(VcdWriter):
     def timescale(self, picoSeconds):
         pass
 
-    def varScope(self, name) -> VcdVarWritingScope:
+    def varScope(self, name, scopeType: str="module") -> VcdVarWritingScope:
         """
         Create sub variable scope with defined name
         """
-        vs = VarWritingScopeJson(name, self, parent=self)
+        vs = VarWritingScopeJson(name, self, parent=self, scopeType=scopeType)
         if self._top_var_scope is not None:
             raise AssertionError("Only one top scope currently supported")
         self._top_var_scope = vs
@@ -92,6 +97,18 @@ class JsonWriter(VcdWriter):
         varInfo = self._idScope[sig]
         varInfo.valueFormatter(newVal, valueUpdater, self.lastTime, varInfo.data)
 
+    def enableProfiling(self, topN: int=20, reportFile=None):
+        """
+        :see: :meth:`VcdWriter.enableProfiling`, the bytes are the size of the changes in json
+        """
+        from pyDigitalWaveTools.vcd.profiling import JsonVarProfile
+        self._enableProfiling(JsonVarProfile, topN, reportFile)
+
+    def close(self):
+        """
+        Write the profiling report if enabled (the output dictionary is complete after enddefinitions)
+        """
+        self._closeProfiling()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Activity statistics (per-bit toggle counts, time in 0/1/X state) for power estimation
+and toggle coverage
+
+.. code-block:: python
+
+    # from parsed VCD
+    activity = computeActivity(vcd)
+    # or without storing of the value changes
+    p = VcdActivityParser()
+    p.parse(f)
+    activity = p.activity
+
+    report = activityReport(vcd.scope, activity)
+
+The transitions and the durations are first aggregated by distinct values (strings from VCD)
+and the per-bit statistics are expanded only once for each distinct value/transition.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pyDigitalWaveTools.vcd.common import VCD_REAL_SIG_TYPES, VcdVarScope
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.query import decodeVcdLogicValue
+from pyDigitalWaveTools.vcd.streaming import getVarVcdId
+
+
+class VcdVarActivity():
+    """
+    Activity statistics of a single variable, the bit 0 is LSB,
+    the per-bit lists are empty for real and string variables
+
+    :ivar ~.width: bit width of variable
+    :ivar ~.changes: number of value changes
+    :ivar ~.toggles: list of numbers of 0->1 and 1->0 transitions for each bit
+    :ivar ~.time0: list of times in 0 for each bit
+    :ivar ~.time1: list of times in 1 for each bit
+    :ivar ~.timeX: list of times in X/Z for each bit
+    """
+
+    def __init__(self, width: int, isLogic: bool):
+        self.width = width
+        self.changes = 0
+        n = width if isLogic else 0
+        self.toggles = [0 for _ in range(n)]
+        self.time0 = [0 for _ in range(n)]
+        self.time1 = [0 for _ in range(n)]
+        self.timeX = [0 for _ in range(n)]
+
+    def toJson(self):
+        return {
+            "width": self.width,
+            "changes": self.changes,
+            "toggles": self.toggles,
+            "time0": self.time0,
+            "time1": self.time1,
+            "timeX": self.timeX,
+        }
+
+
+def _addPerBit(arr: List[int], bits: int, cnt: int):
+    while bits:
+        low = bits & -bits
+        arr[low.bit_length() - 1] += cnt
+        bits ^= low
+
+
+class VcdActivityAccumulator():
+    """
+    Accumulates the transitions and the durations of the values of a single variable
+
+    :ivar ~.transitions: dictionary {(previous value, value): count}
+    :ivar ~.durations: dictionary {value: time spent in value}
+    """
+
+    def __init__(self, width: int, sigType: str):
+        self.width = width
+        self.sigType = sigType
+        self.transitions: Dict[Tuple[str, str], int] = {}
+        self.durations: Dict[str, int] = {}
+        self.changes = 0
+        self._value: Optional[str] = None
+        self._time = 0
+
+    def add(self, t: int, value: str):
+        prev = self._value
+        self.changes += 1
+        if prev is not None:
+            durations = self.durations
+            durations[prev] = durations.get(prev, 0) + t - self._time
+            if prev != value:
+                k = (prev, value)
+                transitions = self.transitions
+                transitions[k] = transitions.get(k, 0) + 1
+        self._value = value
+        self._time = t
+
+    def addSeries(self, data: Sequence[Tuple[int, str]]):
+        """
+        Add all changes from series (list of tuples (time, value))
+        """
+        if not data:
+            return
+        if self._value is not None:
+            self.add(*data[0])
+            data = data[1:]
+            if not data:
+                return
+        self.changes += len(data)
+        values = [d[1] for d in data]
+        transitions = self.transitions
+        for k, cnt in Counter(zip(values, values[1:])).items():
+            if k[0] != k[1]:
+                transitions[k] = transitions.get(k, 0) + cnt
+        durations = self.durations
+        prevT, prev = data[0]
+        for t, v in data:
+            durations[prev] = durations.get(prev, 0) + t - prevT
+            prevT = t
+            prev = v
+        self._time = prevT
+        self._value = prev
+
+    def finalize(self, tEnd: int) -> VcdVarActivity:
+        """
+        :param tEnd: end time of the last value
+        """
+        isLogic = self.sigType not in VCD_REAL_SIG_TYPES and self.sigType != "string"
+        res = VcdVarActivity(self.width, isLogic)
+        res.changes = self.changes
+        durations = dict(self.durations)
+        if self._value is not None and tEnd > self._time:
+            durations[self._value] = durations.get(self._value, 0) + tEnd - self._time
+        if not isLogic:
+            return res
+
+        width = self.width
+        full = (1 << width) - 1
+        decoded = {}
+
+        def decode(v):
+            d = decoded.get(v, None)
+            if d is None:
+                d = decoded[v] = decodeVcdLogicValue(v, width)
+            return d
+
+        for (prev, v), cnt in self.transitions.items():
+            pv, pm = decode(prev)
+            nv, nm = decode(v)
+            _addPerBit(res.toggles, (pv ^ nv) & ~(pm | nm) & full, cnt)
+
+        for v, dt in durations.items():
+            if not dt:
+                continue
+            val, mask = decode(v)
+            val &= full
+            mask &= full
+            _addPerBit(res.time1, val, dt)
+            _addPerBit(res.timeX, mask, dt)
+            _addPerBit(res.time0, full & ~(val | mask), dt)
+        return res
+
+
+def computeActivity(vcd: VcdParser, tEnd: Optional[int]=None) -> Dict[str, VcdVarActivity]:
+    """
+    Compute activity from parsed VCD
+
+    :param tEnd: end of the simulation, default is the time of the last change
+    :return: dictionary {vcdId: VcdVarActivity}
+    """
+    if tEnd is None:
+        tEnd = max((s[-1][0] for s in vcd.idcode2series.values() if s), default=0)
+    res = {}
+    for vcdId, var in vcd.idcode2var.items():
+        acc = VcdActivityAccumulator(var.width, var.sigType)
+        acc.addSeries(vcd.idcode2series[vcdId])
+        res[vcdId] = acc.finalize(tEnd)
+    return res
+
+
+class VcdActivityParser(VcdParser):
+    """
+    VcdParser which computes activity statistics while parsing, the value changes are not stored
+
+    :ivar ~.activity: dictionary {vcdId: VcdVarActivity}, available after parse()
+    :ivar ~.tEnd: end of simulation for activity, default is the last time in the VCD file
+    """
+
+    def __init__(self, tEnd: Optional[int]=None):
+        super(VcdActivityParser, self).__init__()
+        self.tEnd = tEnd
+        self._accumulators: Dict[str, VcdActivityAccumulator] = {}
+        self.activity: Dict[str, VcdVarActivity] = {}
+
+    def vcd_enddefinitions(self, tokeniser, keyword):
+        super(VcdActivityParser, self).vcd_enddefinitions(tokeniser, keyword)
+        for vcdId, var in self.idcode2var.items():
+            self._accumulators[vcdId] = VcdActivityAccumulator(var.width, var.sigType)
+
+    def value_change(self, vcdId, value, lineNo):
+        try:
+            acc = self._accumulators[vcdId]
+        except KeyError:
+            self.on_error(lineNo, vcdId)
+            return
+        acc.add(self.now, value)
+
+    def parse(self, file_handle):
+        super(VcdActivityParser, self).parse(file_handle)
+        tEnd = self.tEnd
+        if tEnd is None:
+            tEnd = self.now
+        self.activity = {vcdId: acc.finalize(tEnd) for vcdId, acc in self._accumulators.items()}
+
+
+def activityReport(scope: VcdVarScope, activity: Dict[str, VcdVarActivity]) -> dict:
+    """
+    Build report with activity of each variable and aggregated values for each scope
+
+    :return: json-like dictionary, each scope and variable has "name", "bits",
+        "totalToggles" and "totalTimeX" (sums over all bits),
+        scopes have "children", variables have items of :meth:`VcdVarActivity.toJson`
+    """
+    children = []
+    bits = 0
+    totalToggles = 0
+    totalTimeX = 0
+    for name, ch in scope.children.items():
+        if isinstance(ch, VcdVarScope):
+            r = activityReport(ch, activity)
+        else:
+            a = activity[getVarVcdId(ch)]
+            r = {
+                "name": name,
+                "bits": len(a.toggles),
+                "totalToggles": sum(a.toggles),
+                "totalTimeX": sum(a.timeX),
+            }
+            r.update(a.toJson())
+        children.append(r)
+        bits += r["bits"]
+        totalToggles += r["totalToggles"]
+        totalTimeX += r["totalTimeX"]
+
+    return {
+        "name": scope.name,
+        "bits": bits,
+        "totalToggles": totalToggles,
+        "totalTimeX": totalTimeX,
+        "children": children,
+    }
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+asyncio API for :class:`VcdParser`
+
+.. code-block:: python
+
+    p = VcdAsyncParser()
+    async for progress in p.iterParse(f):
+        print(progress.bytesRead, progress.now)
+    vcd = p.parser
+
+    # or without progress
+    vcd = await VcdAsyncParser().parse(f)
+
+The parsing runs in an executor, after each chunk of the input the worker reports the progress
+and waits until the event loop processes it, so the parsing does not get ahead of the event loop
+and it can be cancelled between chunks.
+If the consumer may stop iterating early (break, task cancellation) the iterator should be closed
+explicitly to stop the worker immediately:
+
+.. code-block:: python
+
+    it = p.iterParse(f)
+    try:
+        async for progress in it:
+            ...
+    finally:
+        await it.aclose()
+"""
+
+import asyncio
+from concurrent.futures import Executor
+import threading
+from typing import AsyncIterator, Optional
+
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+
+class VcdParseCancelled(Exception):
+    """
+    The parsing was cancelled by :meth:`VcdAsyncParser.cancel` or by cancellation of the consumer
+    """
+    pass
+
+
+class VcdParseProgress():
+    """
+    :ivar ~.bytesRead: number of characters consumed from the input (bytes for ASCII VCD)
+    :ivar ~.now: current simulation time of the parser
+    :ivar ~.done: True for the last progress report after parsing finished
+    """
+
+    def __init__(self, bytesRead: int, now: int, done: bool=False):
+        self.bytesRead = bytesRead
+        self.now = now
+        self.done = done
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__:s} bytesRead:{self.bytesRead:d} now:{self.now:d} done:{self.done}>"
+
+
+class VcdAsyncParser():
+    """
+    :ivar ~.parser: VcdParser instance which is used for parsing (can be a subclass)
+    :ivar ~.chunkSize: number of characters parsed between progress reports
+    :ivar ~.executor: executor for parsing, None for default executor of the loop
+    """
+
+    def __init__(self, parser: Optional[VcdParser]=None, chunkSize: int=1 << 20,
+                 executor: Optional[Executor]=None):
+        if parser is None:
+            parser = VcdParser()
+        self.parser = parser
+        self.chunkSize = chunkSize
+        self.executor = executor
+        self._cancelled = threading.Event()
+        # released by the consumer when a progress report was processed
+        self._credit = threading.Semaphore(0)
+
+    def cancel(self):
+        """
+        Stop parsing at the end of the current chunk
+        """
+        self._cancelled.set()
+        self._credit.release()
+
+    def _lines(self, file_handle, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        parser = self.parser
+        chunkSize = self.chunkSize
+        cancelled = self._cancelled
+        credit = self._credit
+        bytesRead = 0
+        nextReport = chunkSize
+        for line in file_handle:
+            bytesRead += len(line)
+            if bytesRead >= nextReport:
+                if cancelled.is_set():
+                    raise VcdParseCancelled()
+                loop.call_soon_threadsafe(queue.put_nowait, VcdParseProgress(bytesRead, parser.now))
+                credit.acquire()
+                if cancelled.is_set():
+                    raise VcdParseCancelled()
+                nextReport = bytesRead + chunkSize
+            yield line
+        self._bytesRead = bytesRead
+
+    def _run(self, file_handle, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        try:
+            self.parser.parse(self._lines(file_handle, loop, queue))
+        finally:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+            except RuntimeError:
+                # the loop is already closed
+                pass
+
+    async def iterParse(self, file_handle) -> AsyncIterator[VcdParseProgress]:
+        """
+        Parse the file in executor and yield the progress after each chunk
+        and once the parsing is finished (with done=True)
+
+        :param file_handle: opened text file (or other iterable of lines),
+            the reading happens in the executor thread
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        self._bytesRead = 0
+        fut = loop.run_in_executor(self.executor, self._run, file_handle, loop, queue)
+        # the exception is retrieved below, this prevents the warning if the consumer does not wait for it
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+        finished = False
+        try:
+            while True:
+                p = await queue.get()
+                if p is None:
+                    break
+                yield p
+                self._credit.release()
+            await fut
+            finished = True
+            yield VcdParseProgress(self._bytesRead, self.parser.now, done=True)
+        finally:
+            if not finished:
+                self.cancel()
+
+    async def parse(self, file_handle) -> VcdParser:
+        """
+        Parse the file in executor without progress reporting
+
+        :return: the parser with the parsed data
+        """
+        async for _ in self.iterParse(file_handle):
+            pass
+        return self.parser
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parsing of many VCD files in a process pool
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+from time import perf_counter
+import traceback
+from typing import List, Optional
+
+from pyDigitalWaveTools.vcd.compact import VcdCompactWaves
+from pyDigitalWaveTools.vcd.compression import openVcdFile
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+
+class VcdBatchResult():
+    """
+    Result of parsing of a single file in :func:`~.parseVcdFiles`
+
+    :ivar ~.fileName: name of parsed file
+    :ivar ~.waves: VcdCompactWaves or None if parsing failed
+        (use :meth:`VcdCompactWaves.toParser` to get VcdParser)
+    :ivar ~.error: None or formatted exception if parsing failed
+    :ivar ~.time: time of parsing in seconds (measured in worker)
+    """
+
+    def __init__(self, fileName: str, waves: Optional[VcdCompactWaves],
+                 error: Optional[str], time: float):
+        self.fileName = fileName
+        self.waves = waves
+        self.error = error
+        self.time = time
+
+    def __repr__(self):
+        status = "OK" if self.error is None else "FAILED"
+        return f"<{self.__class__.__name__:s} {self.fileName:s} {status:s} {self.time:f}s>"
+
+
+def _linesWithDeadline(file_handle, deadline: float):
+    for i, line in enumerate(file_handle):
+        if not (i & 0xfff) and perf_counter() > deadline:
+            raise TimeoutError(f"Parsing timeout on line {i:d}")
+        yield line
+
+
+def parseVcdFileCompact(fileName: str, timeout: Optional[float]=None) -> VcdBatchResult:
+    """
+    Parse a single VCD file (optionally compressed), the exceptions are captured in result
+
+    :param timeout: max time of parsing in seconds, best-effort only: it is checked
+        every 4096 lines while reading the file, a blocking read or a long parse
+        of the header is not interrupted (use :func:`~.parseVcdFiles` for a hard limit)
+    """
+    t0 = perf_counter()
+    try:
+        with openVcdFile(fileName) as f:
+            if timeout is not None:
+                f = _linesWithDeadline(f, t0 + timeout)
+            vcd = VcdParser()
+            vcd.parse(f)
+        waves = VcdCompactWaves.fromParser(vcd)
+        error = None
+    except Exception:
+        waves = None
+        error = traceback.format_exc()
+    return VcdBatchResult(fileName, waves, error, perf_counter() - t0)
+
+
+def _parseVcdFileToPipe(conn, fileName: str):
+    try:
+        conn.send(parseVcdFileCompact(fileName))
+    finally:
+        conn.close()
+
+
+def _parseVcdFilesWithDeadline(fileNames: List[str], maxWorkers: int,
+                               timeout: float) -> List[VcdBatchResult]:
+    """
+    Parse each file in a separate process which is terminated once the timeout expires
+    """
+    ctx = multiprocessing.get_context()
+    results: List[Optional[VcdBatchResult]] = [None for _ in fileNames]
+    pending = list(reversed(range(len(fileNames))))
+    # {connection: (index of file, process, start time)}
+    running = {}
+    while pending or running:
+        while pending and len(running) < maxWorkers:
+            i = pending.pop()
+            recvConn, sendConn = ctx.Pipe(duplex=False)
+            p = ctx.Process(target=_parseVcdFileToPipe, args=(sendConn, fileNames[i]), daemon=True)
+            t0 = perf_counter()
+            p.start()
+            sendConn.close()
+            running[recvConn] = (i, p, t0)
+
+        firstDeadline = min(t0 for (_, _, t0) in running.values()) + timeout
+        for conn in wait(list(running.keys()), max(firstDeadline - perf_counter(), 0)):
+            i, p, t0 = running.pop(conn)
+            try:
+                r = conn.recv()
+            except EOFError:
+                r = None
+            conn.close()
+            p.join()
+            if r is None:
+                # failure of the worker process itself
+                r = VcdBatchResult(fileNames[i], None,
+                                   f"Worker process exited with code {p.exitcode} without result",
+                                   perf_counter() - t0)
+            results[i] = r
+
+        now = perf_counter()
+        for conn, (i, p, t0) in list(running.items()):
+            if now - t0 >= timeout:
+                p.terminate()
+                p.join()
+                conn.close()
+                del running[conn]
+                results[i] = VcdBatchResult(fileNames[i], None,
+                                            f"TimeoutError: Parsing timeout ({timeout}s), worker terminated",
+                                            now - t0)
+    return results
+
+
+def parseVcdFiles(fileNames: List[str], maxWorkers: Optional[int]=None,
+                  timeout: Optional[float]=None) -> List[VcdBatchResult]:
+    """
+    Parse VCD files in a process pool, the results are transferred from workers
+    in compact columnar form (:class:`~.VcdCompactWaves`) which is much cheaper to pickle
+    than the lists of tuples in VcdParser.
+
+    :param maxWorkers: max number of processes (default number of CPUs),
+        1 without timeout means to parse in this process
+    :param timeout: max time of parsing of a single file in seconds, it is enforced by this process:
+        each file is parsed in a separate process which is terminated once the timeout expires
+    :return: list of results in the order of fileNames
+    """
+    if timeout is not None:
+        if maxWorkers is None:
+            maxWorkers = os.cpu_count() or 1
+        return _parseVcdFilesWithDeadline(fileNames, maxWorkers, timeout)
+
+    if maxWorkers == 1:
+        return [parseVcdFileCompact(fName) for fName in fileNames]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=maxWorkers) as executor:
+        futures = [executor.submit(parseVcdFileCompact, fName) for fName in fileNames]
+        for fName, f in zip(fileNames, futures):
+            try:
+                results.append(f.result())
+            except Exception:
+                # failure of the worker process itself
+                results.append(VcdBatchResult(fName, None, traceback.format_exc(), 0.0))
+    return results
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compressed representation of periodic 1-bit signals (clocks)
+
+.. code-block:: python
+
+    # after parsing
+    clocks = compressClocks(vcd)  # {vcdId: VcdClockSeries}
+    # or while parsing
+    p = VcdClockParser()
+    p.parse(f)
+    clk = p.clocks[vcdId]
+    clk.value_at(1234)
+    clk.edges(1000, 2000)  # times of rising edges in [1000, 2000)
+
+The series is stored as a list of segments (start, period, duty, count, value),
+the changes of a segment are at start + k * period (to value) and
+start + k * period + duty (to the opposite value), count is the number of changes in segment.
+Changes which do not fit any periodic pattern are stored as segments with count 1
+(and period, duty 0).
+"""
+
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pyDigitalWaveTools.vcd.common import VCD_REAL_SIG_TYPES, VCD_SIG_TYPE
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+_OPPOSITE = {"0": "1", "1": "0"}
+# (start, period, duty, count, value)
+ClockSegment = Tuple[int, int, int, int, str]
+
+
+class VcdClockSeries(Sequence):
+    """
+    Sequence of tuples (time, value) stored as periodic segments,
+    the items are expanded on access
+
+    :ivar ~.segments: list of segments (start, period, duty, count, value)
+    """
+
+    def __init__(self, data: Iterable[Tuple[int, str]]=()):
+        self.segments: List[ClockSegment] = []
+        self._len = 0
+        # lazily built (index of the first change, start time) of segments
+        self._firstIndex: Optional[List[int]] = None
+        self._startTimes: Optional[List[int]] = None
+        self.extend(data)
+
+    def append(self, item: Tuple[int, str]):
+        t, v = item
+        segments = self.segments
+        self._len += 1
+        self._firstIndex = self._startTimes = None
+        if segments:
+            start, period, duty, count, v0 = segments[-1]
+            if count > 1:
+                # periodic segment, check if the change is the next one
+                if count & 1:
+                    nextT = start + (count >> 1) * period + duty
+                    nextV = _OPPOSITE[v0]
+                else:
+                    nextT = start + (count >> 1) * period
+                    nextV = v0
+                if t == nextT and v == nextV:
+                    segments[-1] = (start, period, duty, count + 1, v0)
+                    return
+            elif len(segments) > 1 and segments[-2][3] == 1:
+                # 3 single changes in a row may start a new periodic segment
+                t0, _, _, _, a = segments[-2]
+                if v == a and v0 == _OPPOSITE.get(a, None) and t0 < start < t:
+                    segments.pop()
+                    segments[-1] = (t0, t - t0, start - t0, 3, a)
+                    return
+        segments.append((t, 0, 0, 1, v))
+
+    def extend(self, items: Iterable[Tuple[int, str]]):
+        for item in items:
+            self.append(item)
+
+    def _index(self):
+        firstIndex = self._firstIndex
+        if firstIndex is None:
+            firstIndex = self._firstIndex = []
+            i = 0
+            for s in self.segments:
+                firstIndex.append(i)
+                i += s[3]
+            self._startTimes = [s[0] for s in self.segments]
+        return firstIndex
+
+    @staticmethod
+    def _segmentItem(segment: ClockSegment, k: int):
+        start, period, duty, _, v0 = segment
+        if k & 1:
+            return (start + (k >> 1) * period + duty, _OPPOSITE[v0])
+        else:
+            return (start + (k >> 1) * period, v0)
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[_i] for _i in range(*i.indices(len(self)))]
+        if i < 0:
+            i += self._len
+        if i < 0 or i >= self._len:
+            raise IndexError(i)
+        firstIndex = self._index()
+        si = bisect_right(firstIndex, i) - 1
+        return self._segmentItem(self.segments[si], i - firstIndex[si])
+
+    def __iter__(self):
+        segmentItem = self._segmentItem
+        for s in self.segments:
+            if s[3] == 1:
+                yield (s[0], s[4])
+            else:
+                for k in range(s[3]):
+                    yield segmentItem(s, k)
+
+    def value_at(self, t: int) -> Optional[str]:
+        """
+        :return: value at time t (after all changes at time t) or None if there is no value yet
+        """
+        self._index()
+        si = bisect_right(self._startTimes, t) - 1
+        if si < 0:
+            return None
+        start, period, duty, count, v0 = self.segments[si]
+        if count == 1:
+            return v0
+        dt = t - start
+        k = (dt // period) * 2 + (1 if dt % period >= duty else 0)
+        if k >= count:
+            k = count - 1
+        return _OPPOSITE[v0] if k & 1 else v0
+
+    def edges(self, t0: int=0, t1: Optional[int]=None, rising: bool=True) -> List[int]:
+        """
+        :param rising: if True return times of changes to 1, else changes to 0
+        :return: list of times of edges in time interval [t0, t1)
+        """
+        target = "1" if rising else "0"
+        res = []
+        prev = None
+        for s in self.segments:
+            start, period, duty, count, v0 = s
+            if t1 is not None and start >= t1:
+                break
+            if count == 1:
+                if v0 == target and prev != target and start >= t0:
+                    res.append(start)
+                prev = v0
+                continue
+
+            # the first change of the segment depends on the previous value
+            if v0 == target and prev != target and start >= t0:
+                res.append(start)
+            # the changes to target value are at base + j * period for j in [j0, cnt)
+            if v0 == target:
+                base = start
+                j0 = 1
+                cnt = (count + 1) >> 1
+            else:
+                base = start + duty
+                j0 = 0
+                cnt = count >> 1
+            if base + j0 * period < t0:
+                j0 = -(-(t0 - base) // period)
+            if t1 is not None:
+                cnt = min(cnt, -(-(t1 - base) // period))
+            res.extend(range(base + j0 * period, base + cnt * period, period))
+            prev = self._segmentItem(s, count - 1)[1]
+        return res
+
+    def isCompressed(self, minRatio: int=4):
+        """
+        :return: True if the number of segments is at least minRatio times smaller than the number of changes
+        """
+        return len(self.segments) * minRatio <= self._len
+
+
+def _isClockCandidate(var) -> bool:
+    return var.width == 1 and var.sigType not in VCD_REAL_SIG_TYPES and var.sigType not in (VCD_SIG_TYPE.ENUM, "string")
+
+
+def compressClockSeries(data: Iterable[Tuple[int, str]], minRatio: int=4) -> Optional[VcdClockSeries]:
+    """
+    :return: VcdClockSeries if the data are periodic enough (see :meth:`VcdClockSeries.isCompressed`) else None
+    """
+    s = VcdClockSeries(data)
+    if s._len and s.isCompressed(minRatio):
+        return s
+    return None
+
+
+def compressClocks(vcd: VcdParser, minRatio: int=4) -> Dict[str, VcdClockSeries]:
+    """
+    Replace the series of periodic 1-bit variables of parsed VCD with :class:`~.VcdClockSeries`
+
+    :return: dictionary {vcdId: VcdClockSeries} for replaced series
+    """
+    res = {}
+    for vcdId, var in vcd.idcode2var.items():
+        if not _isClockCandidate(var):
+            continue
+        s = compressClockSeries(vcd.idcode2series[vcdId], minRatio)
+        if s is not None:
+            var.data = vcd.idcode2series[vcdId] = s
+            res[vcdId] = s
+    return res
+
+
+class VcdClockParser(VcdParser):
+    """
+    VcdParser which stores the series of 1-bit variables as :class:`~.VcdClockSeries` while parsing,
+    the series which are not periodic are converted to lists at the end of parsing
+
+    :ivar ~.minRatio: min ratio of changes to segments for the series to stay compressed
+    :ivar ~.clocks: dictionary {vcdId: VcdClockSeries}, available after parse()
+    """
+
+    def __init__(self, minRatio: int=4):
+        super(VcdClockParser, self).__init__()
+        self.minRatio = minRatio
+        self.clocks: Dict[str, VcdClockSeries] = {}
+
+    def vcd_enddefinitions(self, tokeniser, keyword):
+        super(VcdClockParser, self).vcd_enddefinitions(tokeniser, keyword)
+        for vcdId, var in self.idcode2var.items():
+            if _isClockCandidate(var):
+                var.data = self.idcode2series[vcdId] = VcdClockSeries(var.data)
+
+    def parse(self, file_handle):
+        super(VcdClockParser, self).parse(file_handle)
+        clocks = self.clocks
+        for vcdId, var in self.idcode2var.items():
+            s = var.data
+            if isinstance(s, VcdClockSeries):
+                if s._len and s.isCompressed(self.minRatio):
+                    clocks[vcdId] = s
+                else:
+                    var.data = self.idcode2series[vcdId] = list(s)
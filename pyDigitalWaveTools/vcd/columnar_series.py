@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Binary columnar block of value change series used by :mod:`pyDigitalWaveTools.vcd.shared_memory`
+and :mod:`pyDigitalWaveTools.vcd.spill`
+
+Layout of the block (the size of block is aligned to 8B):
+
+.. code-block:: text
+
+    int64[count] times
+    int64[count] end of each value in values
+    values (utf-8 bytes concatenated)
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, Tuple
+
+COLUMNAR_INT64 = 8
+
+
+def alignInt64(size: int) -> int:
+    return (size + COLUMNAR_INT64 - 1) & ~(COLUMNAR_INT64 - 1)
+
+
+def encodeColumnarSeries(series: Iterable[Tuple[int, str]]) -> Tuple[int, bytes]:
+    """
+    :return: tuple (number of items, block bytes)
+    """
+    times = array("q")
+    ends = array("q")
+    values = []
+    end = 0
+    for t, v in series:
+        v = v.encode()
+        end += len(v)
+        times.append(t)
+        ends.append(end)
+        values.append(v)
+    data = times.tobytes() + ends.tobytes() + b"".join(values)
+    return len(times), data + bytes(alignInt64(len(data)) - len(data))
+
+
+class ColumnarSeriesView(Sequence):
+    """
+    Read only sequence of tuples (time, value) backed by a buffer with columnar block,
+    the values are decoded on access.
+
+    :ivar ~.times: memoryview of int64 times
+    """
+
+    def __init__(self, buf: memoryview, count: int, timesOffset: int, endsOffset: int, valuesOffset: int):
+        """
+        :param buf: memoryview of the buffer, offsets are absolute in this buffer
+        """
+        self.times = buf[timesOffset:timesOffset + count * COLUMNAR_INT64].cast("q")
+        self._ends = buf[endsOffset:endsOffset + count * COLUMNAR_INT64].cast("q")
+        self._values = buf[valuesOffset:valuesOffset + (self._ends[-1] if count else 0)]
+
+    @classmethod
+    def fromBlock(cls, buf: memoryview, offset: int, count: int) -> "ColumnarSeriesView":
+        """
+        View of the block produced by :func:`~.encodeColumnarSeries` stored at offset
+        """
+        endsOffset = offset + count * COLUMNAR_INT64
+        return cls(buf, count, offset, endsOffset, endsOffset + count * COLUMNAR_INT64)
+
+    def __len__(self):
+        return len(self.times)
+
+    def value(self, i: int) -> str:
+        ends = self._ends
+        start = ends[i - 1] if i > 0 else 0
+        return str(self._values[start:ends[i]], "utf-8")
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[_i] for _i in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+            if i < 0:
+                raise IndexError(i)
+        return (self.times[i], self.value(i))
+
+    def __iter__(self):
+        values = self._values
+        start = 0
+        for t, end in zip(self.times, self._ends):
+            yield (t, str(values[start:end], "utf-8"))
+            start = end
+
+    def release(self):
+        self.times.release()
+        self._ends.release()
+        self._values.release()
@@ -11,6 +11,10 @@ class VCD_SIG_TYPE():
     ARRAY = "array"
 
 
+# VCD var types with real values (value changes "r<float>")
+VCD_REAL_SIG_TYPES = frozenset((VCD_SIG_TYPE.REAL, "realtime", "shortreal", "real_parameter"))
+
+
 class VcdVarInfo():
     """
     Common part of VcdParsingVarInfo and VcdVarWritingInfo
@@ -44,12 +48,14 @@ class VcdVarScope():
     :ivar ~.name: name of this scope
     :ivar ~.parent: parent scope of this scope or None
     :ivar ~.children: dict {name: <VcdVarScope or VcdVarInfo instance>}
+    :ivar ~.scopeType: VCD scope type name (module, task, function, begin, fork)
     """
 
-    def __init__(self, name, parent=None):
+    def __init__(self, name, parent=None, scopeType="module"):
         self.name = name
         self.parent = parent
         self.children = {}
+        self.scopeType = scopeType
 
     def _getDebugName(self):
         buff = []
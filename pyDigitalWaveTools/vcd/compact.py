@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compact columnar representation of parsed VCD which is cheap to pickle
+(e.g. to transfer it between processes)
+"""
+
+from array import array
+from typing import Dict
+
+from pyDigitalWaveTools.json.columnar_writer import scopeToColumnarJson
+from pyDigitalWaveTools.json.parser import JsonParser
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.streaming import getVarVcdId
+
+
+class VcdCompactWaves():
+    """
+    Columnar form of parsed VCD, instead of list of tuples for each variable
+    there is an array of times and a single string with values.
+
+    :ivar ~.header: hierarchy in columnar json format (:func:`~.scopeToColumnarJson`),
+        variables have the vcdId in "id"
+    :ivar ~.declarations: dictionary {"date"/"version"/"timescale": value} for declarations present in VCD
+    :ivar ~.times: dictionary {vcdId: array('q') of times}
+    :ivar ~.values: dictionary {vcdId: values joined by "\\n"}
+    """
+    DECLARATIONS = ("date", "version", "timescale")
+
+    def __init__(self, header: dict, declarations: Dict[str, str],
+                 times: Dict[str, array], values: Dict[str, str]):
+        self.header = header
+        self.declarations = declarations
+        self.times = times
+        self.values = values
+
+    @classmethod
+    def fromParser(cls, vcd: VcdParser) -> "VcdCompactWaves":
+        header = scopeToColumnarJson(vcd.scope, getVarVcdId)
+        declarations = {}
+        for d in cls.DECLARATIONS:
+            v = getattr(vcd, d, None)
+            if v is not None:
+                declarations[d] = v
+        times = {}
+        values = {}
+        for vcdId, series in vcd.idcode2series.items():
+            times[vcdId] = array("q", [d[0] for d in series])
+            values[vcdId] = "\n".join([d[1] for d in series])
+        return cls(header, declarations, times, values)
+
+    def __len__(self):
+        """
+        :return: number of value changes
+        """
+        return sum(len(t) for t in self.times.values())
+
+    def toParser(self) -> VcdParser:
+        """
+        Rebuild VcdParser with VcdVarScope/VcdVarParsingInfo objects and data
+        """
+        jp = JsonParser()
+        jp.parse_obj(self.header)
+        vcd = VcdParser()
+        vcd.scope = jp.scope
+        vcd.idcode2var = jp.idcode2var
+        vcd.idcode2series = jp.idcode2series
+        vcd.end_of_definitions = True
+        for k, v in self.declarations.items():
+            setattr(vcd, k, v)
+
+        values = self.values
+        for vcdId, times in self.times.items():
+            if times:
+                vcd.idcode2series[vcdId].extend(zip(times, values[vcdId].split("\n")))
+        return vcd
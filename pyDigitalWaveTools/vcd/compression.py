@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compressed text output for :class:`~pyDigitalWaveTools.vcd.writer.VcdWriter`
+and opening of compressed VCD files for :class:`~pyDigitalWaveTools.vcd.parser.VcdParser`
+
+The output is cut to large blocks and every block is compressed as an independent
+gzip member/bz2 stream/xz stream/zstd frame in a thread pool. Concatenation
+of such blocks is a valid file for the standard tools (gzip, bzip2, xz, zstd)
+and for the python modules used in :func:`~.openVcdFile`.
+"""
+
+import bz2
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import io
+import lzma
+import os
+from queue import Queue
+from threading import Thread
+from typing import Optional
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def _compressGzip(data: bytes, level: int):
+    c = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return c.compress(data) + c.flush()
+
+
+def _compressBz2(data: bytes, level: int):
+    return bz2.compress(data, level)
+
+
+def _compressXz(data: bytes, level: int):
+    return lzma.compress(data, preset=level)
+
+
+def _compressZstd(data: bytes, level: int):
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+# {format name: (compress function, default level, file extension)}
+COMPRESSION_FORMATS = {
+    "gz": (_compressGzip, 6, ".gz"),
+    "bz2": (_compressBz2, 9, ".bz2"),
+    "xz": (_compressXz, 6, ".xz"),
+}
+if zstandard is not None:
+    COMPRESSION_FORMATS["zst"] = (_compressZstd, 3, ".zst")
+
+
+def compressionFromFileName(fileName: str) -> Optional[str]:
+    """
+    :return: name of compression format resolved from file extension or None
+        if the file is not compressed
+    """
+    for name, (_, _, ext) in COMPRESSION_FORMATS.items():
+        if fileName.endswith(ext):
+            return name
+    if fileName.endswith(".zst"):
+        raise ValueError("zstandard package is required for .zst files")
+    return None
+
+
+class CompressedTextOutput():
+    """
+    Text file like object which compresses written text in a thread pool
+    (zlib, bz2, lzma and zstandard release GIL during compression)
+
+    The producer only appends the text to a buffer, once the buffer is larger
+    than blockSize it is submitted to compression and a writer thread stores
+    compressed blocks to the output file in original order. The producer is blocked
+    only if there are more than maxPendingBlocks blocks waiting, which keeps
+    the memory consumption bounded.
+
+    :ivar ~.blockSize: size of uncompressed block in characters
+    :ivar ~.offset: number of characters of uncompressed text submitted to compression so far
+        (for ASCII VCD equal to the offset in the decompressed stream),
+        it is not a position in the compressed file, :meth:`~.tell` also counts the buffered text
+    """
+
+    def __init__(self, fileName: str, compression: Optional[str]=None,
+                 level: Optional[int]=None, blockSize: int=4 * 1024 * 1024,
+                 workers: Optional[int]=None, maxPendingBlocks: Optional[int]=None):
+        if compression is None:
+            compression = compressionFromFileName(fileName)
+            if compression is None:
+                raise ValueError("Can not resolve compression from file name", fileName)
+        try:
+            compressFn, defaultLevel, _ = COMPRESSION_FORMATS[compression]
+        except KeyError:
+            raise ValueError("Unsupported compression", compression,
+                             "supported:", tuple(COMPRESSION_FORMATS.keys()))
+        if level is None:
+            level = defaultLevel
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
+        if maxPendingBlocks is None:
+            maxPendingBlocks = 2 * workers
+
+        self._compressFn = compressFn
+        self._level = level
+        self.blockSize = blockSize
+        self.offset = 0
+        self._buff = []
+        self._buffSize = 0
+        self._oFile = open(fileName, "wb")
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        # futures with compressed blocks in the order of the output
+        self._pending = Queue(maxsize=maxPendingBlocks)
+        self._writerError = None
+        self._writerThread = Thread(target=self._writeBlocks, daemon=True)
+        self._writerThread.start()
+        self.closed = False
+
+    def _writeBlocks(self):
+        pending = self._pending
+        oFile = self._oFile
+        while True:
+            f = pending.get()
+            if f is None:
+                return
+            try:
+                oFile.write(f.result())
+            except BaseException as e:
+                self._writerError = e
+                # drain the queue so the producer is not blocked forever
+                while pending.get() is not None:
+                    pass
+                return
+
+    def write(self, s: str):
+        self._buff.append(s)
+        self._buffSize += len(s)
+        if self._buffSize >= self.blockSize:
+            self._submitBlock()
+        return len(s)
+
+    def _submitBlock(self):
+        if self._writerError is not None:
+            raise self._writerError
+        data = "".join(self._buff).encode()
+        self.offset += self._buffSize
+        self._buff.clear()
+        self._buffSize = 0
+        self._pending.put(self._executor.submit(self._compressFn, data, self._level))
+
+    def flush(self):
+        """
+        Submit currently buffered data to compression
+        (data is written to file asynchronously)
+        """
+        if self._buffSize:
+            self._submitBlock()
+
+    def tell(self):
+        """
+        :return: number of characters written so far (position in uncompressed text)
+        """
+        return self.offset + self._buffSize
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.flush()
+        finally:
+            self._pending.put(None)
+            self._writerThread.join()
+            self._executor.shutdown()
+            self._oFile.close()
+        if self._writerError is not None:
+            raise self._writerError
+
+    def __enter__(self) -> "CompressedTextOutput":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def openVcdFile(fileName: str, mode: str="rt"):
+    """
+    Open a VCD file, the compression is resolved from file extension
+    (.gz, .bz2, .xz, .zst or no compression)
+    """
+    compression = compressionFromFileName(fileName)
+    if compression is None:
+        return open(fileName, mode)
+    elif compression == "gz":
+        return gzip.open(fileName, mode)
+    elif compression == "bz2":
+        return bz2.open(fileName, mode)
+    elif compression == "xz":
+        return lzma.open(fileName, mode)
+    else:
+        assert compression == "zst", compression
+        if "r" not in mode:
+            return zstandard.open(fileName, mode)
+        # CompressedTextOutput writes a frame for each block and the reader stops
+        # after the first frame by default
+        reader = zstandard.ZstdDecompressor().stream_reader(open(fileName, "rb"), read_across_frames=True)
+        if "b" in mode:
+            return reader
+        return io.TextIOWrapper(reader)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Deduplication of identical value change series of different variables (different vcdIds)
+of parsed VCD (e.g. buffered copies of signals in gate-level simulations)
+
+.. code-block:: python
+
+    vcd = VcdParser()
+    vcd.parse(f)
+    report = deduplicateSeries(vcd)
+    print(report.savedBytes)
+
+The series are first grouped by cheap key (length, first and last change), only the series
+with the same key are hashed (in chunks, without a copy of the whole series)
+and the series with the same hash are compared before they are shared.
+The shared series must not be modified afterwards as it is used by multiple variables.
+"""
+
+import sys
+from typing import Dict, List
+
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+# number of items hashed at once
+_HASH_CHUNK = 4096
+
+
+def seriesHash(series: List[tuple]) -> int:
+    """
+    Hash of the series computed incrementally in chunks
+    """
+    h = hash(len(series))
+    for i in range(0, len(series), _HASH_CHUNK):
+        h = hash((h, tuple(series[i:i + _HASH_CHUNK])))
+    return h
+
+
+def seriesMemorySize(series: List[tuple]) -> int:
+    """
+    Estimate of the memory used by series (list, tuples and value strings,
+    the single character strings are cached by the interpreter and the times are mostly shared)
+    """
+    size = sys.getsizeof(series)
+    getsizeof = sys.getsizeof
+    for item in series:
+        size += getsizeof(item)
+        v = item[1]
+        if isinstance(v, str) and len(v) > 1:
+            size += getsizeof(v)
+    return size
+
+
+class VcdDedupReport():
+    """
+    :ivar ~.groups: list of lists of vcdIds which share the same series (only groups with more than 1 item),
+        the first vcdId is the owner of the series
+    :ivar ~.savedItems: number of (time, value) items which are not stored anymore
+    :ivar ~.savedBytes: estimate of the released memory in bytes
+    """
+
+    def __init__(self):
+        self.groups: List[List[str]] = []
+        self.savedItems = 0
+        self.savedBytes = 0
+
+    def toJson(self):
+        return {
+            "groups": self.groups,
+            "savedItems": self.savedItems,
+            "savedBytes": self.savedBytes,
+        }
+
+    def __repr__(self):
+        return (f"<{self.__class__.__name__:s} groups:{len(self.groups):d} "
+                f"savedItems:{self.savedItems:d} savedBytes:{self.savedBytes:d}>")
+
+
+def deduplicateSeries(vcd: VcdParser) -> VcdDedupReport:
+    """
+    Make the variables with identical series share a single series object
+    (only the series stored in lists are processed, e.g. spilled series are skipped)
+
+    :return: report with the shared series and the saved memory
+    """
+    candidates: Dict[tuple, List[str]] = {}
+    idcode2series = vcd.idcode2series
+    for vcdId, s in idcode2series.items():
+        if not isinstance(s, list) or not s:
+            continue
+        k = (len(s), s[0], s[-1])
+        c = candidates.get(k, None)
+        if c is None:
+            candidates[k] = [vcdId]
+        else:
+            c.append(vcdId)
+
+    report = VcdDedupReport()
+    for vcdIds in candidates.values():
+        if len(vcdIds) == 1:
+            continue
+        byHash: Dict[int, List[List[str]]] = {}
+        for vcdId in vcdIds:
+            s = idcode2series[vcdId]
+            groups = byHash.setdefault(seriesHash(s), [])
+            for g in groups:
+                owner = idcode2series[g[0]]
+                if owner is s or owner == s:
+                    g.append(vcdId)
+                    break
+            else:
+                groups.append([vcdId])
+
+        for groups in byHash.values():
+            for g in groups:
+                if len(g) == 1:
+                    continue
+                owner = idcode2series[g[0]]
+                for vcdId in g[1:]:
+                    s = idcode2series[vcdId]
+                    if s is owner:
+                        continue
+                    report.savedItems += len(s)
+                    report.savedBytes += seriesMemorySize(s)
+                    idcode2series[vcdId] = owner
+                    vcd.idcode2var[vcdId].data = owner
+                report.groups.append(g)
+    return report
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache of parsed VCD headers for many VCD files of the same design
+
+.. code-block:: python
+
+    cache = VcdHeaderCache(cacheDir="build/vcd_header_cache")
+    for fileName in fileNames:
+        with open(fileName) as f:
+            vcd = cache.parse(f)
+
+The header (text up to "$enddefinitions $end") is hashed and the parsed hierarchy
+is stored as a pickled template, each parsed file gets its own copy of the hierarchy
+with empty series. The template is a flat list of scopes and variables
+which is turned to objects much faster than the header is parsed (and faster than unpickling
+of the objects themselves).
+"""
+
+from collections import OrderedDict
+import gc
+import hashlib
+from itertools import chain
+import os
+import pickle
+import re
+from tempfile import NamedTemporaryFile
+from typing import Iterator, Optional, Tuple
+
+from pyDigitalWaveTools.vcd.common import VcdVarScope
+from pyDigitalWaveTools.vcd.compact import VcdCompactWaves
+from pyDigitalWaveTools.vcd.parser import VcdParser, VcdVarParsingInfo
+
+# used in names of cache files, incremented if the format of template changes
+VCD_HEADER_TEMPLATE_VERSION = 2
+_END_RE = re.compile(r"\$end(?=\s|$)")
+
+
+def readVcdHeaderText(lines: Iterator[str]) -> Tuple[str, str]:
+    """
+    Read the lines until the end of $enddefinitions
+
+    :param lines: iterator of lines (e.g. opened file), only the lines of the header
+        are consumed from it
+    :return: tuple (header text including "$enddefinitions $end",
+        rest of the last line which belongs to the value change section)
+    """
+    buff = []
+    endOfDefinitions = False
+    for line in lines:
+        pos = 0
+        if not endOfDefinitions:
+            i = line.find("$enddefinitions")
+            if i < 0:
+                buff.append(line)
+                continue
+            endOfDefinitions = True
+            pos = i + len("$enddefinitions")
+        m = _END_RE.search(line, pos)
+        if m is None:
+            buff.append(line)
+            continue
+        buff.append(line[:m.end()])
+        buff.append("\n")
+        return "".join(buff), line[m.end():]
+    raise ValueError("Missing $enddefinitions")
+
+
+class VcdHeaderCache():
+    """
+    Cache of header templates, the templates are kept in memory (LRU)
+    and optionally in cacheDir
+
+    :ivar ~.cacheDir: None or directory with template files
+    :ivar ~.maxSize: max number of templates kept in memory
+    :ivar ~.hits: number of headers loaded from cache (memory or disk)
+    :ivar ~.misses: number of parsed headers
+    """
+
+    def __init__(self, cacheDir: Optional[str]=None, maxSize: int=16):
+        self.cacheDir = cacheDir
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self._templates = OrderedDict()
+
+    @staticmethod
+    def headerDigest(header: str) -> str:
+        return hashlib.sha256(header.encode()).hexdigest()
+
+    def _templateFileName(self, digest: str) -> str:
+        return os.path.join(self.cacheDir, f"vcd_header_v{VCD_HEADER_TEMPLATE_VERSION:d}_{digest:s}.pickle")
+
+    @staticmethod
+    def buildTemplate(header: str) -> bytes:
+        """
+        Parse the header and pickle the parsed hierarchy as tuple
+        (root scope name, declarations, entries, vcdIds in the order of idcode2var)
+        where entries are (parent scope index, name, scopeType) for scopes and
+        (parent scope index, name, width, sigType, vcdId, isAlias, bitRange) for variables
+        in the order of children, the root scope has index 0 and other scopes are numbered
+        in the order of entries starting from 1
+        """
+        vcd = VcdParser()
+        vcd.parse_str(header)
+        declarations = {}
+        for d in VcdCompactWaves.DECLARATIONS:
+            v = getattr(vcd, d, None)
+            if v is not None:
+                declarations[d] = v
+
+        entries = []
+        scopeCnt = 1
+
+        def walk(scope: VcdVarScope, scopeIndex: int):
+            nonlocal scopeCnt
+            for name, ch in scope.children.items():
+                if isinstance(ch, VcdVarScope):
+                    entries.append((scopeIndex, name, ch.scopeType))
+                    i = scopeCnt
+                    scopeCnt += 1
+                    walk(ch, i)
+                else:
+                    vcdId = ch.vcdId
+                    isAlias = not isinstance(vcdId, str)
+                    if isAlias:
+                        vcdId = vcdId.vcdId
+                    entries.append((scopeIndex, name, ch.width, ch.sigType, vcdId, isAlias, ch.bitRange))
+
+        walk(vcd.scope, 0)
+        template = (vcd.scope.name, declarations, entries, list(vcd.idcode2var.keys()))
+        return pickle.dumps(template, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def getTemplate(self, header: str) -> bytes:
+        """
+        :return: pickled template for the header
+        """
+        digest = self.headerDigest(header)
+        templates = self._templates
+        template = templates.get(digest, None)
+        if template is not None:
+            templates.move_to_end(digest)
+            self.hits += 1
+            return template
+
+        fileName = None
+        if self.cacheDir is not None:
+            fileName = self._templateFileName(digest)
+            try:
+                with open(fileName, "rb") as f:
+                    template = f.read()
+            except FileNotFoundError:
+                pass
+
+        if template is None:
+            self.misses += 1
+            template = self.buildTemplate(header)
+            if fileName is not None:
+                os.makedirs(self.cacheDir, exist_ok=True)
+                # write to temporary file first so concurrent readers never see a partial file
+                with NamedTemporaryFile("wb", dir=self.cacheDir, delete=False) as f:
+                    f.write(template)
+                os.replace(f.name, fileName)
+        else:
+            self.hits += 1
+
+        templates[digest] = template
+        if len(templates) > self.maxSize:
+            templates.popitem(last=False)
+        return template
+
+    @staticmethod
+    def instantiate(template: bytes, parser: VcdParser):
+        """
+        Load the header from template to parser which has not parsed anything yet,
+        :meth:`VcdParser.vcd_enddefinitions` is called as if the header was parsed
+        """
+        rootName, declarations, entries, order = pickle.loads(template)
+        # the cyclic GC would be triggered many times while creating the objects
+        gcEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            scopes = [VcdVarScope(rootName, None)]
+            owners = {}
+            aliases = []
+            for e in entries:
+                if len(e) == 3:
+                    p, name, scopeType = e
+                    parent = scopes[p]
+                    ch = VcdVarScope(name, parent, scopeType)
+                    scopes.append(ch)
+                else:
+                    p, name, width, sigType, vcdId, isAlias, bitRange = e
+                    parent = scopes[p]
+                    ch = VcdVarParsingInfo(vcdId, name, width, sigType, parent, bitRange)
+                    if isAlias:
+                        aliases.append(ch)
+                    else:
+                        owners[vcdId] = ch
+                parent.children[name] = ch
+            for a in aliases:
+                a.vcdId = owners[a.vcdId]
+        finally:
+            if gcEnabled:
+                gc.enable()
+
+        parser.scope = scopes[0]
+        parser.idcode2var = {vcdId: owners[vcdId] for vcdId in order}
+        parser.idcode2series = {vcdId: owners[vcdId].data for vcdId in order}
+        for k, v in declarations.items():
+            setattr(parser, k, v)
+        parser.vcd_enddefinitions(iter(((0, "$end"),)), "$enddefinitions")
+
+    def parse(self, file_handle, parser: Optional[VcdParser]=None) -> VcdParser:
+        """
+        Parse VCD file with the header from cache
+
+        :param file_handle: opened text file (or other iterator of lines)
+        :param parser: optional new instance of VcdParser (or its subclass) used for parsing
+        :return: the parser with the parsed data
+        """
+        if parser is None:
+            parser = VcdParser()
+        lines = iter(file_handle)
+        header, rest = readVcdHeaderText(lines)
+        self.instantiate(self.getTemplate(header), parser)
+        parser.parse(chain((rest,), lines))
+        return parser
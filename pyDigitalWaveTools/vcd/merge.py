@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Streaming merge of multiple VCD files (e.g. from partitions of parallel simulation) to one
+"""
+
+from heapq import merge
+from typing import Dict, List, Tuple
+
+from pyDigitalWaveTools.vcd.common import VcdVarScope
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.streaming import readVcdHeader, iterVcdBody, \
+    VCD_BODY_TIME, VCD_BODY_KEYWORD, getVarVcdId, writeVcdHeaderDeclarations
+from pyDigitalWaveTools.vcd.value_format import VcdRawFormatter
+from pyDigitalWaveTools.vcd.writer import VcdWriter, VcdVarWritingScope, VcdVarWritingInfo
+
+
+def _iterBody(lines, inputIndex: int):
+    """
+    :return: generator of tuples (time, inputIndex, kind, a, b) where kind, a, b
+        are from :func:`pyDigitalWaveTools.vcd.streaming.iterVcdBody` (time updates are not yielded)
+    """
+    t = 0
+    for kind, a, b in iterVcdBody(lines):
+        if kind == VCD_BODY_TIME:
+            t = a
+        else:
+            yield (t, inputIndex, kind, a, b)
+
+
+def _copyScope(inputIndex: int, scope: VcdVarScope, dst: VcdVarWritingScope,
+               idMap: Dict[Tuple[int, str], VcdVarWritingInfo]):
+    for name, ch in scope.children.items():
+        if isinstance(ch, VcdVarScope):
+            with dst.varScope(name, ch.scopeType) as chDst:
+                _copyScope(inputIndex, ch, chDst, idMap)
+        else:
+            # sig is (inputIndex, vcdId in input), the aliases in input are aliases in output as well
+            sig = (inputIndex, getVarVcdId(ch))
+            var = idMap.get(sig, None)
+            if var is None:
+                idMap[sig] = dst.addVar(sig, name, ch.sigType, ch.width, VcdRawFormatter(), ch.bitRange)
+            else:
+                dst.addVarAlias(name, var, ch.bitRange)
+
+
+def mergeVcdFiles(inputs: List[Tuple[str, object]], oFile):
+    """
+    Merge VCD files, the hierarchy of each input is placed under a new top scope
+    with the specified name and the vcdIds are reallocated. The value change sections are merged
+    in time order, only a single value change per input is kept in memory.
+    The $dumpvars/$dumpall/$dumpon/$dumpoff blocks are copied to output.
+    The $date/$version are taken from the first input, the $timescale of all inputs has to be the same.
+
+    :param inputs: list of tuples (name of top scope for this input, input VCD text file)
+    :param oFile: output text file
+    """
+    names = [name for name, _ in inputs]
+    if len(set(names)) != len(names):
+        raise ValueError("Names of inputs must be unique", names)
+
+    headers: List[VcdParser] = []
+    lineIterators = []
+    for _, iFile in inputs:
+        lines = iter(iFile)
+        _, vcd = readVcdHeader(lines)
+        headers.append(vcd)
+        lineIterators.append(lines)
+
+    timescales = set(getattr(vcd, "timescale", None) for vcd in headers)
+    if len(timescales) > 1:
+        raise ValueError("Inputs have different timescale", timescales)
+
+    writeVcdHeaderDeclarations(headers[0], oFile)
+    writer = VcdWriter(oFile)
+    idMap: Dict[Tuple[int, str], VcdVarWritingInfo] = {}
+    for i, (name, vcd) in enumerate(zip(names, headers)):
+        with writer.varScope(name) as top:
+            _copyScope(i, vcd.scope, top, idMap)
+    writer.enddefinitions()
+
+    logChange = writer.logChange
+    # the merge is stable, items with the same time are ordered by input index
+    # so the keyword blocks of different inputs are never interleaved
+    items = merge(*(_iterBody(lines, i) for i, lines in enumerate(lineIterators)),
+                  key=lambda x: x[0])
+    for t, i, kind, a, b in items:
+        if kind == VCD_BODY_KEYWORD:
+            writer.setTime(t)
+            oFile.write(f"{a:s}\n")
+            continue
+        sig = (i, a)
+        if sig not in idMap:
+            raise ValueError(f"Input {names[i]:s}: value change of undefined variable {a:s}")
+        logChange(t, sig, b, None)
@@ -16,9 +16,10 @@ Refer to IEEE SystemVerilog standard 1800-2009 for VCD details Section 21.7 Valu
 from collections import defaultdict
 from io import StringIO
 from itertools import dropwhile
-from typing import Union, Dict, Tuple, List
+from typing import Union, Dict, Tuple, List, Optional
 
 from pyDigitalWaveTools.vcd.common import VcdVarScope, VcdVarInfo
+from pyDigitalWaveTools.vcd.spill import VcdSeriesSpiller
 
 
 class VcdSyntaxError(Exception):
@@ -42,18 +43,22 @@ class VcdDuplicatedVariableError(Exception):
 class VcdVarParsingInfo(VcdVarInfo):
     """
     Container of informations about variable in VCD for parsing of VCD file
+
+    :ivar ~.bitRange: None or the bit range after the reference in $var (e.g. "[7:0]")
     """
 
-    def __init__(self, vcdId: Union[str, VcdVarInfo], name: str, width, sigType, parent):
+    def __init__(self, vcdId: Union[str, VcdVarInfo], name: str, width, sigType, parent,
+                 bitRange: Optional[str]=None):
         super(VcdVarParsingInfo, self).__init__(
             vcdId, name, width, sigType, parent)
+        self.bitRange = bitRange
         self.data: List[Tuple[int, str]] = []
 
     def toJson(self):
         return {"name": self.name,
                 "type": {"width": self.width,
                          "name": self.sigType},
-                "data": self.data}
+                "data": self.data if isinstance(self.data, list) else list(self.data)}
 
 
 class VcdParser(object):
@@ -69,6 +74,9 @@ class VcdParser(object):
     :ivar ~.idcode2series: dictionary {idcode: series} where series are list of tuples (time, value),
         the list commes from VcdVarParsingInfo object
     :ivar ~.signals: dict {topName: VcdSignalInfo instance}
+    :ivar ~.spiller: None or VcdSeriesSpiller if memoryBudget is specified, the largest series are
+        moved to a temporary file (:class:`pyDigitalWaveTools.vcd.spill.SpilledSeries`)
+        once the budget is exceeded
     '''
     VECTOR_VALUE_CHANGE_PREFIX = {
         "b", "B", "r", "R"
@@ -77,7 +85,13 @@ class VcdParser(object):
         "begin", "fork", "function", "module", "task"
     }
 
-    def __init__(self):
+    def __init__(self, memoryBudget: Optional[int]=None, spillDir: Optional[str]=None):
+        """
+        :param memoryBudget: approximate size of value change series kept in memory in bytes,
+            enforced as max number of (time, value) items in memory
+            (memoryBudget // :data:`pyDigitalWaveTools.vcd.spill.SERIES_ITEM_SIZE_ESTIMATE`)
+        :param spillDir: directory for the temporary file of spilled series
+        """
         keyword_functions = {
             # declaration_keyword ::=
             "$comment": self.drop_while_end,
@@ -114,6 +128,11 @@ class VcdParser(object):
         self.idcode2var: Dict[str, VcdVarParsingInfo] = {}
         self.idcode2series: Dict[str, List[Tuple[int, str]]] = {}
         self.end_of_definitions = False
+        if memoryBudget is None:
+            self.spiller = None
+        else:
+            self.spiller = VcdSeriesSpiller(memoryBudget, spillDir)
+            self.value_change = self._value_change_budgeted
 
     def on_error(self, lineNo, vcdId):
         print ("Wrong vcdId @ line", lineNo, ":", vcdId) 
@@ -125,6 +144,17 @@ class VcdParser(object):
         except:
             self.on_error(lineNo, vcdId)
 
+    def _value_change_budgeted(self, vcdId, value, lineNo):
+        try:
+            self.idcode2series[vcdId].append((self.now, value))
+        except KeyError:
+            self.on_error(lineNo, vcdId)
+            return
+        spiller = self.spiller
+        spiller.inMemory += 1
+        if spiller.inMemory > spiller.maxInMemory:
+            spiller.spill(self)
+
     def parse_str(self, vcd_string: str):
         """
         Same as :func:`~.parse` just for string
@@ -152,12 +182,11 @@ class VcdParser(object):
         #        yield t
         # tokeniser = tokeniser_wrap()
 
-        while True:
+        # parse VCD until the end of definitions
+        # (the definitions may be already loaded e.g. from VcdHeaderCache)
+        while not self.end_of_definitions:
             token = next(tokeniser)
-            # parse VCD until the end of definitions
             self.keyword_dispatch[token[1]](tokeniser, token[1])
-            if self.end_of_definitions:
-                break
 
         while True:
             try:
@@ -227,7 +256,7 @@ class VcdParser(object):
         assert next(tokeniser)[1] == "$end"
         s = self.scope
         name = scopeName[1]
-        self.scope = VcdVarScope(name, s)
+        self.scope = VcdVarScope(name, s, scopeTypeName)
         if isinstance(s, VcdVarScope):
             if name in s.children:
                 self.scope = s.children[name]
@@ -241,13 +270,14 @@ class VcdParser(object):
 
     def vcd_var(self, tokeniser, keyword):
         data = tuple(self.read_while_end(tokeniser))
-        # ignore range on identifier ( TODO  Fix this )
         (var_type, size, vcdId, reference) = data[:4]
+        # the range on identifier is kept only as a string (e.g. "[7:0]")
+        bitRange = " ".join(data[4:]) if len(data) > 4 else None
         parent = self.scope
         size = int(size)
         parent_var = self.idcode2var.get(vcdId, None)
         info = VcdVarParsingInfo(vcdId if parent_var is None else parent_var,
-                                 reference, size, var_type, parent)
+                                 reference, size, var_type, parent, bitRange)
         assert reference not in parent.children
         parent.children[reference] = info
         if parent_var is None:
@@ -343,6 +373,6 @@ if __name__ == '__main__':
 
         if argc == 3:
             with open(fOut, 'w') as jsonFile:
-                jsonFile.write(data)
+                json.dump(data, jsonFile)
         else:
             print(json.dumps(data))
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Per-variable accounting of changes, written bytes and formatting time
+for :meth:`VcdWriter.enableProfiling`/:meth:`JsonWriter.enableProfiling`
+
+The profile replaces the valueFormatter of the variable, the writers without profiling
+are not affected in any way.
+"""
+
+import json
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from pyDigitalWaveTools.vcd.common import VcdVarInfo, VcdVarScope
+from pyDigitalWaveTools.vcd.writer import VcdOutputCapture
+
+
+def varPath(varInfo: VcdVarInfo) -> str:
+    """
+    :return: names of scopes and variable separated by "."
+    """
+    names = [varInfo.name]
+    o = varInfo.parent
+    while isinstance(o, VcdVarScope):
+        names.append(o.name)
+        o = o.parent
+    return ".".join(reversed(names))
+
+
+class VcdVarProfile():
+    """
+    Wrapper of the value formatter of a single variable
+
+    :ivar ~.varInfo: profiled variable
+    :ivar ~.changes: number of calls of the formatter
+    :ivar ~.bytes: number of written characters
+    :ivar ~.time: time spent in formatter in seconds
+    """
+
+    def __init__(self, varInfo: VcdVarInfo):
+        self.varInfo = varInfo
+        self.changes = 0
+        self.bytes = 0
+        self.time = 0.0
+        self._format = varInfo.valueFormatter
+        self._capture = VcdOutputCapture()
+
+    def format(self, newVal, valueUpdater, t: int, out):
+        cap = self._capture
+        t0 = perf_counter()
+        self._format(newVal, valueUpdater, t, cap)
+        self.time += perf_counter() - t0
+        self.changes += 1
+        if cap:
+            s = "".join(cap)
+            cap.clear()
+            self.bytes += len(s)
+            out.write(s)
+
+
+class JsonVarProfile(VcdVarProfile):
+    """
+    :class:`~.VcdVarProfile` for formatters which append to list of (time, value),
+    the bytes are the size of appended items in json
+    """
+
+    def format(self, newVal, valueUpdater, t: int, out: list):
+        n = len(out)
+        t0 = perf_counter()
+        self._format(newVal, valueUpdater, t, out)
+        self.time += perf_counter() - t0
+        self.changes += 1
+        for i in range(n, len(out)):
+            self.bytes += len(json.dumps(out[i], separators=(",", ":")))
+
+
+def profilingReport(profiles: List[VcdVarProfile], topN: Optional[int]=None) -> dict:
+    """
+    :param topN: max number of variables in report (sorted by bytes)
+    :return: dictionary {"vars": [...], "scopes": [...]} where items are dictionaries
+        {"name": path, "changes": int, "bytes": int, "time": float} sorted by bytes, descending
+    """
+    scopes: Dict[str, dict] = {}
+    variables = []
+    for p in profiles:
+        path = varPath(p.varInfo)
+        variables.append({"name": path, "changes": p.changes, "bytes": p.bytes, "time": p.time})
+        i = path.rfind(".")
+        while i > 0:
+            path = path[:i]
+            s = scopes.get(path, None)
+            if s is None:
+                s = scopes[path] = {"name": path, "changes": 0, "bytes": 0, "time": 0.0}
+            s["changes"] += p.changes
+            s["bytes"] += p.bytes
+            s["time"] += p.time
+            i = path.rfind(".")
+
+    key = lambda x: (x["bytes"], x["changes"])
+    variables.sort(key=key, reverse=True)
+    if topN is not None:
+        variables = variables[:topN]
+    return {
+        "vars": variables,
+        "scopes": sorted(scopes.values(), key=key, reverse=True),
+    }
+
+
+def formatProfilingReport(report: dict) -> str:
+    """
+    Format report from :func:`~.profilingReport` as a text table
+    """
+    buff = []
+    for title, items in (("Noisiest variables", report["vars"]), ("Scopes", report["scopes"])):
+        buff.append(f"{title:s}:\n{'changes':>12s} {'bytes':>14s} {'time[s]':>10s}  name\n")
+        for i in items:
+            buff.append(f"{i['changes']:12d} {i['bytes']:14d} {i['time']:10.4f}  {i['name']:s}\n")
+    return "".join(buff)
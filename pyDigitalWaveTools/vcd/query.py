@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Query engine for conditions over multiple signals of parsed VCD
+
+.. code-block:: python
+
+    q = VcdQuery(vcd.scope)
+    valid, ready, stall = q["top.valid"], q["top.ready"], q["top.stall"]
+    q.intervals(valid & ready & ~stall)  # [(start, end), ...]
+    q.intervals(q["top.addr"] == 0x10)
+    q.intervals(q["top.addr"][7:4] == 3)
+    q.intervals(q["top.addr"] == 0x10, unknown=True)  # where the result is X
+
+The values are 4-state, each value is represented as a tuple (val, mask)
+where mask has 1 for bits which are X/Z (val bit is 0 for them).
+The operators follow Verilog semantics (e.g. 0 & x == 0, 1 | x == 1, x == 1 is x).
+
+Each expression node is evaluated by a plain Python loop over the changes of its operands
+into a step function (init value, times, values): binary operators merge the change
+times of the operands, all results are compacted so the runs of the same value
+are not processed by the parent nodes and the results of operators
+are memoized for the value pairs.
+"""
+
+from math import inf
+import operator
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from pyDigitalWaveTools.vcd.common import VCD_REAL_SIG_TYPES, VcdVarInfo, VcdVarScope
+
+# value of 4-state logic (val, mask)
+LogicValue = Tuple[Union[int, float, str], int]
+# (init value, times, values)
+StepFunction = Tuple[LogicValue, List[int], List[LogicValue]]
+
+BIT_0 = (0, 0)
+BIT_1 = (1, 0)
+BIT_X = (0, 1)
+
+_VAL_TABLE = str.maketrans("xXzZ", "0000")
+_MASK_TABLE = str.maketrans("01xXzZ", "001111")
+# max size of memo of operator results
+_MEMO_SIZE = 1 << 16
+
+
+def decodeVcdLogicValue(value: str, width: int) -> LogicValue:
+    """
+    Convert VCD value (e.g. "1", "x", "b01x", "bz") to tuple (val, mask)
+    """
+    bits = value[1:] if value[0] in "bB" else value
+    val = int(bits.translate(_VAL_TABLE), 2)
+    mask = int(bits.translate(_MASK_TABLE), 2)
+    if mask and len(bits) < width and bits[0] in "xXzZ":
+        # left extension with x/z
+        mask |= ((1 << width) - 1) ^ ((1 << len(bits)) - 1)
+    return (val, mask)
+
+
+def _pushChange(times: List[int], values: List[LogicValue], t: int, v: LogicValue):
+    """
+    Append change to step function, overwrite the change at the same time
+    and skip the changes to the same value
+    """
+    if times and times[-1] == t:
+        times.pop()
+        values.pop()
+    if values and values[-1] == v:
+        return
+    times.append(t)
+    values.append(v)
+
+
+class WaveExpr():
+    """
+    Base class of query expression nodes, the operators build the expression tree
+
+    :ivar ~.width: bit width of the result
+    """
+
+    def __init__(self, width: int):
+        self.width = width
+        self._evaluated: Optional[StepFunction] = None
+
+    def _full(self):
+        return (1 << self.width) - 1
+
+    def evaluate(self) -> StepFunction:
+        """
+        :return: tuple (initial value, times of changes, values after changes)
+        """
+        res = self._evaluated
+        if res is None:
+            res = self._evaluated = self._evaluate()
+        return res
+
+    def _evaluate(self) -> StepFunction:
+        raise NotImplementedError(self)
+
+    def _operand(self, other) -> "WaveExpr":
+        if isinstance(other, WaveExpr):
+            return other
+        return WaveConst(other, self.width)
+
+    def _binary(self, other, fn, width=None) -> "WaveExpr":
+        other = self._operand(other)
+        if width is None:
+            width = max(self.width, other.width)
+        return WaveBinaryOp(fn, self, other, width)
+
+    def __and__(self, other):
+        full = (1 << max(self.width, self._operand(other).width)) - 1
+        return self._binary(other, lambda a, b: _and(a, b, full))
+
+    __rand__ = __and__
+
+    def __or__(self, other):
+        return self._binary(other, _or)
+
+    __ror__ = __or__
+
+    def __xor__(self, other):
+        return self._binary(other, _xor)
+
+    __rxor__ = __xor__
+
+    def __invert__(self):
+        full = self._full()
+        return WaveUnaryOp(lambda a: ((~a[0]) & full & ~a[1], a[1]), self, self.width)
+
+    def __eq__(self, other):
+        return self._binary(other, _eq, 1)
+
+    def __ne__(self, other):
+        return self._binary(other, _ne, 1)
+
+    def __lt__(self, other):
+        return self._binary(other, _compare(operator.lt), 1)
+
+    def __le__(self, other):
+        return self._binary(other, _compare(operator.le), 1)
+
+    def __gt__(self, other):
+        return self._binary(other, _compare(operator.gt), 1)
+
+    def __ge__(self, other):
+        return self._binary(other, _compare(operator.ge), 1)
+
+    __hash__ = object.__hash__
+
+    def __getitem__(self, index: Union[int, slice]):
+        """
+        Bit select, the slice is in Verilog order (inclusive) e.g. sig[7:4]
+        """
+        if isinstance(index, slice):
+            assert index.step is None, index
+            hi, lo = index.start, index.stop
+        else:
+            hi = lo = index
+        assert 0 <= lo <= hi < self.width, (hi, lo, self.width)
+        w = hi - lo + 1
+        full = (1 << w) - 1
+        return WaveUnaryOp(lambda a: ((a[0] >> lo) & full, (a[1] >> lo) & full), self, w)
+
+    def any(self):
+        """
+        Reduction or (the value is not 0)
+        """
+        return WaveUnaryOp(_any, self, 1)
+
+    def all(self):
+        """
+        Reduction and (all bits are 1)
+        """
+        full = self._full()
+        return WaveUnaryOp(lambda a: BIT_1 if a[0] == full else (BIT_X if (a[0] | a[1]) == full else BIT_0),
+                           self, 1)
+
+
+def _and(a: LogicValue, b: LogicValue, full: int):
+    (av, am), (bv, bm) = a, b
+    known0 = ~(av | am) | ~(bv | bm)
+    m = (am | bm) & ~known0 & full
+    return (av & bv & ~m, m)
+
+
+def _or(a: LogicValue, b: LogicValue):
+    (av, am), (bv, bm) = a, b
+    known1 = av | bv
+    m = (am | bm) & ~known1
+    return (known1, m)
+
+
+def _xor(a: LogicValue, b: LogicValue):
+    (av, am), (bv, bm) = a, b
+    m = am | bm
+    return ((av ^ bv) & ~m, m)
+
+
+def _eq(a: LogicValue, b: LogicValue):
+    (av, am), (bv, bm) = a, b
+    m = am | bm
+    if not m:
+        return BIT_1 if av == bv else BIT_0
+    elif (av ^ bv) & ~m:
+        # some of known bits differ
+        return BIT_0
+    else:
+        return BIT_X
+
+
+def _ne(a: LogicValue, b: LogicValue):
+    v, m = _eq(a, b)
+    return (v ^ 1 if not m else 0, m)
+
+
+def _compare(op: Callable):
+
+    def compare(a: LogicValue, b: LogicValue):
+        if a[1] or b[1]:
+            return BIT_X
+        return BIT_1 if op(a[0], b[0]) else BIT_0
+
+    return compare
+
+
+def _any(a: LogicValue):
+    if a[0]:
+        return BIT_1
+    elif a[1]:
+        return BIT_X
+    else:
+        return BIT_0
+
+
+class WaveConst(WaveExpr):
+    """
+    Constant value, the value may be an int or a VCD value string (e.g. "b01x")
+    """
+
+    def __init__(self, value: Union[int, float, str], width: int):
+        super(WaveConst, self).__init__(width)
+        if isinstance(value, str):
+            value = decodeVcdLogicValue(value, width)
+        else:
+            value = (value, 0)
+        self.value = value
+        self._evaluated = (value, [], [])
+
+
+class WaveSignal(WaveExpr):
+    """
+    Signal from parsed VCD
+
+    :ivar ~.var: VcdVarInfo with data (the aliases are resolved)
+    """
+
+    def __init__(self, var: VcdVarInfo):
+        while isinstance(var.vcdId, VcdVarInfo):
+            var = var.vcdId
+        super(WaveSignal, self).__init__(var.width)
+        self.var = var
+
+    def _evaluate(self):
+        width = self.width
+        sigType = self.var.sigType
+        cache: Dict[str, LogicValue] = {}
+        times = []
+        values = []
+        for t, v in self.var.data:
+            d = cache.get(v, None)
+            if d is None:
+                if sigType in VCD_REAL_SIG_TYPES:
+                    d = (float(v[1:]), 0)
+                elif sigType == "string":
+                    d = (v, 0)
+                else:
+                    d = decodeVcdLogicValue(v, width)
+                cache[v] = d
+            _pushChange(times, values, t, d)
+        return ((0, self._full()), times, values)
+
+
+class WaveUnaryOp(WaveExpr):
+
+    def __init__(self, fn: Callable[[LogicValue], LogicValue], a: WaveExpr, width: int):
+        super(WaveUnaryOp, self).__init__(width)
+        self.fn = fn
+        self.a = a
+
+    def _evaluate(self):
+        fn = self.fn
+        init, aTimes, aValues = self.a.evaluate()
+        memo = {}
+        times = []
+        values = []
+        for t, v in zip(aTimes, aValues):
+            r = memo.get(v, None)
+            if r is None:
+                if len(memo) > _MEMO_SIZE:
+                    memo.clear()
+                r = memo[v] = fn(v)
+            _pushChange(times, values, t, r)
+        return (fn(init), times, values)
+
+
+class WaveBinaryOp(WaveExpr):
+
+    def __init__(self, fn: Callable[[LogicValue, LogicValue], LogicValue], a: WaveExpr, b: WaveExpr, width: int):
+        super(WaveBinaryOp, self).__init__(width)
+        self.fn = fn
+        self.a = a
+        self.b = b
+
+    def _evaluate(self):
+        fn = self.fn
+        aV, aTimes, aValues = self.a.evaluate()
+        bV, bTimes, bValues = self.b.evaluate()
+        init = fn(aV, bV)
+        memo = {}
+        times = []
+        values = []
+        aLen = len(aTimes)
+        bLen = len(bTimes)
+        ai = bi = 0
+        while ai < aLen or bi < bLen:
+            aT = aTimes[ai] if ai < aLen else inf
+            bT = bTimes[bi] if bi < bLen else inf
+            if aT <= bT:
+                t = aT
+                aV = aValues[ai]
+                ai += 1
+            if bT <= aT:
+                t = bT
+                bV = bValues[bi]
+                bi += 1
+            k = (aV, bV)
+            r = memo.get(k, None)
+            if r is None:
+                if len(memo) > _MEMO_SIZE:
+                    memo.clear()
+                r = memo[k] = fn(aV, bV)
+            _pushChange(times, values, t, r)
+        return (init, times, values)
+
+
+class VcdQuery():
+    """
+    Entry point for the queries over the signals of parsed VCD
+
+    :ivar ~.scope: root VcdVarScope (e.g. VcdParser.scope)
+    """
+
+    def __init__(self, scope: VcdVarScope):
+        self.scope = scope
+        self._signals: Dict[str, WaveSignal] = {}
+
+    def __getitem__(self, path: str) -> WaveSignal:
+        """
+        :param path: path of the variable (names separated by ".", without name of the root scope)
+        """
+        s = self._signals.get(path, None)
+        if s is None:
+            o = self.scope
+            for name in path.split("."):
+                o = o.children[name]
+            if isinstance(o, VcdVarScope):
+                raise KeyError("Not a variable", path)
+            s = self._signals[path] = WaveSignal(o)
+        return s
+
+    def intervals(self, expr: WaveExpr, unknown: bool=False, tEnd: Optional[int]=None) -> List[Tuple[int, Optional[int]]]:
+        """
+        :param expr: condition, if it has more bits it is true if any bit is 1
+        :param unknown: if True return the intervals where the result of the condition is X instead
+        :param tEnd: end time of the last interval if it does not end before the end of the data
+        :return: list of tuples (start, end) where the condition holds, start is inclusive, end exclusive
+        """
+        if expr.width != 1:
+            expr = expr.any()
+        target = BIT_X if unknown else BIT_1
+        init, times, values = expr.evaluate()
+        res = []
+        start = 0 if init == target else None
+        for t, v in zip(times, values):
+            if v == target:
+                if start is None:
+                    start = t
+            elif start is not None:
+                if start != t:
+                    res.append((start, t))
+                start = None
+        if start is not None:
+            res.append((start, tEnd))
+        return res
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Iterator of value changes of VCD file in columnar batches of fixed size
+
+.. code-block:: python
+
+    with open("dump.vcd") as f:
+        reader = VcdRecordBatchReader(f, batchSize=65536)
+        for batch in reader:
+            # numpy.frombuffer(batch.times, dtype=numpy.int64) etc. for vectorized processing
+            for t, varI, code in zip(batch.times, batch.varIndex, batch.values):
+                vcdId = reader.vcdIds[varI]
+                value = batch.dictionary[code]
+
+Only the current batch is kept in memory, the values are dictionary encoded
+and the dictionary is specific for each batch so its size is also bounded by the batch size.
+"""
+
+from array import array
+from itertools import chain
+from typing import Iterator, List, Optional
+
+from pyDigitalWaveTools.vcd.header_cache import VcdHeaderCache, readVcdHeaderText
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.streaming import VECTOR_VALUE_PREFIX
+
+
+class VcdRecordBatch():
+    """
+    Columnar batch of value changes in the order of VCD file
+
+    :ivar ~.times: array of int64 times of changes
+    :ivar ~.varIndex: array of uint32 indexes of variables in :attr:`VcdRecordBatchReader.vcdIds`
+    :ivar ~.values: array of uint32 indexes of values in dictionary
+    :ivar ~.dictionary: list of distinct values in this batch in the format of VCD file
+        (e.g. "1", "b0101", "r1.5", "sabc")
+    """
+
+    def __init__(self, times: array, varIndex: array, values: array, dictionary: List[str]):
+        self.times = times
+        self.varIndex = varIndex
+        self.values = values
+        self.dictionary = dictionary
+
+    def __len__(self):
+        return len(self.times)
+
+    def decodedValues(self) -> List[str]:
+        """
+        :return: list of values (strings) for each change
+        """
+        dictionary = self.dictionary
+        return [dictionary[v] for v in self.values]
+
+
+class VcdRecordBatchReader():
+    """
+    Reads the header of VCD file on construction and yields :class:`~.VcdRecordBatch`
+    with at most batchSize changes when iterated
+
+    :ivar ~.parser: VcdParser with the parsed header (no value changes)
+    :ivar ~.vcdIds: list of vcdIds, the index in this list is used in :attr:`VcdRecordBatch.varIndex`
+        (the aliases share the vcdId with the original variable)
+    :ivar ~.batchSize: max number of changes in batch
+    """
+
+    def __init__(self, file_handle, batchSize: int=65536, headerCache: Optional[VcdHeaderCache]=None):
+        """
+        :param file_handle: opened text file (or other iterable of lines)
+        :param headerCache: optional cache of parsed headers
+        """
+        assert batchSize > 0, batchSize
+        lines = iter(file_handle)
+        header, rest = readVcdHeaderText(lines)
+        parser = VcdParser()
+        if headerCache is None:
+            parser.parse_str(header)
+        else:
+            headerCache.instantiate(headerCache.getTemplate(header), parser)
+        self.parser = parser
+        self.vcdIds = list(parser.idcode2var.keys())
+        self.batchSize = batchSize
+        self._lines = chain((rest,), lines)
+
+    def __iter__(self) -> Iterator[VcdRecordBatch]:
+        batchSize = self.batchSize
+        varIndexOf = {vcdId: i for i, vcdId in enumerate(self.vcdIds)}
+        onError = self.parser.on_error
+        now = 0
+        times = array("q")
+        varIndex = array("I")
+        values = array("I")
+        dictionary = []
+        codeOf = {}
+        tokens = (w for line in self._lines for w in line.split())
+        for tok in tokens:
+            c = tok[0]
+            if c == "#":
+                now = int(tok[1:])
+                continue
+            elif c == "$":
+                if tok == "$comment":
+                    for tok in tokens:
+                        if tok == "$end":
+                            break
+                # $dumpvars, $end, ... only wrap the value changes
+                continue
+            elif c in VECTOR_VALUE_PREFIX:
+                value = tok
+                vcdId = next(tokens)
+            else:
+                value = c
+                vcdId = tok[1:]
+
+            try:
+                vi = varIndexOf[vcdId]
+            except KeyError:
+                onError(None, vcdId)
+                continue
+            code = codeOf.get(value, None)
+            if code is None:
+                code = codeOf[value] = len(dictionary)
+                dictionary.append(value)
+            times.append(now)
+            varIndex.append(vi)
+            values.append(code)
+            if len(times) >= batchSize:
+                yield VcdRecordBatch(times, varIndex, values, dictionary)
+                times = array("q")
+                varIndex = array("I")
+                values = array("I")
+                dictionary = []
+                codeOf = {}
+
+        if times:
+            yield VcdRecordBatch(times, varIndex, values, dictionary)
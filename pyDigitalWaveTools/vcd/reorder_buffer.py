@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Merging front end for :class:`~pyDigitalWaveTools.vcd.writer.VcdWriter`
+and :class:`~pyDigitalWaveTools.json.writer.JsonWriter` which allows multiple producers
+(e.g. threads of parallel simulation) to log changes out of global time order.
+"""
+
+from heapq import heappush, heappop
+from threading import Condition
+from typing import Optional
+
+
+class LogChangeProducer():
+    """
+    Handle of a single producer of :class:`~.LogChangeReorderBuffer`,
+    the changes from a single producer have to be in time order
+
+    :ivar ~.time: the time of the last change or :meth:`~.advance`
+        (the producer promises that it does not log any change before this time)
+    """
+
+    def __init__(self, buff: "LogChangeReorderBuffer", name: str):
+        self._buff = buff
+        self.name = name
+        self.time = buff.watermark
+        self.closed = False
+
+    def logChange(self, time: int, sig, newVal, valueUpdater):
+        """
+        Same as :meth:`pyDigitalWaveTools.vcd.writer.VcdWriter.logChange`
+        """
+        self._buff._logChange(self, time, sig, newVal, valueUpdater)
+
+    def advance(self, time: int):
+        """
+        Notify the buffer that this producer will not log any change before this time
+        """
+        self._buff._advance(self, time)
+
+    def close(self):
+        """
+        Notify the buffer that this producer will not log any change anymore
+        """
+        self._buff._closeProducer(self)
+
+    def __enter__(self) -> "LogChangeProducer":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__:s} {self.name:s} time:{self.time:d}>"
+
+
+class LogChangeReorderBuffer():
+    """
+    Collects changes from multiple producers in a heap and forwards them to a writer
+    in time order once all producers have passed the time of the change (the watermark).
+
+    .. code-block:: python
+
+        buff = LogChangeReorderBuffer(vcdWriter, maxSkew=100)
+        producers = [buff.producer(f"partition{i:d}") for i in range(4)]
+        # each producer is used from its own thread
+        producers[0].logChange(t, sig, newVal, valueUpdater)
+        ...
+        buff.close()
+
+    :ivar ~.writer: VcdWriter/JsonWriter or any other object with logChange(time, sig, newVal, valueUpdater)
+    :ivar ~.maxSkew: None or max difference between time of the producer and the watermark,
+        producer which is ahead more is blocked until the others catch up (this bounds the size of the buffer)
+    :ivar ~.watermark: the minimum of time of all open producers, all changes before this time
+        were already forwarded to the writer
+    """
+
+    def __init__(self, writer, maxSkew: Optional[int]=None):
+        self.writer = writer
+        self.maxSkew = maxSkew
+        self.watermark = -1
+        self._producers = []
+        # items (time, sequence number, sig, newVal, valueUpdater), the sequence number
+        # keeps the arrival order of changes with the same time and avoids comparison of values
+        self._heap = []
+        self._seq = 0
+        self._cond = Condition()
+
+    def producer(self, name: Optional[str]=None) -> LogChangeProducer:
+        """
+        Register a new producer, its initial time is the current watermark
+        """
+        with self._cond:
+            if name is None:
+                name = str(len(self._producers))
+            p = LogChangeProducer(self, name)
+            self._producers.append(p)
+            return p
+
+    def _logChange(self, p: LogChangeProducer, time: int, sig, newVal, valueUpdater):
+        with self._cond:
+            self._moveProducer(p, time)
+            heappush(self._heap, (time, self._seq, sig, newVal, valueUpdater))
+            self._seq += 1
+            self._waitForOthers(p)
+
+    def _advance(self, p: LogChangeProducer, time: int):
+        with self._cond:
+            self._moveProducer(p, time)
+            self._waitForOthers(p)
+
+    def _closeProducer(self, p: LogChangeProducer):
+        with self._cond:
+            if p.closed:
+                return
+            p.closed = True
+            self._producers.remove(p)
+            self._updateWatermark()
+
+    def _moveProducer(self, p: LogChangeProducer, time: int):
+        if p.closed:
+            raise ValueError(f"{p} is already closed")
+        lt = p.time
+        if time < lt:
+            raise ValueError(f"{p} invalid time update {lt:d} -> {time:d}")
+        elif time != lt:
+            p.time = time
+            if lt == self.watermark:
+                self._updateWatermark()
+
+    def _waitForOthers(self, p: LogChangeProducer):
+        maxSkew = self.maxSkew
+        if maxSkew is not None:
+            while p.time - self.watermark > maxSkew:
+                self._cond.wait()
+
+    def _updateWatermark(self):
+        producers = self._producers
+        if producers:
+            wm = min(p.time for p in producers)
+        else:
+            wm = None
+
+        heap = self._heap
+        writer = self.writer
+        while heap and (wm is None or heap[0][0] < wm):
+            time, _, sig, newVal, valueUpdater = heappop(heap)
+            writer.logChange(time, sig, newVal, valueUpdater)
+
+        if wm is not None and wm != self.watermark:
+            self.watermark = wm
+            self._cond.notify_all()
+
+    def flush(self):
+        """
+        Forward all changes before current watermark to the writer
+        (normally done automatically when watermark moves)
+        """
+        with self._cond:
+            self._updateWatermark()
+
+    def close(self):
+        """
+        Close all producers and forward all remaining changes to the writer
+        """
+        with self._cond:
+            for p in self._producers:
+                p.closed = True
+            self._producers.clear()
+            self._updateWatermark()
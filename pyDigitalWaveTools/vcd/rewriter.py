@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Streaming VCD to VCD rewriter which filters variables, renames variables/scopes
+and crops the time range without building of the data model of the value changes.
+"""
+
+from typing import Callable, Collection, Dict, List, Optional, Set, Union
+
+from pyDigitalWaveTools.vcd.common import VcdVarScope
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.streaming import readVcdHeader, \
+    VECTOR_VALUE_PREFIX, formatValueChange, getVarVcdId, \
+    writeVcdHeaderDeclarations
+
+
+class VcdRewriter():
+    """
+    Rewrites VCD file line by line, the memory consumption does not depend on the size of input file.
+    The kept value change lines are copied as they are.
+    If the output is cropped by t0, the $dumpvars with values of all kept variables
+    is generated at t0.
+
+    .. code-block:: python
+
+        rw = VcdRewriter(keep={"top.dut.io"}, rename={"top.dut": "core"}, t0=1000, t1=2000)
+        with open("in.vcd") as fIn, open("out.vcd", "w") as fOut:
+            rw.rewrite(fIn, fOut)
+
+    :ivar ~.keep: None (keep all), collection of paths of kept variables/scopes
+        (path is "scope.subscope.var" without root) or function path -> bool which decides
+        if variable should be kept
+    :ivar ~.rename: dictionary {path of scope/variable: new name}
+    :ivar ~.t0: None or the start time of output (inclusive)
+    :ivar ~.t1: None or the end time of output (inclusive)
+    """
+
+    def __init__(self, keep: Union[None, Collection[str], Callable[[str], bool]]=None,
+                 rename: Optional[Dict[str, str]]=None,
+                 t0: Optional[int]=None, t1: Optional[int]=None):
+        self.keep = keep
+        self.rename = rename if rename is not None else {}
+        self.t0 = t0
+        self.t1 = t1
+
+    def _isKept(self, path: str):
+        keep = self.keep
+        if keep is None:
+            return True
+        elif callable(keep):
+            return keep(path)
+        else:
+            # variable or any of parent scopes
+            while True:
+                if path in keep:
+                    return True
+                i = path.rfind(".")
+                if i < 0:
+                    return False
+                path = path[:i]
+
+    def _collectScopeDefinitions(self, scope: VcdVarScope, path: str, keptIds: Set[str], buff: List[str]):
+        """
+        Collect definitions of kept variables in scope to buff
+        """
+        for name, ch in scope.children.items():
+            p = f"{path:s}.{name:s}" if path else name
+            newName = self.rename.get(p, name)
+            if isinstance(ch, VcdVarScope):
+                chBuff = []
+                self._collectScopeDefinitions(ch, p, keptIds, chBuff)
+                if chBuff:
+                    buff.append(f"$scope {ch.scopeType:s} {newName:s} $end\n")
+                    buff.extend(chBuff)
+                    buff.append("$upscope $end\n")
+            elif self._isKept(p):
+                vcdId = getVarVcdId(ch)
+                keptIds.add(vcdId)
+                if ch.bitRange is not None:
+                    buff.append(f"$var {ch.sigType:s} {ch.width:d} {vcdId:s} {newName:s} {ch.bitRange:s} $end\n")
+                else:
+                    buff.append(f"$var {ch.sigType:s} {ch.width:d} {vcdId:s} {newName:s} $end\n")
+
+    def writeHeader(self, vcd: VcdParser, oFile) -> Set[str]:
+        """
+        Write header with kept variables
+
+        :return: set of vcdIds of kept variables
+        """
+        writeVcdHeaderDeclarations(vcd, oFile)
+        keptIds = set()
+        buff = []
+        self._collectScopeDefinitions(vcd.scope, "", keptIds, buff)
+        buff.append("$enddefinitions $end\n")
+        oFile.write("".join(buff))
+        return keptIds
+
+    def rewrite(self, iFile, oFile):
+        """
+        :param iFile: input VCD text file (or iterator of lines)
+        :param oFile: output text file
+        """
+        lines = iter(iFile)
+        _, vcd = readVcdHeader(lines)
+        keptIds = self.writeHeader(vcd, oFile)
+
+        t0 = self.t0
+        t1 = self.t1
+        write = oFile.write
+        # True if we are in [t0, t1] and value changes should be copied to output
+        copying = t0 is None
+        # {vcdId: value change line} before t0
+        values = {}
+        # the time line is written lazily before first value change which is kept
+        pendingTime = None
+        # value of vector value change which id is on the next line
+        pendingVectorValue = None
+        inComment = False
+
+        for line in lines:
+            tokens = line.split()
+            tokCnt = len(tokens)
+            if not tokCnt:
+                continue
+            tok = tokens[0]
+            c = tok[0]
+            # fast path for typical lines with a single value change or time
+            if pendingVectorValue is None and not inComment:
+                if tokCnt == 1 and c not in VECTOR_VALUE_PREFIX and c != "$":
+                    if c == "#":
+                        t = int(tok[1:])
+                        if t1 is not None and t > t1:
+                            break
+                        if copying:
+                            pendingTime = line
+                        elif t >= t0:
+                            copying = True
+                            self._writeSnapshot(t0, values, write)
+                            values = None
+                            if t != t0:
+                                pendingTime = line
+                    elif tok[1:] in keptIds:
+                        if copying:
+                            if pendingTime is not None:
+                                write(pendingTime)
+                                pendingTime = None
+                            write(line)
+                        else:
+                            values[tok[1:]] = line
+                    continue
+                elif tokCnt == 2 and c in VECTOR_VALUE_PREFIX:
+                    if tokens[1] in keptIds:
+                        if copying:
+                            if pendingTime is not None:
+                                write(pendingTime)
+                                pendingTime = None
+                            write(line)
+                        else:
+                            values[tokens[1]] = line
+                    continue
+
+            # generic path for keywords and lines with multiple items
+            for tok in tokens:
+                if inComment:
+                    inComment = tok != "$end"
+                    continue
+                elif pendingVectorValue is not None:
+                    vcdId = tok
+                    value = pendingVectorValue
+                    pendingVectorValue = None
+                else:
+                    c = tok[0]
+                    if c == "#":
+                        t = int(tok[1:])
+                        if t1 is not None and t > t1:
+                            break
+                        if copying:
+                            pendingTime = f"{tok:s}\n"
+                        elif t >= t0:
+                            copying = True
+                            self._writeSnapshot(t0, values, write)
+                            values = None
+                            if t != t0:
+                                pendingTime = f"{tok:s}\n"
+                        continue
+                    elif c == "$":
+                        if tok == "$comment":
+                            inComment = True
+                        elif copying:
+                            # $dumpvars, $dumpall, $dumpon, $dumpoff, $end
+                            if pendingTime is not None:
+                                write(pendingTime)
+                                pendingTime = None
+                            write(f"{tok:s}\n")
+                        continue
+                    elif c in VECTOR_VALUE_PREFIX:
+                        pendingVectorValue = tok
+                        continue
+                    else:
+                        vcdId = tok[1:]
+                        value = c
+
+                if vcdId in keptIds:
+                    change = formatValueChange(vcdId, value)
+                    if copying:
+                        if pendingTime is not None:
+                            write(pendingTime)
+                            pendingTime = None
+                        write(change)
+                    else:
+                        values[vcdId] = change
+            else:
+                continue
+            # break from inner loop (t > t1)
+            break
+
+        if not copying:
+            # the input ended before t0
+            self._writeSnapshot(t0, values, write)
+        elif pendingTime is not None:
+            # keep the last time even if there is no kept value change after it
+            write(pendingTime)
+
+    @staticmethod
+    def _writeSnapshot(t0: int, values: Dict[str, str], write):
+        write(f"#{t0:d}\n$dumpvars\n{''.join(values.values()):s}$end\n")
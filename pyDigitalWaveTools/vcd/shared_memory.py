@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Publication of parsed VCD to shared memory (or to a file which is mmap-ed)
+so other processes can read it without parsing and without copying of the data.
+
+.. code-block:: python
+
+    # producer
+    shm = publishVcdSharedMemory(vcd)
+    # consumer (other process)
+    with VcdSharedWaves.attach(shm.name) as waves:
+        waves.scope.children["top"].children["clk"].data[-1]
+
+Layout of the buffer (all offsets are absolute and aligned to 8B):
+
+.. code-block:: text
+
+    magic b"PDWTSHM1"
+    int64 size of header
+    header (utf-8 json) {"declarations": {...}, "scope": <columnar json header>,
+                         "series": [[count, times offset, value ends offset, values offset], ...]}
+    for each series a columnar block (:mod:`pyDigitalWaveTools.vcd.columnar_series`):
+        int64[count] times
+        int64[count] end of each value in values
+        values (utf-8 bytes concatenated)
+"""
+
+from array import array
+import json
+import mmap
+from multiprocessing import shared_memory, resource_tracker
+from typing import Dict, List, Optional, Tuple
+
+from pyDigitalWaveTools.json.columnar_writer import scopeToColumnarJson
+from pyDigitalWaveTools.vcd.columnar_series import COLUMNAR_INT64, ColumnarSeriesView, \
+    alignInt64, encodeColumnarSeries
+from pyDigitalWaveTools.vcd.common import VcdVarInfo, VcdVarScope
+from pyDigitalWaveTools.vcd.compact import VcdCompactWaves
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+SHARED_VCD_MAGIC = b"PDWTSHM1"
+
+
+def _layoutVcd(vcd: VcdParser) -> Tuple[int, List[Tuple[int, bytes]]]:
+    """
+    :return: tuple (size of buffer, list of tuples (offset, data))
+    """
+    varIds = {vcdId: i for i, vcdId in enumerate(vcd.idcode2series.keys())}
+
+    def getVarId(v):
+        while isinstance(v.vcdId, VcdVarInfo):
+            v = v.vcdId
+        return varIds[v.vcdId]
+
+    declarations = {}
+    for d in VcdCompactWaves.DECLARATIONS:
+        v = getattr(vcd, d, None)
+        if v is not None:
+            declarations[d] = v
+
+    # data of series, offsets are relative to start of data section
+    chunks = []
+    seriesTable = []
+    offset = 0
+    for series in vcd.idcode2series.values():
+        count, block = encodeColumnarSeries(series)
+        chunks.append((offset, block))
+        endsOffset = offset + count * COLUMNAR_INT64
+        seriesTable.append([count, offset, endsOffset, endsOffset + count * COLUMNAR_INT64])
+        offset += len(block)
+
+    # the header contains absolute offsets and thus depends on its own size,
+    # the offsets are shifted until the size of header stabilizes
+    dataStart = 0
+    while True:
+        header = json.dumps({
+            "declarations": declarations,
+            "scope": scopeToColumnarJson(vcd.scope, getVarId),
+            "series": [[cnt, t + dataStart, e + dataStart, v + dataStart]
+                       for cnt, t, e, v in seriesTable],
+        }).encode()
+        _dataStart = alignInt64(len(SHARED_VCD_MAGIC) + COLUMNAR_INT64 + len(header))
+        if _dataStart == dataStart:
+            break
+        dataStart = _dataStart
+
+    res = [
+        (0, SHARED_VCD_MAGIC + array("q", [len(header)]).tobytes() + header),
+    ]
+    res.extend((o + dataStart, d) for o, d in chunks)
+    return dataStart + offset, res
+
+
+def writeVcdShared(vcd: VcdParser, buf) -> int:
+    """
+    Write parsed VCD to a writable buffer
+
+    :return: number of bytes used
+    """
+    size, chunks = _layoutVcd(vcd)
+    buf = memoryview(buf)
+    try:
+        if len(buf) < size:
+            raise ValueError("Buffer too small", len(buf), size)
+        for offset, data in chunks:
+            buf[offset:offset + len(data)] = data
+    finally:
+        buf.release()
+    return size
+
+
+def publishVcdSharedMemory(vcd: VcdParser, name: Optional[str]=None) -> shared_memory.SharedMemory:
+    """
+    Copy parsed VCD to a new shared memory block
+
+    :note: the caller is responsible for close() and unlink() of the returned shared memory
+    """
+    size, chunks = _layoutVcd(vcd)
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+    buf = shm.buf
+    for offset, data in chunks:
+        buf[offset:offset + len(data)] = data
+    return shm
+
+
+def writeVcdSharedFile(vcd: VcdParser, fileName: str):
+    """
+    Write parsed VCD to a file which can be later mapped by :meth:`VcdSharedWaves.openFile`
+    """
+    size, chunks = _layoutVcd(vcd)
+    with open(fileName, "wb") as f:
+        for offset, data in chunks:
+            f.seek(offset)
+            f.write(data)
+        f.truncate(size)
+
+
+class VcdSharedSeries(ColumnarSeriesView):
+    """
+    Read only sequence of tuples (time, value) backed by shared buffer,
+    the values are decoded on access.
+    """
+
+
+class VcdVarSharedInfo(VcdVarInfo):
+    """
+    Variable of :class:`~.VcdSharedWaves`
+
+    :ivar ~.data: VcdSharedSeries
+    """
+
+    def __init__(self, vcdId, name: str, width, sigType, parent, data: VcdSharedSeries):
+        super(VcdVarSharedInfo, self).__init__(vcdId, name, width, sigType, parent)
+        self.data = data
+
+    def toJson(self):
+        return {"name": self.name,
+                "type": {"width": self.width,
+                         "name": self.sigType},
+                "data": list(self.data)}
+
+
+class VcdSharedWaves():
+    """
+    Zero-copy reader of the buffer produced by :func:`~.publishVcdSharedMemory`/:func:`~.writeVcdSharedFile`
+
+    :ivar ~.scope: root VcdVarScope
+    :ivar ~.idcode2var: dictionary {index of series: VcdVarSharedInfo}
+    :ivar ~.idcode2series: dictionary {index of series: VcdSharedSeries}
+    :ivar ~.date: $date if present in the original VCD
+    :ivar ~.version: $version if present in the original VCD
+    :ivar ~.timescale: $timescale if present in the original VCD
+    """
+
+    def __init__(self, buf, owner=None):
+        """
+        :param buf: buffer with the data (it has to stay alive until close())
+        :param owner: optional object with close() method which owns the buffer
+        """
+        self._buf = buf = memoryview(buf)
+        self._owner = owner
+        if bytes(buf[:len(SHARED_VCD_MAGIC)]) != SHARED_VCD_MAGIC:
+            raise ValueError("Not a shared VCD buffer")
+        headerStart = len(SHARED_VCD_MAGIC) + COLUMNAR_INT64
+        headerSize, = array("q", bytes(buf[len(SHARED_VCD_MAGIC):headerStart]))
+        header = json.loads(bytes(buf[headerStart:headerStart + headerSize]))
+
+        for k, v in header["declarations"].items():
+            setattr(self, k, v)
+        self.idcode2series: Dict[int, VcdSharedSeries] = {
+            i: VcdSharedSeries(buf, *s) for i, s in enumerate(header["series"])
+        }
+        self.idcode2var: Dict[int, VcdVarSharedInfo] = {}
+        self.scope = self._build_scope(header["scope"], None)
+
+    def _build_scope(self, obj: dict, parent: Optional[VcdVarScope]):
+        name = obj["name"]
+        t = obj["type"]
+        if t["name"] == "struct":
+            s = VcdVarScope(name, parent)
+            children = s.children
+            for ch in obj["children"]:
+                ch = self._build_scope(ch, s)
+                children[ch.name] = ch
+            return s
+        else:
+            varId = obj["id"]
+            data = self.idcode2series[varId]
+            aliasOf = self.idcode2var.get(varId, None)
+            v = VcdVarSharedInfo(varId if aliasOf is None else aliasOf, name, t["width"], t["name"], parent, data)
+            if aliasOf is None:
+                self.idcode2var[varId] = v
+            return v
+
+    @classmethod
+    def attach(cls, name: str) -> "VcdSharedWaves":
+        """
+        Attach to shared memory created by :func:`~.publishVcdSharedMemory`
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # python < 3.13, the attached memory must not be registered in the resource tracker
+            # otherwise it would be unlinked when this process exits
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        return cls(shm.buf, shm)
+
+    @classmethod
+    def openFile(cls, fileName: str) -> "VcdSharedWaves":
+        """
+        Map the file written by :func:`~.writeVcdSharedFile`
+        """
+        with open(fileName, "rb") as f:
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(m, m)
+
+    def close(self):
+        """
+        Release the buffer, the series can not be accessed after this
+        """
+        for s in self.idcode2series.values():
+            s.release()
+        self._buf.release()
+        if self._owner is not None:
+            self._owner.close()
+            self._owner = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Out-of-core storage of the value change series for :class:`VcdParser` with memoryBudget
+
+All spilled series of a parser are stored in a single temporary file, each series is
+a list of extents (columnar blocks from :mod:`pyDigitalWaveTools.vcd.columnar_series`)
+and a tail of items appended after the last spill which is still in memory.
+The budget counts the items in memory, i.e. the items of not spilled series
+and the tails of spilled series.
+"""
+
+from bisect import bisect_right
+from collections.abc import Sequence
+import mmap
+from tempfile import TemporaryFile
+from typing import Dict, List, Optional, Tuple
+
+from pyDigitalWaveTools.vcd.columnar_series import ColumnarSeriesView, encodeColumnarSeries
+
+# estimate of the memory used by a single (time, value) tuple in a list
+SERIES_ITEM_SIZE_ESTIMATE = 120
+
+
+class SpilledSeries(Sequence):
+    """
+    Append-only sequence of tuples (time, value) stored in the file of :class:`~.VcdSeriesSpiller`.
+    The items appended after the last :meth:`~.flush` are kept in memory.
+
+    :ivar ~.spiller: owner of the file with the data
+    """
+
+    def __init__(self, spiller: "VcdSeriesSpiller"):
+        self.spiller = spiller
+        # list of tuples (item count, offset in file)
+        self._extents: List[Tuple[int, int]] = []
+        # number of items before each extent
+        self._extentStarts: List[int] = []
+        self._flushedCnt = 0
+        self._tail: List[Tuple[int, str]] = []
+        # views of extents, valid until the spiller is closed
+        self._views: List[ColumnarSeriesView] = []
+        spiller._series.append(self)
+
+    def append(self, item: Tuple[int, str]):
+        self._tail.append(item)
+
+    def extend(self, items):
+        self._tail.extend(items)
+
+    def flush(self):
+        """
+        Move the in-memory tail to the file
+        """
+        tail = self._tail
+        if not tail:
+            return
+        count, block = encodeColumnarSeries(tail)
+        offset = self.spiller._write(block)
+        self._extents.append((count, offset))
+        self._extentStarts.append(self._flushedCnt)
+        self._flushedCnt += count
+        self._tail = []
+
+    def _view(self, extentIndex: int) -> ColumnarSeriesView:
+        views = self._views
+        while len(views) <= extentIndex:
+            count, offset = self._extents[len(views)]
+            views.append(ColumnarSeriesView.fromBlock(self.spiller._buffer(), offset, count))
+        return views[extentIndex]
+
+    def __len__(self):
+        return self._flushedCnt + len(self._tail)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[_i] for _i in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError(i)
+
+        flushedCnt = self._flushedCnt
+        if i >= flushedCnt:
+            return self._tail[i - flushedCnt]
+        ei = bisect_right(self._extentStarts, i) - 1
+        return self._view(ei)[i - self._extentStarts[ei]]
+
+    def __iter__(self):
+        for ei in range(len(self._extents)):
+            yield from self._view(ei)
+        yield from self._tail
+
+    def _release(self):
+        for v in self._views:
+            v.release()
+        self._views.clear()
+
+
+class VcdSeriesSpiller():
+    """
+    Moves the largest series of :class:`VcdParser` to :class:`~.SpilledSeries`
+    once the number of (time, value) items in memory exceeds the limit derived from memoryBudget
+
+    :ivar ~.memoryBudget: approximate budget for the series in memory in bytes,
+        it is enforced as max number of items in memory (maxInMemory) assuming
+        SERIES_ITEM_SIZE_ESTIMATE bytes per item (the real size depends on the values)
+    :ivar ~.maxInMemory: max number of items in series kept in memory
+        (items of lists and tails of spilled series)
+    :ivar ~.inMemory: upper estimate of number of items in memory
+    :ivar ~.dir: directory for temporary file (None for system default)
+    :ivar ~.spilled: dictionary {vcdId: SpilledSeries}
+    """
+
+    def __init__(self, memoryBudget: int, dir: Optional[str]=None):
+        self.memoryBudget = memoryBudget
+        self.maxInMemory = max(memoryBudget // SERIES_ITEM_SIZE_ESTIMATE, 1)
+        self.inMemory = 0
+        self.dir = dir
+        self.spilled: Dict[str, SpilledSeries] = {}
+        # all series using the file
+        self._series: List[SpilledSeries] = []
+        self._file = None
+        self._size = 0
+        # all mappings are kept until close() because the views of extents may still use them
+        self._maps: List[mmap.mmap] = []
+        self._mapped: Optional[memoryview] = None
+
+    def _write(self, block: bytes) -> int:
+        """
+        Append block to the file
+
+        :return: offset of the block in the file
+        """
+        f = self._file
+        if f is None:
+            f = self._file = TemporaryFile(dir=self.dir)
+        offset = self._size
+        f.write(block)
+        self._size += len(block)
+        return offset
+
+    def _buffer(self) -> memoryview:
+        """
+        :return: memoryview of the whole file (remapped if the file grew)
+        """
+        mapped = self._mapped
+        if mapped is None or len(mapped) != self._size:
+            self._file.flush()
+            m = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(m)
+            if mapped is not None:
+                mapped.release()
+            self._mapped = mapped = memoryview(m)
+        return mapped
+
+    def spill(self, vcd):
+        """
+        Move the largest series (or the tails of already spilled series)
+        to the file until at most half of the limit is used
+        """
+        inMemory = []
+        for vcdId, s in vcd.idcode2series.items():
+            if isinstance(s, list):
+                inMemory.append((len(s), vcdId))
+            elif isinstance(s, SpilledSeries):
+                inMemory.append((len(s._tail), vcdId))
+        inMemory.sort(reverse=True)
+        total = sum(cnt for cnt, _ in inMemory)
+        limit = self.maxInMemory // 2
+        for cnt, vcdId in inMemory:
+            if total <= limit or not cnt:
+                break
+            s = vcd.idcode2series[vcdId]
+            if isinstance(s, list):
+                data = s
+                s = SpilledSeries(self)
+                s.extend(data)
+                vcd.idcode2series[vcdId] = s
+                vcd.idcode2var[vcdId].data = s
+                self.spilled[vcdId] = s
+            s.flush()
+            total -= cnt
+        self.inMemory = total
+
+    def close(self):
+        """
+        Delete the temporary file, the spilled series can not be accessed after this
+        """
+        for s in self._series:
+            s._release()
+        if self._mapped is not None:
+            self._mapped.release()
+            self._mapped = None
+        for m in self._maps:
+            m.close()
+        self._maps.clear()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
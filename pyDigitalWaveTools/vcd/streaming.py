@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Utilities for processing of VCD files without building of the data model for the value changes
+"""
+
+from typing import Iterable, Iterator, Tuple
+
+from pyDigitalWaveTools.vcd.common import VcdVarScope, VcdVarInfo
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+
+# kinds of items generated by iterVcdBody()
+VCD_BODY_TIME = 0
+VCD_BODY_CHANGE = 1
+VCD_BODY_KEYWORD = 2
+
+VECTOR_VALUE_PREFIX = frozenset(("b", "B", "r", "R", "s", "S"))
+
+
+def readVcdHeader(lines: Iterator[str]) -> Tuple[str, VcdParser]:
+    """
+    Read the lines until the end of $enddefinitions and parse them
+
+    :param lines: iterator of lines (e.g. opened file), only the lines of the header
+        are consumed from it
+    :return: tuple (header text, VcdParser with parsed header)
+    """
+    buff = []
+    endOfDefinitions = False
+    for line in lines:
+        buff.append(line)
+        if not endOfDefinitions:
+            i = line.find("$enddefinitions")
+            if i < 0:
+                continue
+            endOfDefinitions = True
+            line = line[i + len("$enddefinitions"):]
+        if "$end" in line.split():
+            break
+    else:
+        raise ValueError("Missing $enddefinitions")
+
+    header = "".join(buff)
+    vcd = VcdParser()
+    vcd.parse_str(header)
+    return header, vcd
+
+
+def iterVcdBody(lines: Iterable[str]):
+    """
+    Tokenize the value change section of VCD file ($comment blocks are skipped)
+
+    :return: generator of tuples (VCD_BODY_TIME, time: int, None)
+        or (VCD_BODY_CHANGE, vcdId, value) where value is in the format of VCD file (e.g. "1", "b0101", "r1.5", "sabc")
+        or (VCD_BODY_KEYWORD, keyword, None) e.g. "$dumpvars", "$end"
+    """
+    tokens = (w for line in lines for w in line.split())
+    for tok in tokens:
+        c = tok[0]
+        if c == "#":
+            yield (VCD_BODY_TIME, int(tok[1:]), None)
+        elif c == "$":
+            if tok == "$comment":
+                for tok in tokens:
+                    if tok == "$end":
+                        break
+            else:
+                yield (VCD_BODY_KEYWORD, tok, None)
+        elif c in VECTOR_VALUE_PREFIX:
+            yield (VCD_BODY_CHANGE, next(tokens), tok)
+        else:
+            yield (VCD_BODY_CHANGE, tok[1:], c)
+
+
+def formatValueChange(vcdId: str, value: str) -> str:
+    """
+    Format value change line, the value is in the format of VCD file (e.g. "1", "b0101", "r1.5", "sabc")
+    """
+    if value[0] in VECTOR_VALUE_PREFIX:
+        return f"{value:s} {vcdId:s}\n"
+    else:
+        return f"{value:s}{vcdId:s}\n"
+
+
+def getVarVcdId(var: VcdVarInfo) -> str:
+    """
+    Resolve vcdId of the variable which may be alias of other variable
+    """
+    vcdId = var.vcdId
+    while not isinstance(vcdId, str):
+        vcdId = vcdId.vcdId
+    return vcdId
+
+
+def iterScopeVars(scope: VcdVarScope, path: Tuple[str, ...]=()):
+    """
+    :return: generator of tuples (path, variable) for all variables in scope (recursively)
+    """
+    for name, ch in scope.children.items():
+        p = (*path, name)
+        if isinstance(ch, VcdVarScope):
+            yield from iterScopeVars(ch, p)
+        else:
+            yield p, ch
+
+
+def writeVcdHeaderDeclarations(vcd: VcdParser, oFile):
+    """
+    Write $date, $version, $timescale declarations from parsed header
+    """
+    date = getattr(vcd, "date", None)
+    if date is not None:
+        oFile.write(f"$date\n   {date:s}\n$end\n")
+    version = getattr(vcd, "version", None)
+    if version is not None:
+        oFile.write(f"$version\n   {version:s}\n$end\n")
+    timescale = getattr(vcd, "timescale", None)
+    if timescale is not None:
+        oFile.write(f"$timescale {timescale:s} $end\n")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Conversion of VCD files to json
+
+.. code-block:: text
+
+    python3 -m pyDigitalWaveTools.vcd.to_json -j 8 -o out/ a.vcd b.vcd.gz ...
+
+The default columnar format is streamed with bounded memory
+(:class:`~.VcdToJsonColumnarParser`), the tree format requires the whole file to be loaded in memory.
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import sys
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+from pyDigitalWaveTools.json.columnar_writer import JsonColumnarOutput, \
+    scopeToColumnarJson
+from pyDigitalWaveTools.vcd.compression import openVcdFile, \
+    compressionFromFileName
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+
+class VcdToJsonColumnarParser(VcdParser):
+    """
+    VcdParser which streams the data to columnar json format
+    (:mod:`pyDigitalWaveTools.json.columnar_writer`),
+    at most chunkSize changes per variable are kept in memory.
+    """
+
+    def __init__(self, oFile, chunkSize: int=4096):
+        super(VcdToJsonColumnarParser, self).__init__()
+        self._out = JsonColumnarOutput(oFile)
+        self.chunkSize = chunkSize
+        self._varIds = {}
+
+    def vcd_enddefinitions(self, tokeniser, keyword):
+        super(VcdToJsonColumnarParser, self).vcd_enddefinitions(tokeniser, keyword)
+        varIds = self._varIds
+        for vcdId in self.idcode2var.keys():
+            varIds[vcdId] = len(varIds)
+
+        def getVarId(v):
+            while not isinstance(v.vcdId, str):
+                v = v.vcdId
+            return varIds[v.vcdId]
+
+        self._out.writeHeader(scopeToColumnarJson(self.scope, getVarId))
+
+    def value_change(self, vcdId, value, lineNo):
+        try:
+            series = self.idcode2series[vcdId]
+        except KeyError:
+            self.on_error(lineNo, vcdId)
+            return
+        series.append((self.now, value))
+        if len(series) >= self.chunkSize:
+            self._out.writeChunk(self._varIds[vcdId], series)
+
+    def parse(self, file_handle):
+        super(VcdToJsonColumnarParser, self).parse(file_handle)
+        out = self._out
+        varIds = self._varIds
+        for vcdId, series in self.idcode2series.items():
+            if series:
+                out.writeChunk(varIds[vcdId], series)
+        out.close()
+
+
+def convertVcdToJson(fIn: str, fOut: str, columnar: bool=True, chunkSize: int=4096) -> Tuple[str, float]:
+    """
+    Convert VCD file (optionally compressed) to json file
+
+    :return: tuple (output file name, time of conversion in seconds)
+    """
+    t0 = perf_counter()
+    with openVcdFile(fIn) as vcdFile, open(fOut, "w") as jsonFile:
+        if columnar:
+            VcdToJsonColumnarParser(jsonFile, chunkSize).parse(vcdFile)
+        else:
+            vcd = VcdParser()
+            vcd.parse(vcdFile)
+            json.dump(vcd.scope.toJson(), jsonFile)
+    return fOut, perf_counter() - t0
+
+
+def _jsonFileName(fIn: str, outputDir: Optional[str]):
+    if compressionFromFileName(fIn) is not None:
+        fIn = os.path.splitext(fIn)[0]
+    fOut = os.path.splitext(fIn)[0] + ".json"
+    if outputDir is not None:
+        fOut = os.path.join(outputDir, os.path.basename(fOut))
+    return fOut
+
+
+def _jsonFileNames(inputs: List[str], outputDir: Optional[str]) -> List[str]:
+    """
+    :raise ValueError: if multiple inputs would be converted to the same output file
+        (e.g. inputs with the same basename and outputDir specified)
+    """
+    fOuts = [_jsonFileName(fIn, outputDir) for fIn in inputs]
+    seen = {}
+    for fIn, fOut in zip(inputs, fOuts):
+        k = os.path.normcase(os.path.abspath(fOut))
+        other = seen.get(k, None)
+        if other is not None:
+            raise ValueError(f"{other:s} and {fIn:s} would be both converted to {fOut:s}")
+        seen[k] = fIn
+    return fOuts
+
+
+def main(argv: Optional[List[str]]=None):
+    parser = ArgumentParser(description="Convert VCD files to json")
+    parser.add_argument("inputs", nargs="+", help="VCD files (.gz, .bz2, .xz, .zst compressed files are supported)")
+    parser.add_argument("-o", "--output-dir", default=None,
+                        help="directory for output files (default is the directory of the input file),"
+                        " the inputs must have distinct basenames")
+    parser.add_argument("-f", "--format", choices=("columnar", "tree"), default="columnar",
+                        help="output json format, only the columnar format has bounded memory consumption")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of parallel processes (default is the number of CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=4096,
+                        help="max number of changes per variable kept in memory (columnar format)")
+    args = parser.parse_args(argv)
+    try:
+        outputs = _jsonFileNames(args.inputs, args.output_dir)
+    except ValueError as e:
+        parser.error(str(e))
+
+    columnar = args.format == "columnar"
+    jobs = args.jobs
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(args.inputs)))
+
+    t0 = perf_counter()
+    results = []
+    if jobs == 1:
+        for fIn, fOut in zip(args.inputs, outputs):
+            try:
+                _, t = convertVcdToJson(fIn, fOut, columnar, args.chunk_size)
+                results.append((fIn, t, None))
+            except Exception as e:
+                results.append((fIn, None, e))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [(fIn, executor.submit(convertVcdToJson, fIn, fOut, columnar, args.chunk_size))
+                       for fIn, fOut in zip(args.inputs, outputs)]
+            for fIn, f in futures:
+                try:
+                    _, t = f.result()
+                    results.append((fIn, t, None))
+                except Exception as e:
+                    results.append((fIn, None, e))
+
+    failed = 0
+    for fIn, t, e in results:
+        if e is None:
+            print(f"{fIn:s}: {t:.3f}s")
+        else:
+            failed += 1
+            print(f"{fIn:s}: FAILED {e!r}")
+    print(f"{len(results) - failed:d}/{len(results):d} files converted in {perf_counter() - t0:.3f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -90,3 +90,18 @@ class VcdFloatFormatter(LogValueFormatter):
     def format(self, newVal: float, updater, t: int, out: StringIO):
         out.write(f"r{newVal:.16g} {self.vcdId:s}\n")
 
+
+class VcdRawFormatter(LogValueFormatter):
+    """
+    Formatter for values which are already in the format of VCD file
+    (e.g. "1", "b0101", "r1.5", "sabc"), used to copy values between VCD files
+    """
+
+    def bind_var_info(self, varInfo: "VcdVarWritingInfo"):
+        self.vcdId = varInfo.vcdId
+
+    def format(self, newVal: str, updater, t: int, out: StringIO):
+        if newVal[0] in "bBrRsS":
+            out.write(f"{newVal:s} {self.vcdId:s}\n")
+        else:
+            out.write(f"{newVal:s}{self.vcdId:s}\n")
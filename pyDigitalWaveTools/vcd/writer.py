@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import gc
+import json
+from math import inf
 import sys
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from pyDigitalWaveTools.vcd.common import VcdVarScope, VCD_SIG_TYPE, VcdVarInfo
 from pyDigitalWaveTools.vcd.value_format import LogValueFormatter
@@ -11,6 +15,13 @@ class VarAlreadyRegistered(Exception):
     pass
 
 
+class NameAlreadyRegistered(Exception):
+    """
+    The name of scope or variable is already used in the same parent scope
+    """
+    pass
+
+
 class VcdVarWritingInfo(VcdVarInfo):
     """
     Container of informations about variable in VCD for VCD file generating
@@ -53,6 +64,25 @@ class VcdVarIdScope(dict):
 
         return ''.join(digits)
 
+    def allocateIds(self, count: int) -> List[str]:
+        """
+        Allocate ids for count variables at once (same ids as :meth:`~._idToStr` for next ids),
+        the last character is iterated directly and the prefix is converted only once per ~94 ids
+        """
+        res = []
+        x = self._nextId
+        end = x + count
+        chars = self._idChars
+        n = self._idCharsCnt
+        while x < end:
+            hi, lo = divmod(x, n)
+            prefix = self._idToStr(hi) if hi else ""
+            m = min(n - lo, end - x)
+            res.extend([prefix + c for c in chars[lo:lo + m]])
+            x += m
+        self._nextId = end
+        return res
+
     def registerVariable(self, sig: object, name: str, parent: VcdVarScope,
                          width: int, sigType: VCD_SIG_TYPE,
                          valueFormatter: LogValueFormatter):
@@ -66,6 +96,12 @@ class VcdVarIdScope(dict):
         return vInf
 
 
+# (sig, sigType, width, formatter factory) e.g. ("clk", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter)
+VcdVarSpec = Tuple[object, str, int, Callable[[], LogValueFormatter]]
+# {name: VcdVarSpec or nested hierarchy}
+VcdHierarchySpec = Dict[str, Union[VcdVarSpec, "VcdHierarchySpec"]]
+
+
 class VcdVarWritingScope(VcdVarScope):
     """
     Vcd module - container for variables
@@ -75,30 +111,53 @@ class VcdVarWritingScope(VcdVarScope):
     :ivar ~.vars: subscopes or signals
     """
 
-    def __init__(self, name, writer, parent=None):
-        super(VcdVarWritingScope, self).__init__(name, parent=parent)
+    def __init__(self, name, writer, parent=None, scopeType: str="module"):
+        super(VcdVarWritingScope, self).__init__(name, parent=parent, scopeType=scopeType)
         self._writer = writer
 
+    def _writeVarLine(self, sigType: str, width: int, vcdId: str, name: str, bitRange: Optional[str]):
+        if bitRange is None:
+            self._writer._oFile.write(f"$var {sigType:s} {width:d} {vcdId:s} {name:s} $end\n")
+        else:
+            self._writer._oFile.write(f"$var {sigType:s} {width:d} {vcdId:s} {name:s} {bitRange:s} $end\n")
+
     def addVar(self, sig: object, name: str, sigType: VCD_SIG_TYPE, width: int,
-               valueFormatter: LogValueFormatter):
+               valueFormatter: LogValueFormatter, bitRange: Optional[str]=None) -> VcdVarWritingInfo:
         """
         Add variable to scope
 
         :ivar ~.sig: user specified object to keep track of VcdVarInfo in change()
         :ivar ~.sigType: vcd type name
         :ivar ~.valueFormatter: value which converts new value in change() to vcd string
+        :ivar ~.bitRange: optional bit range written after the name (e.g. "[7:0]")
         """
         assert name, sig
         vInf = self._writer._idScope.registerVariable(sig, name, self, width,
                                                       sigType, valueFormatter)
         self.children[vInf.name] = vInf
-        self._writer._oFile.write(f"$var {sigType:s} {vInf.width:d} {vInf.vcdId:s} {vInf.name:s} $end\n")
+        self._writeVarLine(sigType, vInf.width, vInf.vcdId, vInf.name, bitRange)
+        return vInf
+
+    def addVarAlias(self, name: str, var: VcdVarWritingInfo, bitRange: Optional[str]=None) -> VcdVarInfo:
+        """
+        Add variable which shares the vcdId (and the value changes) with already registered variable
 
-    def varScope(self, name):
+        :ivar ~.var: the variable returned from :meth:`~.addVar`
+        """
+        assert name, var
+        assert name not in self.children, (name, "Names of scopes and variables must be unique")
+        vInf = VcdVarInfo(var, name, var.width, var.sigType, self)
+        self.children[name] = vInf
+        self._writeVarLine(var.sigType, var.width, var.vcdId, name, bitRange)
+        return vInf
+
+    def varScope(self, name, scopeType: str="module"):
         """
         Create sub variable scope with defined name
+
+        :param scopeType: VCD scope type (module, task, function, begin, fork)
         """
-        ch = self.__class__(name, self._writer, parent=self)
+        ch = self.__class__(name, self._writer, parent=self, scopeType=scopeType)
         assert name not in self.children, (name, "Names of scopes and variables must be unique")
         self.children[name] = ch
         return ch
@@ -112,19 +171,89 @@ class VcdVarWritingScope(VcdVarScope):
             self._writeFooter()
 
     def _writeHeader(self):
-        self._writer._oFile.write(f"$scope module {self.name:s} $end\n")
+        self._writer._oFile.write(f"$scope {self.scopeType:s} {self.name:s} $end\n")
 
     def _writeFooter(self):
         self._writer._oFile.write("$upscope $end\n")
 
 
+class VcdOutputCapture(list):
+    """
+    File like object which collects written strings (used to capture output of value formatters)
+    """
+    write = list.append
+
+
+class VcdDumpOffRecorder():
+    """
+    Value formatter of variable with disabled dumping, it only stores the last value.
+
+    :ivar ~.record: list [original formatter, value before dumpoff, (newVal, valueUpdater) or None]
+    """
+
+    def __init__(self, record: list):
+        self.record = record
+
+    def format(self, newVal, valueUpdater, t: int, out):
+        self.record[2] = (newVal, valueUpdater)
+
+
+class VcdCountingOutput():
+    """
+    Wrapper of output file which counts written characters
+    (VCD is ASCII so this is also a number of bytes)
+
+    :ivar ~.offset: current offset in output file
+    """
+
+    def __init__(self, oFile, offset: int=0):
+        self.oFile = oFile
+        self.offset = offset
+
+    def write(self, s: str):
+        self.offset += len(s)
+        return self.oFile.write(s)
+
+
+def readCheckpointIndex(indexFile) -> List[Tuple[int, ...]]:
+    """
+    Read index written by :meth:`VcdWriter.enableCheckpoints`
+
+    :return: list of tuples (time, offset of "#time" line before $dumpall)
+        or (time, offset in segment, index of segment in :attr:`VcdWriter.segments`)
+        if the output was segmented
+    """
+    res = []
+    for line in indexFile:
+        line = line.split()
+        if line:
+            res.append(tuple(int(v) for v in line))
+    return res
+
+
 class VcdWriter():
+    """
+    :ivar ~.lastTime: last time written to output
+    :ivar ~._currentValues: None or dictionary {vcdId: last formatted value change}
+        if values are tracked (required for e.g. checkpoints)
+    :ivar ~.segments: None or list of dictionaries {"file": file name, "start": first time, "end": last time}
+        for each output segment if segmentation is enabled
+    :ivar ~.dumping: False if dumping is globally disabled (by :meth:`~.dumpOff` or dump windows)
+    :ivar ~._profiles: None or list of VcdVarProfile if profiling is enabled
+    """
 
     def __init__(self, oFile=sys.stdout):
         self._oFile = oFile
         self._idScope = VcdVarIdScope()
         self.scopes = []
         self.lastTime = -1
+        self._currentValues = None
+        self._checkpoints = False
+        self.segments = None
+        self.dumping = True
+        self._dumpWindowBoundaries = []
+        self._nextDumpWindowBoundary = inf
+        self._profiles = None
 
     def date(self, text):
         d = str(text)
@@ -136,16 +265,123 @@ class VcdWriter():
     def timescale(self, picoSeconds):
         self._oFile.write(f"$timescale {picoSeconds:d}ps $end\n")
 
-    def varScope(self, name) -> VcdVarWritingScope:
+    def varScope(self, name, scopeType: str="module") -> VcdVarWritingScope:
         """
         Create sub variable scope with defined name
+
+        :param scopeType: VCD scope type (module, task, function, begin, fork)
         """
-        s = VcdVarWritingScope(name, self, parent=self)
+        s = VcdVarWritingScope(name, self, parent=self, scopeType=scopeType)
         self.scopes.append(s)
         return s
 
+    def addHierarchy(self, hierarchy: VcdHierarchySpec) -> List[VcdVarWritingScope]:
+        """
+        Register whole hierarchy of scopes and variables at once,
+        the ids are allocated in one pass and the header is written by a single write.
+
+        .. code-block:: python
+
+            vcd.addHierarchy({
+                "top": {
+                    "clk": ("clk", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter),
+                    "core0": {
+                        "data": (dataSig, VCD_SIG_TYPE.WIRE, 32, VcdBitsFormatter),
+                    },
+                },
+            })
+
+        :param hierarchy: dictionary {name: nested dictionary for scope or tuple for variable},
+            tuple for variable is (sig, sigType, width, formatter factory), the factory
+            (typically a class of formatter) is called for each variable as the formatter is bound
+            to variable
+        :return: list of created top scopes
+        :raise NameAlreadyRegistered: if a top scope with the same name was already added to this writer
+        :raise VarAlreadyRegistered: if some sig is already registered or used multiple times
+        """
+        for s in self.scopes:
+            if s.name in hierarchy:
+                raise NameAlreadyRegistered(f"Scope {s.name:s} is already registered")
+
+        # the cyclic GC would be triggered many times while creating the objects
+        # and it would repeatedly traverse all of them
+        gcEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            # collect scopes and vars in the order of definition
+            vars_: List[Tuple[VcdVarWritingScope, str, VcdVarSpec]] = []
+            lines = []
+            top = []
+
+            def collect(parent, name: str, spec: VcdHierarchySpec):
+                s = VcdVarWritingScope(name, self, parent=parent)
+                lines.append(f"$scope module {name:s} $end\n")
+                for chName, ch in spec.items():
+                    if isinstance(ch, dict):
+                        s.children[chName] = collect(s, chName, ch)
+                    else:
+                        assert chName, ch
+                        # placeholder to keep the order of children and the position of the $var line
+                        s.children[chName] = None
+                        vars_.append((s, chName, ch))
+                        lines.append(None)
+                lines.append("$upscope $end\n")
+                return s
+
+            for name, spec in hierarchy.items():
+                top.append(collect(self, name, spec))
+
+            idScope = self._idScope
+            sigs = set()
+            for _, _, (sig, _, _, _) in vars_:
+                if sig is not None and (sig in idScope or sig in sigs):
+                    raise VarAlreadyRegistered(f"{sig} is already registered")
+                sigs.add(sig)
+
+            ids = idScope.allocateIds(len(vars_))
+            varLines = []
+            for vcdId, (parent, name, (sig, sigType, width, formatterFactory)) in zip(ids, vars_):
+                vInf = VcdVarWritingInfo(vcdId, name, width, sigType, parent, formatterFactory())
+                parent.children[name] = vInf
+                idScope[sig] = vInf
+                varLines.append(f"$var {sigType:s} {width:d} {vcdId:s} {name:s} $end\n")
+
+            varLines = iter(varLines)
+            self._oFile.write("".join(next(varLines) if line is None else line for line in lines))
+            self.scopes.extend(top)
+        finally:
+            if gcEnabled:
+                gc.enable()
+        return top
+
+    def addVarsByPath(self, variables: Iterable[Tuple[str, object, str, int, Callable[[], LogValueFormatter]]],
+                      separator: str=".") -> List[VcdVarWritingScope]:
+        """
+        :meth:`~.addHierarchy` for flat list of variables
+
+        :param variables: iterable of tuples (path, sig, sigType, width, formatter factory)
+            where path is e.g. "top.core0.data"
+        :raise NameAlreadyRegistered: if some path is used multiple times or the name is used for variable and scope
+        """
+        hierarchy = {}
+        for path, *spec in variables:
+            *scopes, name = path.split(separator)
+            assert scopes, ("Variable has to be in some scope", path)
+            h = hierarchy
+            for sName in scopes:
+                h = h.setdefault(sName, {})
+                if not isinstance(h, dict):
+                    raise NameAlreadyRegistered(f"{sName:s} in {path:s} is already registered as variable")
+            if name in h:
+                raise NameAlreadyRegistered(f"{path:s} is already registered")
+            h[name] = tuple(spec)
+        return self.addHierarchy(hierarchy)
+
     def enddefinitions(self):
         self._oFile.write("$enddefinitions $end\n")
+        if self.segments is not None:
+            self._segmentHeader = "".join(self._oFile)
+            self._openSegment()
 
     def setTime(self, t: int):
         lt = self.lastTime
@@ -162,6 +398,420 @@ class VcdWriter():
         varInfo = self._idScope[sig]
         varInfo.valueFormatter(newVal, valueUpdater, time, self._oFile)
 
+    def _trackValues(self):
+        """
+        Start tracking of the last value of each variable,
+        :meth:`~.logChange` is replaced by a version which stores the formatted value
+        """
+        if self._currentValues is None:
+            self._currentValues = {}
+            self._valueCapture = VcdOutputCapture()
+            self.logChange = self._logChangeTracked
+
+    def _logChangeTracked(self, time, sig, newVal, valueUpdater):
+        self.setTime(time)
+        if not self.dumping:
+            # dumping was disabled by dump window in setTime()
+            self._pendingValues[sig] = (newVal, valueUpdater)
+            return
+        varInfo = self._idScope[sig]
+        cap = self._valueCapture
+        varInfo.valueFormatter(newVal, valueUpdater, time, cap)
+        s = "".join(cap)
+        if s:
+            cap.clear()
+            self._currentValues[varInfo.vcdId] = s
+            self._oFile.write(s)
+
+    def _logChangeDumpOff(self, time, sig, newVal, valueUpdater):
+        """
+        :meth:`~.logChange` used while dumping is disabled, the value is only stored
+        and formatted once the dumping is enabled again
+        """
+        if time >= self._nextDumpWindowBoundary and self._popDumpWindowBoundaries(time):
+            self.dumpOn(time)
+            return self.logChange(time, sig, newVal, valueUpdater)
+        self._pendingValues[sig] = (newVal, valueUpdater)
+
+    def enableDumpGating(self):
+        """
+        Enable tracking of values required for :meth:`~.dumpOff`, :meth:`~.dumpOn`,
+        :meth:`~.dumpOffScope`, :meth:`~.dumpOnScope`.
+        Has to be called before first :meth:`~.logChange`.
+        (:meth:`~.setDumpWindows` calls it automatically)
+
+        While the dumping is disabled the values are not formatted and :meth:`~.logChange`
+        only stores the value for the moment when dumping is enabled again.
+        """
+        if self._currentValues is None:
+            assert self.lastTime == -1, "Has to be enabled before first value change"
+            self._trackValues()
+            self._pendingValues = {}
+            self._scopeDumpOffVars = {}
+            self.setTime = self._setTimeExtended
+
+    def setDumpWindows(self, windows: List[Tuple[int, int]]):
+        """
+        Dump values only in specified time windows,
+        $dumpoff/$dumpon is generated on the first time update after window end/start
+
+        :param windows: list of tuples (start, end) time window is [start, end)
+        """
+        self.enableDumpGating()
+        boundaries = []
+        for start, end in sorted(windows):
+            if start >= end:
+                raise ValueError("Invalid dump window", (start, end))
+            if boundaries and boundaries[-1][0] >= start:
+                raise ValueError("Dump windows must not overlap", windows)
+            boundaries.append((start, True))
+            boundaries.append((end, False))
+        boundaries.reverse()
+        self._dumpWindowBoundaries = boundaries
+        if boundaries:
+            self._nextDumpWindowBoundary = boundaries[-1][0]
+            if boundaries[-1][0] > max(self.lastTime, 0):
+                # outside of window at the beginning
+                self._nextDumpWindowBoundary = -1
+                boundaries.append((-1, False))
+        else:
+            self._nextDumpWindowBoundary = inf
+
+    def _popDumpWindowBoundaries(self, t: int) -> bool:
+        """
+        Remove all dump window boundaries before time t
+
+        :return: True if the dumping should be enabled
+        """
+        boundaries = self._dumpWindowBoundaries
+        dumping = self.dumping
+        while boundaries and boundaries[-1][0] <= t:
+            _, dumping = boundaries.pop()
+        self._nextDumpWindowBoundary = boundaries[-1][0] if boundaries else inf
+        return dumping
+
+    @staticmethod
+    def _formatUnknown(varInfo: VcdVarWritingInfo) -> str:
+        """
+        Format X value for variable for $dumpoff
+        """
+        if varInfo.sigType in (VCD_SIG_TYPE.REAL, VCD_SIG_TYPE.ENUM):
+            # there is no X for this types
+            return ""
+        elif varInfo.width == 1:
+            return f"x{varInfo.vcdId:s}\n"
+        else:
+            return f"bx {varInfo.vcdId:s}\n"
+
+    def dumpOff(self, time: int):
+        """
+        Globally disable dumping, all variables are dumped with X values in $dumpoff block
+        """
+        if self._currentValues is None:
+            raise AssertionError("enableDumpGating() has to be called first")
+        if not self.dumping:
+            return
+        self.setTime(time)
+        fu = self._formatUnknown
+        xVals = "".join(fu(v) for v in self._idScope.values())
+        self._oFile.write(f"$dumpoff\n{xVals:s}$end\n")
+        self.dumping = False
+        self.logChange = self._logChangeDumpOff
+
+    def _formatPendingValue(self, varInfo: VcdVarWritingInfo, valueFormatter, newVal, valueUpdater):
+        cap = self._valueCapture
+        valueFormatter(newVal, valueUpdater, self.lastTime, cap)
+        s = "".join(cap)
+        cap.clear()
+        self._currentValues[varInfo.vcdId] = s
+        return s
+
+    def dumpOn(self, time: int):
+        """
+        Globally enable dumping, current values of all variables are dumped in $dumpon block
+        """
+        if self.dumping:
+            return
+        idScope = self._idScope
+        scopeDumpOffVars = self._scopeDumpOffVars
+        for sig, (newVal, valueUpdater) in self._pendingValues.items():
+            varInfo = idScope[sig]
+            if varInfo not in scopeDumpOffVars:
+                self._formatPendingValue(varInfo, varInfo.valueFormatter, newVal, valueUpdater)
+            else:
+                scopeDumpOffVars[varInfo][2] = (newVal, valueUpdater)
+        self._pendingValues.clear()
+        self.dumping = True
+        self.logChange = self._logChangeTracked
+        self.setTime(time)
+        self._writeCurrentValues("$dumpon")
+
+    def _iterScopeVars(self, scope: VcdVarWritingScope):
+        for ch in scope.children.values():
+            if isinstance(ch, VcdVarWritingScope):
+                yield from self._iterScopeVars(ch)
+            else:
+                yield ch
+
+    def dumpOffScope(self, scope: VcdVarWritingScope, time: int):
+        """
+        Disable dumping of variables in scope (recursively), the X value is dumped for them.
+        (Unlike :meth:`~.dumpOff` there is no $dumpoff block as it would apply to all variables.)
+        """
+        if self._currentValues is None:
+            raise AssertionError("enableDumpGating() has to be called first")
+        self.setTime(time)
+        currentValues = self._currentValues
+        scopeDumpOffVars = self._scopeDumpOffVars
+        buff = []
+        for varInfo in self._iterScopeVars(scope):
+            if varInfo in scopeDumpOffVars:
+                continue
+            # [original formatter, value before dumpoff, (newVal, valueUpdater) or None]
+            record = [varInfo.valueFormatter, currentValues.get(varInfo.vcdId, None), None]
+            scopeDumpOffVars[varInfo] = record
+            varInfo.valueFormatter = VcdDumpOffRecorder(record).format
+            x = self._formatUnknown(varInfo)
+            currentValues[varInfo.vcdId] = x
+            buff.append(x)
+
+        if self.dumping:
+            self._oFile.write("".join(buff))
+
+    def dumpOnScope(self, scope: VcdVarWritingScope, time: int):
+        """
+        Enable dumping of variables in scope (recursively) disabled by :meth:`~.dumpOffScope`,
+        the current value is dumped for them.
+        """
+        self.setTime(time)
+        currentValues = self._currentValues
+        scopeDumpOffVars = self._scopeDumpOffVars
+        buff = []
+        for varInfo in self._iterScopeVars(scope):
+            record = scopeDumpOffVars.pop(varInfo, None)
+            if record is None:
+                continue
+            valueFormatter, prevVal, newVal = record
+            varInfo.valueFormatter = valueFormatter
+            if newVal is None:
+                if prevVal is None:
+                    currentValues.pop(varInfo.vcdId, None)
+                    continue
+                currentValues[varInfo.vcdId] = prevVal
+            else:
+                prevVal = self._formatPendingValue(varInfo, valueFormatter, *newVal)
+            buff.append(prevVal)
+
+        if self.dumping:
+            self._oFile.write("".join(buff))
+
+    def _writeCurrentValues(self, keyword: str):
+        """
+        Write block with current values of all variables (e.g. $dumpall ... $end)
+        """
+        self._oFile.write(f"{keyword:s}\n{''.join(self._currentValues.values()):s}$end\n")
+
+    def _countWrittenBytes(self):
+        """
+        Wrap the output file so we know the offset of each write
+        (the files of segments are always wrapped in :meth:`~._openSegment`)
+        """
+        if self.segments is None and not isinstance(self._oFile, VcdCountingOutput):
+            try:
+                offset = self._oFile.tell()
+            except (AttributeError, OSError):
+                offset = 0
+            self._oFile = VcdCountingOutput(self._oFile, offset)
+
+    def enableCheckpoints(self, timeInterval: Optional[int]=None,
+                          byteInterval: Optional[int]=None, indexFile=None):
+        """
+        Periodically emit $dumpall block with current values of all variables
+        so the reader can start reading from any checkpoint instead of the start of the file.
+        Checkpoint is written right after the time update "#time" line if the time or the size of data
+        since the last checkpoint exceeds the specified interval.
+
+        :param timeInterval: checkpoint is generated on first time update after each multiple of timeInterval
+        :param byteInterval: checkpoint is generated on first time update after byteInterval
+            of data was written since last checkpoint
+        :param indexFile: optional text file where the lines "<time> <offset of #time line>"
+            are written for each checkpoint (see :func:`~.readCheckpointIndex`)
+
+        :note: the values are tracked only from the moment this is enabled
+        :note: if segmentation is used the offsets are relative to the start of the segment
+            and the lines of index are "<time> <offset of #time line> <index of segment>"
+        """
+        if not timeInterval and not byteInterval:
+            raise ValueError("timeInterval or byteInterval has to be specified")
+        self._trackValues()
+        if byteInterval is not None or indexFile is not None:
+            self._countWrittenBytes()
+            # the header of segmented output is captured, the segments count their own bytes
+            self._lastCheckpointOffset = getattr(self._oFile, "offset", 0)
+        self._checkpoints = True
+        self._checkpointTimeInterval = timeInterval
+        self._checkpointByteInterval = byteInterval
+        self._checkpointIndexFile = indexFile
+        if timeInterval:
+            self._nextCheckpointTime = (max(self.lastTime, 0) // timeInterval + 1) * timeInterval
+        self.setTime = self._setTimeExtended
+
+    def enableSegmentation(self, fileNameTemplate: str, maxBytes: Optional[int]=None,
+                           maxTime: Optional[int]=None, manifestFileName: Optional[str]=None,
+                           openFile=None):
+        """
+        Split the output to multiple files. New file is started on time update
+        if the current file exceeds maxBytes or maxTime time units.
+        Each segment contains the whole header and starts with $dumpvars with current values
+        of all variables so it can be parsed on its own.
+        Has to be called before anything is written to the writer,
+        the oFile from constructor is not used.
+
+        :param fileNameTemplate: template for segment file names formatted with
+            the index of the segment, e.g. "dump.{:04d}.vcd"
+        :param manifestFileName: optional name of json file where :attr:`~.segments`
+            are written in :meth:`~.close`
+        :param openFile: function which opens segment file for writing by its name
+            (e.g. :class:`pyDigitalWaveTools.vcd.compression.CompressedTextOutput`),
+            default is text mode open()
+        """
+        if not maxBytes and not maxTime:
+            raise ValueError("maxBytes or maxTime has to be specified")
+        if openFile is None:
+            openFile = lambda fileName: open(fileName, "w")
+        self._trackValues()
+        self._segmentFileNameTemplate = fileNameTemplate
+        self._segmentMaxBytes = maxBytes
+        self._segmentMaxTime = maxTime
+        self._segmentManifestFileName = manifestFileName
+        self._segmentOpenFile = openFile
+        self.segments = []
+        # header is collected and written to each segment
+        self._oFile = VcdOutputCapture()
+        self.setTime = self._setTimeExtended
+
+    def _openSegment(self):
+        fileName = self._segmentFileNameTemplate.format(len(self.segments))
+        self._oFile = VcdCountingOutput(self._segmentOpenFile(fileName), 0)
+        self._oFile.write(self._segmentHeader)
+        self.segments.append({"file": fileName, "start": None, "end": None})
+        if self._checkpoints:
+            self._lastCheckpointOffset = 0
+
+    def _closeSegment(self):
+        seg = self.segments[-1]
+        if seg["start"] is not None:
+            seg["end"] = self.lastTime
+        self._oFile.oFile.close()
+
+    def _isSegmentFull(self, t: int):
+        start = self.segments[-1]["start"]
+        if start is None:
+            return False
+        maxBytes = self._segmentMaxBytes
+        maxTime = self._segmentMaxTime
+        return (maxBytes and self._oFile.offset >= maxBytes) or\
+               (maxTime and t - start >= maxTime)
+
+    def _setTimeExtended(self, t: int):
+        """
+        :meth:`~.setTime` with dump windows, segmentation and checkpoints
+        """
+        if self.lastTime == t:
+            return
+
+        if t >= self._nextDumpWindowBoundary:
+            dumping = self._popDumpWindowBoundaries(t)
+            if dumping and not self.dumping:
+                self.dumpOn(t)
+                return
+            self._writeTime(t)
+            if not dumping and self.dumping:
+                self.dumpOff(t)
+        else:
+            self._writeTime(t)
+
+    def _writeTime(self, t: int):
+        segments = self.segments
+        if segments is not None:
+            if self._isSegmentFull(t):
+                self._closeSegment()
+                self._openSegment()
+                VcdWriter.setTime(self, t)
+                self.segments[-1]["start"] = t
+                if self._currentValues:
+                    self._writeCurrentValues("$dumpvars")
+                # the segment starts with all values, checkpoint is not required
+                return
+            elif segments[-1]["start"] is None:
+                segments[-1]["start"] = t
+
+        timeLineOffset = getattr(self._oFile, "offset", None)
+        VcdWriter.setTime(self, t)
+        if not self._checkpoints or not self._currentValues:
+            return
+
+        ti = self._checkpointTimeInterval
+        bi = self._checkpointByteInterval
+        if (ti and t >= self._nextCheckpointTime) or\
+                (bi and timeLineOffset - self._lastCheckpointOffset >= bi):
+            if ti:
+                self._nextCheckpointTime = (t // ti + 1) * ti
+            if timeLineOffset is not None:
+                self._lastCheckpointOffset = timeLineOffset
+            self._writeCurrentValues("$dumpall")
+            indexFile = self._checkpointIndexFile
+            if indexFile is not None:
+                if self.segments is None:
+                    indexFile.write(f"{t:d} {timeLineOffset:d}\n")
+                else:
+                    indexFile.write(f"{t:d} {timeLineOffset:d} {len(self.segments) - 1:d}\n")
+
+    def enableProfiling(self, topN: int=20, reportFile=None):
+        """
+        Count changes, written bytes and formatting time for each variable,
+        must be called after all variables are registered.
+        The formatters of variables are wrapped, logChange is not affected if profiling is not enabled.
+
+        :param topN: number of variables in report written in :meth:`~.close`
+        :param reportFile: optional text file where report is written in :meth:`~.close`
+        """
+        from pyDigitalWaveTools.vcd.profiling import VcdVarProfile
+        self._enableProfiling(VcdVarProfile, topN, reportFile)
+
+    def _enableProfiling(self, profileCls, topN: int, reportFile):
+        profiles = self._profiles = []
+        for varInfo in self._idScope.values():
+            p = profileCls(varInfo)
+            varInfo.valueFormatter = p.format
+            profiles.append(p)
+        self._profilingTopN = topN
+        self._profilingReportFile = reportFile
+
+    def getProfilingReport(self, topN: Optional[int]=None) -> dict:
+        """
+        :return: report from :func:`pyDigitalWaveTools.vcd.profiling.profilingReport`
+        """
+        from pyDigitalWaveTools.vcd.profiling import profilingReport
+        return profilingReport(self._profiles, topN)
+
+    def _closeProfiling(self):
+        if self._profiles is not None and self._profilingReportFile is not None:
+            from pyDigitalWaveTools.vcd.profiling import formatProfilingReport
+            report = self.getProfilingReport(self._profilingTopN)
+            self._profilingReportFile.write(formatProfilingReport(report))
+
+    def close(self):
+        """
+        Finalize the output (the oFile passed in constructor is not closed)
+        """
+        self._closeProfiling()
+        if self.segments is not None and self.segments:
+            self._closeSegment()
+            if self._segmentManifestFileName is not None:
+                with open(self._segmentManifestFileName, "w") as f:
+                    json.dump({"segments": self.segments}, f, indent=2)
+
 
 if __name__ == "__main__":
     from datetime import datetime
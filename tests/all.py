@@ -3,9 +3,27 @@
 
 import sys
 from unittest import TestLoader, TextTestRunner, TestSuite
+from tests.jsonParser_test import JsonParserTC
 from tests.jsonWriter_test import JsonWriterTC
 from tests.vcdParser_test import VcdParserTC
 from tests.vcdWriter_test import VcdWriterTC
+from tests.vcdCompression_test import VcdCompressionTC
+from tests.reorderBuffer_test import LogChangeReorderBufferTC
+from tests.vcdToJson_test import VcdToJsonTC
+from tests.vcdRewriter_test import VcdRewriterTC
+from tests.vcdMerge_test import VcdMergeTC
+from tests.vcdBatch_test import VcdBatchTC
+from tests.vcdSharedMemory_test import VcdSharedMemoryTC
+from tests.vcdSpill_test import VcdSpillTC
+from tests.vcdQuery_test import VcdQueryTC
+from tests.vcdActivity_test import VcdActivityTC
+from tests.binaryWave_test import BinaryWaveTC
+from tests.fstReader_test import FstReaderTC
+from tests.vcdAsyncParser_test import VcdAsyncParserTC
+from tests.vcdClock_test import VcdClockTC
+from tests.vcdHeaderCache_test import VcdHeaderCacheTC
+from tests.vcdRecordBatch_test import VcdRecordBatchTC
+from tests.vcdDedup_test import VcdDedupTC
 
 
 
@@ -18,8 +36,26 @@ def testSuiteFromTCs(*tcs):
 
 suite = testSuiteFromTCs(
     JsonWriterTC,
+    JsonParserTC,
     VcdParserTC,
     VcdWriterTC,
+    VcdCompressionTC,
+    LogChangeReorderBufferTC,
+    VcdToJsonTC,
+    VcdRewriterTC,
+    VcdMergeTC,
+    VcdBatchTC,
+    VcdSharedMemoryTC,
+    VcdSpillTC,
+    VcdQueryTC,
+    VcdActivityTC,
+    BinaryWaveTC,
+    FstReaderTC,
+    VcdAsyncParserTC,
+    VcdClockTC,
+    VcdHeaderCacheTC,
+    VcdRecordBatchTC,
+    VcdDedupTC,
 )
 
 
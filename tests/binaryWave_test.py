@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from io import BytesIO
+import os
+import unittest
+
+from pyDigitalWaveTools.binary.block import encodeVarints, decodeVarints
+from pyDigitalWaveTools.binary.reader import BinaryWaveReader
+from pyDigitalWaveTools.binary.writer import BinaryWaveWriter
+from pyDigitalWaveTools.json.value_format import JsonBitsFormatter
+from pyDigitalWaveTools.json.writer import JsonWriter
+from pyDigitalWaveTools.vcd.common import VCD_SIG_TYPE
+from tests.vcdWriter_test import MaskedValue
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+
+
+def dump_example(w):
+    with w.varScope("top") as top:
+        top.addVar("clk", "clk", VCD_SIG_TYPE.WIRE, 1, JsonBitsFormatter())
+        top.addVar("cnt", "cnt", VCD_SIG_TYPE.WIRE, 16, JsonBitsFormatter())
+        with top.varScope("sub") as sub:
+            sub.addVar("x", "x", VCD_SIG_TYPE.WIRE, 4, JsonBitsFormatter())
+    w.enddefinitions()
+    w.logChange(0, "x", MaskedValue(0, 0), None)
+    for t in range(0, 1000, 5):
+        w.logChange(t, "clk", MaskedValue((t // 5) & 1, 1), None)
+        if t % 10 == 0:
+            w.logChange(t, "cnt", MaskedValue(t // 10, 0xffff), None)
+        if t == 500:
+            w.logChange(t, "x", MaskedValue(5, 0xf), None)
+
+
+class BinaryWaveTC(unittest.TestCase):
+
+    def test_varint(self):
+        vals = [0, 1, 127, 128, 300, 1 << 40]
+        buff = bytearray()
+        encodeVarints(vals, buff)
+        self.assertEqual(decodeVarints(bytes(buff), len(vals)), (vals, len(buff)))
+
+    def _ref(self):
+        ref = {}
+        w = JsonWriter(ref)
+        dump_example(w)
+        return ref
+
+    def test_write_read(self):
+        ref = self._ref()
+        for compression in ("zlib", "lzma", "none"):
+            f = BytesIO()
+            w = BinaryWaveWriter(f, blockSize=16, compression=compression)
+            dump_example(w)
+            w.close()
+
+            r = BinaryWaveReader(f)
+            r.load()
+            res = r.scope.children["top"].toJson()
+            # json values are lists
+            for ch in ref["children"]:
+                if "data" in ch:
+                    ch["data"] = [tuple(d) for d in ch["data"]]
+            self.assertEqual(res["children"][0]["data"], ref["children"][0]["data"])
+            self.assertEqual(res["children"][1]["data"], ref["children"][1]["data"])
+            self.assertEqual(res["children"][2]["children"][0]["data"],
+                             ref["children"][2]["children"][0]["data"])
+
+    def test_time_window(self):
+        f = BytesIO()
+        w = BinaryWaveWriter(f, blockSize=8)
+        dump_example(w)
+        w.close()
+        r = BinaryWaveReader(f)
+        cnt = r.loadSignal("top.cnt", 503, 530)
+        self.assertEqual([t for t, _ in cnt], [500, 510, 520, 530])
+        self.assertEqual(cnt[0][1], "b" + format(50, "016b"))
+        self.assertEqual(r.loadSignal("top.cnt", 500, 500), [(500, "b" + format(50, "016b"))])
+        self.assertEqual(r.loadSignal("top.sub.x", 100, 200), [(0, "bXXXX")])
+        self.assertEqual(r.loadSignal("top.sub.x", 600), [(500, "b0101")])
+        self.assertEqual(len(r.loadSignal("top.clk")), 200)
+        self.assertEqual(len(r.loadSignal("top.clk", t1=9)), 2)
+
+        # only blocks in the window are read
+        reads = []
+        readBlock = r._readBlock
+        r._readBlock = lambda b: reads.append(b) or readBlock(b)
+        r.loadSignal("top.clk", 800, 850)
+        self.assertLessEqual(len(reads), 3)
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(BinaryWaveTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
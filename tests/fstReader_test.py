@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import gzip
+import os
+import struct
+from tempfile import TemporaryDirectory
+import unittest
+import zlib
+
+from pyDigitalWaveTools.fst.decompress import lz4BlockDecompress, fastlzDecompress
+from pyDigitalWaveTools.fst.reader import FstReader, parseFstFile, \
+    fstTimescaleToStr, FST_BL_HDR, FST_BL_GEOM, FST_BL_HIER, FST_BL_VCDATA, \
+    FST_BL_VCDATA_DYN_ALIAS2, FST_BL_ZWRAPPER, FST_ST_VCD_SCOPE, FST_ST_VCD_UPSCOPE, \
+    FST_ST_GEN_ATTRBEGIN, FST_ST_GEN_ATTREND
+
+
+def varint(v):
+    buff = bytearray()
+    while v >= 0x80:
+        buff.append((v & 0x7f) | 0x80)
+        v >>= 7
+    buff.append(v)
+    return bytes(buff)
+
+
+def svarint(v):
+    buff = bytearray()
+    while True:
+        b = v & 0x7f
+        v >>= 7
+        if (v == 0 and not b & 0x40) or (v == -1 and b & 0x40):
+            buff.append(b)
+            return bytes(buff)
+        buff.append(b | 0x80)
+
+
+def u64(v):
+    return struct.pack(">Q", v)
+
+
+def block(blockType, payload):
+    return bytes([blockType]) + u64(len(payload) + 8) + payload
+
+
+def lz4Literals(data):
+    """
+    LZ4 block with literals only (valid LZ4 without compression)
+    """
+    n = len(data)
+    if n < 15:
+        return bytes([n << 4]) + data
+    ext = bytearray()
+    rest = n - 15
+    while rest >= 255:
+        ext.append(255)
+        rest -= 255
+    ext.append(rest)
+    return bytes([0xf0]) + bytes(ext) + data
+
+
+def fastlzLiterals(data):
+    """
+    FastLZ level 1 with literals only
+    """
+    buff = bytearray()
+    for i in range(0, len(data), 32):
+        chunk = data[i:i + 32]
+        buff.append(len(chunk) - 1)
+        buff += chunk
+    return bytes(buff)
+
+
+def header():
+    return block(FST_BL_HDR, struct.pack(
+        ">QQ8sQQQQQb128s119sBq", 0, 60, struct.pack("<d", 2.7182818284590452354),
+        0, 2, 5, 4, 3, -9, b"test writer", b"Mon Jan  1 00:00:00 2024", 0, 0))
+
+
+def hierarchy():
+    h = bytearray()
+    h += bytes([FST_ST_VCD_SCOPE, 0]) + b"top\0\0"
+    h += bytes([FST_ST_GEN_ATTRBEGIN, 0, 0]) + b"attr\0" + varint(0)
+    h += bytes([FST_ST_GEN_ATTREND])
+    h += bytes([16, 0]) + b"clk\0" + varint(1) + varint(0)
+    h += bytes([5, 0]) + b"data\0" + varint(8) + varint(0)
+    h += bytes([3, 0]) + b"r\0" + varint(8) + varint(0)
+    h += bytes([16, 0]) + b"clk_alias\0" + varint(1) + varint(1)
+    h += bytes([FST_ST_VCD_SCOPE, 0]) + b"sub\0\0"
+    h += bytes([16, 0]) + b"x\0" + varint(4) + varint(0)
+    h += bytes([FST_ST_VCD_UPSCOPE, FST_ST_VCD_UPSCOPE])
+    h = bytes(h)
+    return block(FST_BL_HIER, u64(len(h)) + gzip.compress(h))
+
+
+def geometry():
+    g = varint(1) + varint(8) + varint(0) + varint(4)
+    c = zlib.compress(g)
+    return block(FST_BL_GEOM, u64(len(g)) + u64(4) + c)
+
+
+def bit(tdelta, v):
+    if v in "01":
+        return varint((tdelta << 2) | (int(v) << 1))
+    return varint((tdelta << 4) | ("xzhuwl-?".index(v) << 1) | 1)
+
+
+def vcBlock(blockType, packType, times, frame, chains, compressFrame=False):
+    """
+    :param chains: list of chain data (None for signal without changes) for each handle
+    """
+    frameC = zlib.compress(frame) if compressFrame else frame
+    head = u64(times[0]) + u64(times[-1]) + u64(0) + varint(len(frame)) + varint(len(frameC)) + varint(len(chains))
+    head += frameC + varint(len(chains))
+
+    waves = bytearray(packType.encode())
+    offsets = []
+    for c in chains:
+        if c is None:
+            offsets.append(None)
+            continue
+        offsets.append(len(waves))
+        if packType == "Z":
+            waves += varint(0) + c
+        elif packType == "4":
+            waves += varint(len(c)) + lz4Literals(c)
+        else:
+            waves += varint(len(c)) + fastlzLiterals(c)
+
+    table = bytearray()
+    prev = 0
+    zeros = 0
+    for o in offsets + [0]:
+        if o is None:
+            zeros += 1
+            continue
+        if zeros:
+            table += varint(zeros << 1)
+            zeros = 0
+        if o:
+            if blockType == FST_BL_VCDATA_DYN_ALIAS2:
+                table += svarint(((o - prev) << 1) | 1)
+            else:
+                table += varint(((o - prev) << 1) | 1)
+            prev = o
+
+    t = b"".join(varint(b - a) for a, b in zip([0] + times, times))
+    tc = zlib.compress(t)
+    payload = head + bytes(waves) + bytes(table) + u64(len(table)) + tc + u64(len(t)) + u64(len(tc)) + u64(len(times))
+    return block(blockType, payload)
+
+
+def exampleFst():
+    b1 = vcBlock(FST_BL_VCDATA_DYN_ALIAS2, "Z", [0, 10, 20, 30],
+                 b"x" + b"xxxxxxxx" + struct.pack("<d", 0.0) + b"0000", [
+                     bit(0, "0") + bit(1, "1") + bit(1, "0") + bit(1, "x"),
+                     varint(1 << 1) + bytes([0xa5]) + varint((2 << 1) | 1) + b"01xz0101",
+                     varint(2 << 1) + struct.pack("<d", 1.5),
+                     None,
+                 ], compressFrame=True)
+    b2 = vcBlock(FST_BL_VCDATA, "4", [40, 50],
+                 b"x" + b"01xz0101" + struct.pack("<d", 1.5) + b"0000", [
+                     bit(0, "1"),
+                     None,
+                     None,
+                     varint((1 << 1) | 1) + b"1010",
+                 ])
+    b3 = vcBlock(FST_BL_VCDATA_DYN_ALIAS2, "F", [60],
+                 b"1" + b"01xz0101" + struct.pack("<d", 1.5) + b"1010", [
+                     None,
+                     varint(0 << 1) + bytes([0xf0]),
+                     None,
+                     None,
+                 ])
+    return header() + geometry() + b1 + b2 + b3 + hierarchy()
+
+
+class FstReaderTC(unittest.TestCase):
+
+    def test_decompress(self):
+        # "abc" + match(distance 3, length 9) + empty last sequence
+        self.assertEqual(lz4BlockDecompress(bytes([0x35]) + b"abc" + bytes([3, 0, 0])), b"abc" * 4)
+        data = bytes(range(100))
+        self.assertEqual(lz4BlockDecompress(lz4Literals(data)), data)
+        # "a" + match(distance 1, length 9)
+        self.assertEqual(fastlzDecompress(bytes([0x00]) + b"a" + bytes([0xe0, 0x00, 0x00])), b"a" * 10)
+        self.assertEqual(fastlzDecompress(fastlzLiterals(data)), data)
+
+    def test_timescale(self):
+        self.assertEqual(fstTimescaleToStr(-9), "1ns")
+        self.assertEqual(fstTimescaleToStr(-10), "100ps")
+        self.assertEqual(fstTimescaleToStr(0), "1s")
+
+    def test_read(self):
+        fst = FstReader()
+        fst.parse_bytes(exampleFst())
+        self.assertEqual(fst.timescale, "1ns")
+        self.assertEqual(fst.version, "test writer")
+        top = fst.scope.children["top"]
+        self.assertEqual(list(top.children.keys()), ["clk", "data", "r", "clk_alias", "sub"])
+        clk = top.children["clk"]
+        self.assertEqual((clk.width, clk.sigType), (1, "wire"))
+        self.assertIs(top.children["clk_alias"].vcdId, clk)
+        self.assertEqual(clk.data, [(0, "x"), (0, "0"), (10, "1"), (20, "0"), (30, "x"), (40, "1")])
+        self.assertEqual(top.children["data"].data, [
+            (0, "bxxxxxxxx"), (10, "b10100101"), (30, "b01xz0101"), (60, "b11110000")])
+        self.assertEqual(top.children["r"].data, [(0, "r0.0"), (20, "r1.5")])
+        self.assertEqual(top.children["r"].sigType, "real")
+        self.assertEqual(top.children["sub"].children["x"].data, [(0, "b0000"), (50, "b1010")])
+
+    def test_selected_signals(self):
+        fst = FstReader(signals={"top.sub", "top.data"})
+        fst.parse_bytes(exampleFst())
+        top = fst.scope.children["top"]
+        self.assertEqual(top.children["clk"].data, [])
+        self.assertEqual(top.children["r"].data, [])
+        self.assertEqual(len(top.children["data"].data), 4)
+        self.assertEqual(len(top.children["sub"].children["x"].data), 2)
+
+    def test_file_and_zwrapper(self):
+        data = exampleFst()
+        ref = FstReader()
+        ref.parse_bytes(data)
+        with TemporaryDirectory() as d:
+            fName = os.path.join(d, "a.fst")
+            with open(fName, "wb") as f:
+                f.write(data)
+            self.assertDictEqual(parseFstFile(fName).scope.toJson(), ref.scope.toJson())
+
+            with open(fName, "wb") as f:
+                gz = gzip.compress(data)
+                f.write(bytes([FST_BL_ZWRAPPER]) + u64(len(gz) + 16) + u64(len(data)) + gz)
+            self.assertDictEqual(parseFstFile(fName).scope.toJson(), ref.scope.toJson())
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(FstReaderTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
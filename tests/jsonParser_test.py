@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from io import StringIO
+import json
+import os
+import unittest
+
+from pyDigitalWaveTools.json.columnar_writer import JsonColumnarWriter
+from pyDigitalWaveTools.json.parser import JsonParser
+from pyDigitalWaveTools.json.value_format import JsonBitsFormatter
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from tests.vcdWriter_test import example_dump_values0
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+
+
+class JsonParserTC(unittest.TestCase):
+
+    def _test_tree(self, rel_name, useFastJson):
+        with open(os.path.join(BASE, rel_name)) as f:
+            vcd = VcdParser()
+            vcd.parse(f)
+        ref = vcd.scope.toJson()
+
+        p = JsonParser(useFastJson=useFastJson)
+        p.parse_str(json.dumps(ref))
+        self.assertDictEqual(p.scope.toJson(), ref)
+
+    def test_tree_example0(self):
+        self._test_tree("example0.vcd", False)
+
+    def test_tree_AxiRegTC_test_write(self):
+        self._test_tree("AxiRegTC_test_write.vcd", False)
+        self._test_tree("AxiRegTC_test_write.vcd", True)
+
+    def test_tree_example0_json(self):
+        with open(os.path.join(BASE, "example0.json")) as f:
+            p = JsonParser()
+            p.parse(f)
+        unit0 = p.scope
+        self.assertEqual(unit0.name, "unit0")
+        self.assertEqual(unit0.children["vect0"].data,
+                         [(0, "bXXXXXXXXXXXXXXXX"), (3, "b0000000000001010"), (4, "b0000000000010100")])
+        self.assertIs(p.idcode2series[2], unit0.children["vect0"].data)
+
+    def test_columnar(self):
+        out = StringIO()
+        w = JsonColumnarWriter(out, chunkSize=1)
+        example_dump_values0(w, JsonBitsFormatter)
+        w.close()
+
+        for useFastJson in (False, True):
+            p = JsonParser(useFastJson=useFastJson)
+            p.parse_str(out.getvalue())
+            unit0 = p.scope.children["unit0"]
+            self.assertEqual(unit0.children["sig1"].data, [(0, "X"), (2, "1")])
+            self.assertEqual(unit0.children["vect0"].data,
+                             [(0, "bXXXXXXXXXXXXXXXX"), (3, "b0000000000001010"), (4, "b0000000000010100")])
+
+        p = JsonParser()
+        chunks = [(v.name, times, values) for v, times, values in p.iter_chunks(StringIO(out.getvalue()))]
+        self.assertEqual(len(chunks), 7)
+        self.assertEqual(chunks[-1], ("vect0", [4], ["b0000000000010100"]))
+        self.assertEqual(p.scope.children["unit0"].children["vect0"].data, [])
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(JsonParserTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
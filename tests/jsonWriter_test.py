@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from io import StringIO
 import json
 import os
 import unittest
 
-from pyDigitalWaveTools.json.value_format import JsonBitsFormatter
+from pyDigitalWaveTools.json.columnar_writer import JsonColumnarWriter
+from pyDigitalWaveTools.json.value_format import JsonBitsFormatter, \
+    JsonArrayFormatter
 from pyDigitalWaveTools.json.writer import JsonWriter
-from tests.vcdWriter_test import example_dump_values0
+from pyDigitalWaveTools.vcd.common import VCD_SIG_TYPE
+from tests.vcdWriter_test import example_dump_values0, MaskedValue
 
 
 BASE = os.path.dirname(os.path.realpath(__file__))
@@ -30,6 +34,12 @@ def value_tuples_to_lists(scope: dict):
     return scope
 
 
+class ArrayItemUpdater():
+
+    def __init__(self, indexes):
+        self.indexes = indexes
+
+
 class JsonWriterTC(unittest.TestCase):
 
     def test_example0(self):
@@ -46,6 +56,93 @@ class JsonWriterTC(unittest.TestCase):
             ref = json.load(f)
             self.assertDictEqual(ref, res)
 
+    def test_columnar(self):
+        out = StringIO()
+        w = JsonColumnarWriter(out, chunkSize=2)
+        with w.varScope("unit0") as m:
+            m.addVar("sig0", "sig0", VCD_SIG_TYPE.WIRE, 1, JsonBitsFormatter())
+        with w.varScope("unit1") as m:
+            m.addVar("vect0", "vect0", VCD_SIG_TYPE.WIRE, 16, JsonBitsFormatter())
+        w.enddefinitions()
+        for t in range(3):
+            w.logChange(t, "sig0", MaskedValue(t & 1, 1), None)
+            w.logChange(t, "vect0", MaskedValue(t, 0xffff), None)
+        w.logChange(3, "vect0", MaskedValue(0, 0), None)
+        w.close()
+
+        res = json.loads(out.getvalue())
+        header = res["header"]
+        self.assertEqual([s["name"] for s in header["children"]], ["unit0", "unit1"])
+        self.assertEqual(header["children"][1]["children"][0],
+                         {"name": "vect0", "type": {"name": "wire", "width": 16}, "id": 1})
+        self.assertEqual(res["chunks"], [
+            {"id": 0, "time": [0, 1], "value": ["0", "1"]},
+            {"id": 1, "time": [0, 1], "value": ["b0000000000000000", "b0000000000000001"]},
+            {"id": 1, "time": [2, 3], "value": ["b0000000000000010", "bXXXXXXXXXXXXXXXX"]},
+            {"id": 0, "time": [2], "value": ["0"]},
+        ])
+        # each chunk is on separate line
+        self.assertEqual(len(out.getvalue().splitlines()), 2 + 4 + 1)
+    def _array_example(self, deltaOnly):
+        res = {}
+        w = JsonWriter(res)
+        with w.varScope("unit0") as m:
+            m.addVar("mem", "mem", VCD_SIG_TYPE.ARRAY, [4, 8],
+                     JsonArrayFormatter([4], JsonBitsFormatter(), deltaOnly=deltaOnly))
+        w.enddefinitions()
+
+        mem = [MaskedValue(i, 0xff) for i in range(4)]
+        w.logChange(0, "mem", mem, None)
+        mem[2] = MaskedValue(10, 0xff)
+        w.logChange(1, "mem", mem, None)
+        w.logChange(2, "mem", mem, ArrayItemUpdater([1]))
+        mem[1] = MaskedValue(0, 0)
+        w.logChange(3, "mem", mem, ArrayItemUpdater([1]))
+        return res["children"][0]["data"]
+
+    def test_array(self):
+        self.assertEqual(self._array_example(False), [
+            (0, ([0], "b00000000")),
+            (0, ([1], "b00000001")),
+            (0, ([2], "b00000010")),
+            (0, ([3], "b00000011")),
+            (1, ([0], "b00000000")),
+            (1, ([1], "b00000001")),
+            (1, ([2], "b00001010")),
+            (1, ([3], "b00000011")),
+            (2, ([1], "b00000001")),
+            (3, ([1], "bXXXXXXXX")),
+        ])
+
+    def test_array_delta_only(self):
+        self.assertEqual(self._array_example(True), [
+            (0, ([0], "b00000000")),
+            (0, ([1], "b00000001")),
+            (0, ([2], "b00000010")),
+            (0, ([3], "b00000011")),
+            (1, ([2], "b00001010")),
+            (3, ([1], "bXXXXXXXX")),
+        ])
+
+    def test_profiling(self):
+        res = {}
+        w = JsonWriter(res)
+        with w.varScope("unit0") as m:
+            m.addVar("a", "a", VCD_SIG_TYPE.WIRE, 1, JsonBitsFormatter())
+            m.addVar("b", "b", VCD_SIG_TYPE.WIRE, 8, JsonBitsFormatter())
+        w.enddefinitions()
+        w.enableProfiling()
+        for t in range(4):
+            w.logChange(t, "a", MaskedValue(t & 1, 1), None)
+        w.logChange(4, "b", MaskedValue(3, 0xff), None)
+        w.close()
+        r = w.getProfilingReport()
+        self.assertEqual([(v["name"], v["changes"], v["bytes"]) for v in r["vars"]], [
+            ("unit0.a", 4, 4 * len('[0,"0"]')),
+            ("unit0.b", 1, len('[4,"b00000011"]')),
+        ])
+        self.assertEqual(res["children"][0]["data"], [(0, "0"), (1, "1"), (2, "0"), (3, "1")])
+
 
 if __name__ == "__main__":
     testLoader = unittest.TestLoader()
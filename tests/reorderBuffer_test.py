@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from io import StringIO
+from threading import Thread
+import unittest
+
+from pyDigitalWaveTools.json.value_format import JsonBitsFormatter
+from pyDigitalWaveTools.json.writer import JsonWriter
+from pyDigitalWaveTools.vcd.common import VCD_SIG_TYPE
+from pyDigitalWaveTools.vcd.reorder_buffer import LogChangeReorderBuffer
+from pyDigitalWaveTools.vcd.value_format import VcdBitsFormatter
+from pyDigitalWaveTools.vcd.writer import VcdWriter
+from tests.vcdWriter_test import MaskedValue
+
+
+def add_vars(vcd, sig_names, formatter_cls):
+    with vcd.varScope("unit0") as m:
+        for s in sig_names:
+            m.addVar(s, s, VCD_SIG_TYPE.WIRE, 8, formatter_cls())
+    vcd.enddefinitions()
+
+
+def producer_changes(sig: str, time_offset: int, n: int):
+    return [(t * 3 + time_offset, sig, MaskedValue(t % 256, 0xff)) for t in range(n)]
+
+
+class LogChangeReorderBufferTC(unittest.TestCase):
+
+    def _reference(self, all_changes):
+        out = StringIO()
+        vcd = VcdWriter(out)
+        add_vars(vcd, [ch[0][1] for ch in all_changes], VcdBitsFormatter)
+        # changes with the same time from different producers are ordered by arrival
+        # which is not deterministic with threads, but in this test times are unique
+        for t, sig, v in sorted((ch for changes in all_changes for ch in changes),
+                                key=lambda x: x[0]):
+            vcd.logChange(t, sig, v, None)
+        return out.getvalue()
+
+    def test_single_thread(self):
+        all_changes = [producer_changes(f"s{i:d}", i, 100) for i in range(3)]
+        out = StringIO()
+        vcd = VcdWriter(out)
+        add_vars(vcd, [ch[0][1] for ch in all_changes], VcdBitsFormatter)
+        buff = LogChangeReorderBuffer(vcd)
+        producers = [buff.producer() for _ in all_changes]
+        # producer 2 logs all, producer 0 then 1
+        for p_i in (2, 0, 1):
+            for t, sig, v in all_changes[p_i]:
+                producers[p_i].logChange(t, sig, v, None)
+            if p_i == 2:
+                # nothing can be written because other producers did not move yet
+                self.assertEqual(buff.watermark, -1)
+        buff.close()
+        self.assertEqual(out.getvalue(), self._reference(all_changes))
+
+    def test_threads_max_skew(self):
+        all_changes = [producer_changes(f"s{i:d}", i, 1000) for i in range(3)]
+        out = StringIO()
+        vcd = VcdWriter(out)
+        add_vars(vcd, [ch[0][1] for ch in all_changes], VcdBitsFormatter)
+        buff = LogChangeReorderBuffer(vcd, maxSkew=10)
+        max_buffered = [0]
+
+        def run(p, changes):
+            with p:
+                for t, sig, v in changes:
+                    p.logChange(t, sig, v, None)
+                    max_buffered[0] = max(max_buffered[0], len(buff._heap))
+
+        threads = [Thread(target=run, args=(buff.producer(), ch)) for ch in all_changes]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        buff.close()
+        self.assertEqual(out.getvalue(), self._reference(all_changes))
+        self.assertLessEqual(max_buffered[0], 3 * (10 // 3 + 2))
+
+    def test_json_writer(self):
+        res = {}
+        w = JsonWriter(res)
+        add_vars(w, ["a", "b"], JsonBitsFormatter)
+        buff = LogChangeReorderBuffer(w)
+        a = buff.producer("a")
+        b = buff.producer("b")
+        b.logChange(5, "b", MaskedValue(1, 0xff), None)
+        a.logChange(1, "a", MaskedValue(2, 0xff), None)
+        a.advance(10)
+        b.logChange(7, "b", MaskedValue(3, 0xff), None)
+        buff.close()
+        self.assertEqual([ch["data"] for ch in res["children"]],
+                         [[(1, "b00000010")], [(5, "b00000001"), (7, "b00000011")]])
+
+    def test_time_backward(self):
+        buff = LogChangeReorderBuffer(None)
+        p = buff.producer()
+        p.advance(10)
+        with self.assertRaises(ValueError):
+            p.logChange(5, "a", None, None)
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(LogChangeReorderBufferTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
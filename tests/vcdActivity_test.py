@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+
+from pyDigitalWaveTools.vcd.activity import computeActivity, VcdActivityParser, \
+    activityReport
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+
+VCD = """$timescale 1ns $end
+$scope module top $end
+$var wire 1 ! clk $end
+$var wire 4 " data $end
+$var real 64 # r $end
+$scope module sub $end
+$var wire 1 ! clk_alias $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+bx "
+r0.5 #
+$end
+#5
+1!
+#10
+0!
+b11 "
+#15
+1!
+#20
+0!
+b1 "
+r1.5 #
+#25
+1!
+b1001 "
+#30
+"""
+
+
+class VcdActivityTC(unittest.TestCase):
+
+    def test_activity(self):
+        vcd = VcdParser()
+        vcd.parse_str(VCD)
+        # the end is the time of the last change by default
+        activity = computeActivity(vcd)
+        self.assertEqual(activity["!"].time1, [10])
+
+        activity = computeActivity(vcd, tEnd=30)
+        clk = activity["!"]
+        self.assertEqual(clk.changes, 6)
+        self.assertEqual(clk.toggles, [5])
+        self.assertEqual(clk.time0, [15])
+        self.assertEqual(clk.time1, [15])
+        self.assertEqual(clk.timeX, [0])
+        data = activity['"']
+        self.assertEqual(data.changes, 4)
+        # x -> 0011 -> 0001 -> 1001
+        self.assertEqual(data.toggles, [0, 1, 0, 1])
+        self.assertEqual(data.timeX, [10, 10, 10, 10])
+        self.assertEqual(data.time1, [20, 10, 0, 5])
+        self.assertEqual(data.time0, [0, 10, 20, 15])
+        r = activity["#"]
+        self.assertEqual(r.changes, 2)
+        self.assertEqual(r.toggles, [])
+
+        p = VcdActivityParser(tEnd=30)
+        p.parse_str(VCD)
+        for vcdId, a in activity.items():
+            self.assertDictEqual(p.activity[vcdId].toJson(), a.toJson())
+        self.assertEqual(p.idcode2series["!"], [])
+
+        report = activityReport(vcd.scope, activity)
+        top = report["children"][0]
+        self.assertEqual(top["bits"], 1 + 4 + 1)
+        self.assertEqual(top["totalToggles"], 5 + 2 + 5)
+        self.assertEqual(top["totalTimeX"], 40)
+        self.assertEqual(top["children"][-1]["name"], "sub")
+        self.assertEqual(top["children"][-1]["totalToggles"], 5)
+
+    def test_real_types(self):
+        vcd = """$scope module top $end
+$var realtime 64 ! t $end
+$var shortreal 32 " s $end
+$var real_parameter 64 # p $end
+$upscope $end
+$enddefinitions $end
+#0
+r0 !
+r1.5 "
+r3 #
+#10
+r2.5 !
+#20
+r0.5 !
+"""
+        for p in (VcdParser(), VcdActivityParser()):
+            p.parse_str(vcd)
+            if isinstance(p, VcdActivityParser):
+                activity = p.activity
+            else:
+                activity = computeActivity(p)
+            self.assertEqual(activity["!"].changes, 3)
+            self.assertEqual(activity['"'].changes, 1)
+            for a in activity.values():
+                self.assertEqual(a.toggles, [])
+                self.assertEqual(a.timeX, [])
+
+    def test_streaming_equals_series(self):
+        fName = os.path.join(BASE, "AxiRegTC_test_write.vcd")
+        with open(fName) as f:
+            vcd = VcdParser()
+            vcd.parse(f)
+        with open(fName) as f:
+            p = VcdActivityParser()
+            p.parse(f)
+        activity = computeActivity(vcd, tEnd=p.now)
+        for vcdId, a in activity.items():
+            self.assertDictEqual(p.activity[vcdId].toJson(), a.toJson())
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdActivityTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import unittest
+
+from pyDigitalWaveTools.vcd.async_parser import VcdAsyncParser, VcdParseCancelled
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+FILE = os.path.join(BASE, "AxiRegTC_test_write.vcd")
+
+
+class VcdAsyncParserTC(unittest.IsolatedAsyncioTestCase):
+
+    def _ref(self):
+        with open(FILE) as f:
+            vcd = VcdParser()
+            vcd.parse(f)
+        return vcd
+
+    async def test_parse(self):
+        with open(FILE) as f:
+            vcd = await VcdAsyncParser().parse(f)
+        self.assertDictEqual(vcd.scope.toJson(), self._ref().scope.toJson())
+
+    async def test_progress(self):
+        p = VcdAsyncParser(chunkSize=1024)
+        progress = []
+        with open(FILE) as f:
+            async for pr in p.iterParse(f):
+                progress.append(pr)
+        size = os.path.getsize(FILE)
+        self.assertGreaterEqual(len(progress), size // 1024)
+        self.assertTrue(progress[-1].done)
+        self.assertEqual(progress[-1].bytesRead, size)
+        self.assertFalse(any(pr.done for pr in progress[:-1]))
+        bytesRead = [pr.bytesRead for pr in progress]
+        self.assertEqual(bytesRead, sorted(bytesRead))
+        now = [pr.now for pr in progress]
+        self.assertEqual(now, sorted(now))
+        self.assertDictEqual(p.parser.scope.toJson(), self._ref().scope.toJson())
+
+    async def test_concurrent(self):
+        files = [open(FILE) for _ in range(4)]
+        try:
+            res = await asyncio.gather(*(VcdAsyncParser(chunkSize=512).parse(f) for f in files))
+        finally:
+            for f in files:
+                f.close()
+        ref = self._ref().scope.toJson()
+        for vcd in res:
+            self.assertDictEqual(vcd.scope.toJson(), ref)
+
+    async def test_cancel(self):
+        p = VcdAsyncParser(chunkSize=256)
+        with open(FILE) as f:
+            with self.assertRaises(VcdParseCancelled):
+                async for pr in p.iterParse(f):
+                    if pr.bytesRead > 2048:
+                        p.cancel()
+
+    async def test_cancel_task(self):
+        p = VcdAsyncParser(chunkSize=256)
+        started = asyncio.Event()
+
+        async def consume(f):
+            it = p.iterParse(f)
+            try:
+                async for _ in it:
+                    started.set()
+                    await asyncio.sleep(10)
+            finally:
+                await it.aclose()
+
+        with open(FILE) as f:
+            t = asyncio.ensure_future(consume(f))
+            await started.wait()
+            t.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await t
+        self.assertTrue(p._cancelled.is_set())
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdAsyncParserTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
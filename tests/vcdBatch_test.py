@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+import tempfile
+import unittest
+
+from pyDigitalWaveTools.vcd.batch import parseVcdFiles
+from pyDigitalWaveTools.vcd.compact import VcdCompactWaves
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+FILES = ["example0.vcd", "AxiRegTC_test_write.vcd", "verilog2005-sample0.vcd", "multiscope.vcd"]
+
+
+class VcdBatchTC(unittest.TestCase):
+
+    def _parse(self, fName):
+        with open(fName) as f:
+            vcd = VcdParser()
+            vcd.parse(f)
+        return vcd
+
+    def test_compact(self):
+        for n in FILES:
+            vcd = self._parse(os.path.join(BASE, n))
+            c = pickle.loads(pickle.dumps(VcdCompactWaves.fromParser(vcd)))
+            self.assertEqual(len(c), sum(len(s) for s in vcd.idcode2series.values()))
+            vcd2 = c.toParser()
+            self.assertDictEqual(vcd2.scope.toJson(), vcd.scope.toJson())
+            self.assertEqual(getattr(vcd2, "timescale", None), getattr(vcd, "timescale", None))
+
+    def test_parse_files(self):
+        fileNames = [os.path.join(BASE, n) for n in FILES]
+        fileNames.append(os.path.join(BASE, "non_existing.vcd"))
+        for maxWorkers in (1, 2):
+            results = parseVcdFiles(fileNames, maxWorkers=maxWorkers)
+            self.assertEqual([r.fileName for r in results], fileNames)
+            for fName, r in zip(fileNames[:-1], results):
+                self.assertIsNone(r.error)
+                self.assertDictEqual(r.waves.toParser().scope.toJson(),
+                                     self._parse(fName).scope.toJson())
+            self.assertIsNone(results[-1].waves)
+            self.assertIn("FileNotFoundError", results[-1].error)
+
+    def test_timeout(self):
+        r, = parseVcdFiles([os.path.join(BASE, "AxiRegTC_test_write.vcd")], maxWorkers=1, timeout=0)
+        self.assertIn("TimeoutError", r.error)
+
+    def test_timeout_parse_files(self):
+        fileNames = [os.path.join(BASE, n) for n in FILES]
+        results = parseVcdFiles(fileNames, maxWorkers=2, timeout=60)
+        self.assertEqual([r.fileName for r in results], fileNames)
+        for fName, r in zip(fileNames, results):
+            self.assertIsNone(r.error)
+            self.assertDictEqual(r.waves.toParser().scope.toJson(),
+                                 self._parse(fName).scope.toJson())
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "requires os.mkfifo")
+    def test_timeout_blocked_worker(self):
+        # open() of a fifo without writer blocks the worker, the line based check can not stop it
+        with tempfile.TemporaryDirectory() as d:
+            fifo = os.path.join(d, "blocked.vcd")
+            os.mkfifo(fifo)
+            fileNames = [fifo, os.path.join(BASE, "example0.vcd")]
+            blocked, ok = parseVcdFiles(fileNames, maxWorkers=2, timeout=0.5)
+        self.assertIn("TimeoutError", blocked.error)
+        self.assertIsNone(blocked.waves)
+        self.assertIsNone(ok.error)
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdBatchTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from pyDigitalWaveTools.vcd.clock import VcdClockSeries, VcdClockParser, \
+    compressClocks, compressClockSeries
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+
+def example_clock_vcd():
+    buff = [
+        "$timescale 1ps $end\n",
+        "$scope module top $end\n",
+        "$var wire 1 ! clk $end\n",
+        "$var wire 1 \" rst $end\n",
+        "$var wire 8 # data $end\n",
+        "$var wire 1 $ clk2 $end\n",
+        "$upscope $end\n",
+        "$enddefinitions $end\n",
+        "#0\n$dumpvars\nx!\n1\"\nb0 #\n0$\n$end\n",
+    ]
+    for t in range(1, 400):
+        buff.append(f"#{t:d}\n")
+        if t >= 5 and t % 5 == 0:
+            # period 10, duty 5 (clock stops for a while and starts again with a different phase)
+            if not 150 <= t < 200:
+                buff.append(f"{(t // 5) & 1:d}!\n")
+        if t % 7 == 0:
+            buff.append("1$\n")
+        elif t % 7 == 2:
+            buff.append("0$\n")
+        if t == 23:
+            buff.append("0\"\n")
+        if t % 13 == 0:
+            buff.append(f"b{t:b} #\n")
+    return "".join(buff)
+
+
+class VcdClockTC(unittest.TestCase):
+
+    def _parse(self, parserCls=VcdParser):
+        vcd = parserCls()
+        vcd.parse_str(example_clock_vcd())
+        return vcd
+
+    def _value_at(self, data, t):
+        v = None
+        for _t, _v in data:
+            if _t > t:
+                break
+            v = _v
+        return v
+
+    def _edges(self, data, t0, t1, rising):
+        target = "1" if rising else "0"
+        res = []
+        prev = None
+        for t, v in data:
+            if v == target and prev != target and t0 <= t and (t1 is None or t < t1):
+                res.append(t)
+            prev = v
+        return res
+
+    def test_series(self):
+        ref = self._parse()
+        for vcdId in ("!", "$", "\""):
+            data = ref.idcode2series[vcdId]
+            s = VcdClockSeries(data)
+            self.assertEqual(len(s), len(data))
+            self.assertEqual(list(s), data)
+            self.assertEqual([s[i] for i in range(-len(s), len(s))], data + data)
+            self.assertEqual(s[3:20:3], data[3:20:3])
+            for t in range(-1, 410):
+                self.assertEqual(s.value_at(t), self._value_at(data, t), (vcdId, t))
+            for t0, t1 in [(0, None), (0, 1000), (7, 13), (17, 155), (150, 205), (333, 334), (500, 600)]:
+                for rising in (True, False):
+                    self.assertEqual(s.edges(t0, t1, rising), self._edges(data, t0, t1, rising),
+                                     (vcdId, t0, t1, rising))
+
+        clk = VcdClockSeries(ref.idcode2series["!"])
+        # x at 0, first segment until 145, second from 200
+        self.assertEqual(len(clk.segments), 3)
+        self.assertEqual(clk.segments[1][:3], (5, 10, 5))
+        self.assertTrue(clk.isCompressed())
+        self.assertIsNone(compressClockSeries(ref.idcode2series["\""]))
+
+    def test_compressClocks(self):
+        ref = self._parse()
+        vcd = self._parse()
+        clocks = compressClocks(vcd)
+        self.assertEqual(set(clocks.keys()), {"!", "$"})
+        self.assertIs(vcd.idcode2var["!"].data, clocks["!"])
+        self.assertDictEqual(vcd.scope.toJson(), ref.scope.toJson())
+
+    def test_VcdClockParser(self):
+        ref = self._parse()
+        vcd = self._parse(VcdClockParser)
+        self.assertEqual(set(vcd.clocks.keys()), {"!", "$"})
+        self.assertIsInstance(vcd.idcode2series["\""], list)
+        self.assertIs(vcd.idcode2var["$"].data, vcd.clocks["$"])
+        self.assertDictEqual(vcd.scope.toJson(), ref.scope.toJson())
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdClockTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from pyDigitalWaveTools.vcd.compression import CompressedTextOutput, \
+    openVcdFile, COMPRESSION_FORMATS
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.writer import VcdWriter
+from tests.vcdWriter_test import example_dump_values0
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+
+
+class VcdCompressionTC(unittest.TestCase):
+
+    def _test_format(self, compression):
+        with open(os.path.join(BASE, "example0.vcd")) as f:
+            ref = f.read()
+
+        with TemporaryDirectory() as d:
+            ext = COMPRESSION_FORMATS[compression][2]
+            fName = os.path.join(d, "example0.vcd" + ext)
+            # small block size to produce multiple compressed blocks
+            with CompressedTextOutput(fName, blockSize=16) as out:
+                vcd = VcdWriter(out)
+                vcd.date(datetime.strptime("2018-04-12 18:04:03.652880",
+                                           "%Y-%m-%d %H:%M:%S.%f"))
+                vcd.timescale(1)
+                example_dump_values0(vcd)
+
+            with openVcdFile(fName) as f:
+                self.assertEqual(f.read(), ref)
+
+            with openVcdFile(fName) as f:
+                vcd = VcdParser()
+                vcd.parse(f)
+            self.assertEqual(vcd.scope.children["unit0"].children["vect0"].data,
+                             [(0, "bXXXXXXXXXXXXXXXX"), (3, "b0000000000001010"), (4, "b0000000000010100")])
+
+    def test_gz(self):
+        self._test_format("gz")
+
+    def test_bz2(self):
+        self._test_format("bz2")
+
+    def test_xz(self):
+        self._test_format("xz")
+
+    @unittest.skipIf("zst" not in COMPRESSION_FORMATS, "zstandard not installed")
+    def test_zst(self):
+        self._test_format("zst")
+
+    @unittest.skipIf("zst" not in COMPRESSION_FORMATS, "zstandard not installed")
+    def test_zst_multiple_frames(self):
+        import zstandard
+        ref = "".join(f"#{t:d}\nb{t:b} !\n" for t in range(1000))
+        with TemporaryDirectory() as d:
+            fName = os.path.join(d, "dump.vcd.zst")
+            with CompressedTextOutput(fName, blockSize=256) as out:
+                out.write(ref)
+                for line in ref.splitlines(True):
+                    out.write(line)
+            ref = ref + ref
+            # the data really consists of multiple frames
+            with open(fName, "rb") as f:
+                firstFrame = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=False).read(len(ref))
+            self.assertLess(len(firstFrame), len(ref))
+
+            with openVcdFile(fName) as f:
+                self.assertEqual(f.read(), ref)
+            with openVcdFile(fName, "rb") as f:
+                self.assertEqual(f.read(len(ref) + 1), ref.encode())
+            with openVcdFile(fName) as f:
+                self.assertEqual(list(f), ref.splitlines(True))
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            CompressedTextOutput("example0.vcd")
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdCompressionTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+
+from pyDigitalWaveTools.vcd.dedup import deduplicateSeries, seriesHash
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+
+DUP_VCD = """\
+$scope module top $end
+$var wire 1 ! a $end
+$var wire 1 " a_buf0 $end
+$var wire 8 # d $end
+$var wire 8 $ d_buf $end
+$var wire 8 % d_other $end
+$var wire 1 & a_buf1 $end
+$var wire 1 ! a_alias $end
+$upscope $end
+$enddefinitions $end
+#0
+0! 0" b0 # b0 $ b0 % 0&
+#5
+1! 1" b1010 # b1010 $ b1011 % 1&
+#10
+0! 0" b11 # b11 $ b11 % 0&
+"""
+
+
+class VcdDedupTC(unittest.TestCase):
+
+    def _parse(self, vcdStr):
+        vcd = VcdParser()
+        vcd.parse_str(vcdStr)
+        return vcd
+
+    def test_dedup(self):
+        ref = self._parse(DUP_VCD)
+        vcd = self._parse(DUP_VCD)
+        report = deduplicateSeries(vcd)
+        self.assertEqual(sorted(report.groups), [["!", "\"", "&"], ["#", "$"]])
+        self.assertEqual(report.savedItems, 3 * 3)
+        self.assertGreater(report.savedBytes, 0)
+        s = vcd.idcode2series
+        self.assertIs(s["\""], s["!"])
+        self.assertIs(s["&"], s["!"])
+        self.assertIs(vcd.idcode2var["&"].data, s["!"])
+        self.assertIs(s["$"], s["#"])
+        self.assertIsNot(s["%"], s["#"])
+        self.assertDictEqual(vcd.scope.toJson(), ref.scope.toJson())
+
+        # second pass does not find anything new
+        report = deduplicateSeries(vcd)
+        self.assertEqual(report.savedItems, 0)
+
+    def test_file(self):
+        fileName = os.path.join(BASE, "AxiRegTC_test_write.vcd")
+        with open(fileName) as f:
+            ref = VcdParser()
+            ref.parse(f)
+        with open(fileName) as f:
+            vcd = VcdParser()
+            vcd.parse(f)
+        report = deduplicateSeries(vcd)
+        for g in report.groups:
+            for vcdId in g:
+                self.assertEqual(ref.idcode2series[vcdId], ref.idcode2series[g[0]])
+        self.assertDictEqual(vcd.scope.toJson(), ref.scope.toJson())
+
+    def test_seriesHash(self):
+        a = [(i, "b%d" % (i % 7)) for i in range(10000)]
+        b = list(a)
+        self.assertEqual(seriesHash(a), seriesHash(b))
+        b[5000] = (5000, "x")
+        self.assertNotEqual(seriesHash(a), seriesHash(b))
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdDedupTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from io import StringIO
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from pyDigitalWaveTools.vcd.activity import VcdActivityParser
+from pyDigitalWaveTools.vcd.common import VcdVarScope
+from pyDigitalWaveTools.vcd.header_cache import VcdHeaderCache, readVcdHeaderText
+from pyDigitalWaveTools.vcd.parser import VcdParser
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+FILES = ["AxiRegTC_test_write.vcd", "example0.vcd", "multiscope.vcd",
+         "verilog2005-sample0.vcd", "verilog2005-sample1.vcd"]
+
+ALIAS_VCD = """\
+$timescale 1ps $end
+$scope module top $end
+$var wire 1 ! a $end
+$scope module sub $end
+$var wire 1 ! a_alias $end
+$var wire 4 " b $end
+$upscope $end
+$upscope $end
+$scope module top $end
+$var wire 1 # c $end
+$upscope $end
+$enddefinitions $end #0
+1! b1010 "
+#5
+0!
+1#
+"""
+
+
+class VcdHeaderCacheTC(unittest.TestCase):
+
+    def _ref(self, fileName):
+        with open(os.path.join(BASE, fileName)) as f:
+            vcd = VcdParser()
+            vcd.parse(f)
+        return vcd
+
+    def assertSameParser(self, vcd: VcdParser, ref: VcdParser):
+        self.assertDictEqual(vcd.scope.toJson(), ref.scope.toJson())
+        self.assertEqual(list(vcd.idcode2var.keys()), list(ref.idcode2var.keys()))
+        self.assertEqual(vcd.idcode2series, ref.idcode2series)
+        for d in ("date", "version", "timescale"):
+            self.assertEqual(getattr(vcd, d, None), getattr(ref, d, None))
+        self.assertSameScope(vcd.scope, ref.scope)
+
+    def assertSameScope(self, scope: VcdVarScope, ref: VcdVarScope):
+        # scope types and bit ranges are not in toJson()
+        self.assertEqual(scope.scopeType, ref.scopeType)
+        for name, ch in scope.children.items():
+            refCh = ref.children[name]
+            if isinstance(ch, VcdVarScope):
+                self.assertSameScope(ch, refCh)
+            else:
+                self.assertEqual(ch.bitRange, refCh.bitRange)
+
+    def test_readVcdHeaderText(self):
+        lines = iter(StringIO(ALIAS_VCD))
+        header, rest = readVcdHeaderText(lines)
+        self.assertTrue(header.endswith("$enddefinitions $end\n"))
+        self.assertEqual(rest, " #0\n")
+        self.assertEqual(next(lines), "1! b1010 \"\n")
+
+    def test_parse(self):
+        cache = VcdHeaderCache()
+        for fileName in FILES:
+            ref = self._ref(fileName)
+            for _ in range(2):
+                with open(os.path.join(BASE, fileName)) as f:
+                    vcd = cache.parse(f)
+                self.assertSameParser(vcd, ref)
+        self.assertEqual(cache.misses, len(FILES))
+        self.assertEqual(cache.hits, len(FILES))
+
+    def test_alias(self):
+        ref = VcdParser()
+        ref.parse_str(ALIAS_VCD)
+        cache = VcdHeaderCache()
+        vcd0 = cache.parse(StringIO(ALIAS_VCD))
+        vcd1 = cache.parse(StringIO(ALIAS_VCD))
+        for vcd in (vcd0, vcd1):
+            self.assertSameParser(vcd, ref)
+            top = vcd.scope.children["top"]
+            self.assertIs(top.children["sub"].children["a_alias"].vcdId, top.children["a"])
+        # each file has its own objects
+        self.assertIsNot(vcd0.idcode2var["!"], vcd1.idcode2var["!"])
+        self.assertIsNot(vcd0.idcode2series["!"], vcd1.idcode2series["!"])
+
+    def test_cacheDir(self):
+        fileName = "verilog2005-sample0.vcd"
+        ref = self._ref(fileName)
+        with TemporaryDirectory() as d:
+            for i in range(2):
+                cache = VcdHeaderCache(cacheDir=d)
+                with open(os.path.join(BASE, fileName)) as f:
+                    vcd = cache.parse(f)
+                self.assertSameParser(vcd, ref)
+                self.assertEqual((cache.hits, cache.misses), (i, 1 - i))
+                self.assertEqual(len(os.listdir(d)), 1)
+
+    def test_subclass(self):
+        fileName = "verilog2005-sample1.vcd"
+        ref = VcdActivityParser()
+        with open(os.path.join(BASE, fileName)) as f:
+            ref.parse(f)
+        cache = VcdHeaderCache()
+        for _ in range(2):
+            with open(os.path.join(BASE, fileName)) as f:
+                vcd = cache.parse(f, VcdActivityParser())
+            self.assertEqual({k: v.toJson() for k, v in vcd.activity.items()},
+                             {k: v.toJson() for k, v in ref.activity.items()})
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdHeaderCacheTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
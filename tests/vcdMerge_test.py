@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from io import StringIO
+import os
+import unittest
+
+from pyDigitalWaveTools.vcd.merge import mergeVcdFiles
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.streaming import iterScopeVars
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+
+
+class VcdMergeTC(unittest.TestCase):
+
+    def _parse(self, rel_name):
+        with open(os.path.join(BASE, rel_name)) as f:
+            vcd = VcdParser()
+            vcd.parse(f)
+        return vcd
+
+    def test_merge(self):
+        inputs = ["example0.vcd", "AxiRegTC_test_write.vcd", "verilog2005-sample0.vcd"]
+        out = StringIO()
+        files = [open(os.path.join(BASE, n)) for n in inputs]
+        try:
+            with self.assertRaises(ValueError):
+                # different timescale
+                mergeVcdFiles([(f"p{i:d}", f) for i, f in enumerate(files)], out)
+        finally:
+            for f in files:
+                f.close()
+
+        inputs = inputs[:2]
+        out = StringIO()
+        files = [open(os.path.join(BASE, n)) for n in inputs]
+        try:
+            mergeVcdFiles([(f"p{i:d}", f) for i, f in enumerate(files)], out)
+        finally:
+            for f in files:
+                f.close()
+
+        vcd = VcdParser()
+        vcd.parse_str(out.getvalue())
+        self.assertEqual(list(vcd.scope.children.keys()), ["p0", "p1"])
+        for i, rel_name in enumerate(inputs):
+            ref = self._parse(rel_name)
+            merged = vcd.scope.children[f"p{i:d}"]
+            ref_vars = list(iterScopeVars(ref.scope))
+            merged_vars = list(iterScopeVars(merged))
+            self.assertEqual([p for p, _ in ref_vars], [p for p, _ in merged_vars])
+            for (_, r), (_, m) in zip(ref_vars, merged_vars):
+                self.assertEqual((r.width, r.sigType, r.data), (m.width, m.sigType, m.data))
+
+        # time is monotonic
+        times = [int(line[1:]) for line in out.getvalue().splitlines() if line.startswith("#")]
+        self.assertEqual(times, sorted(set(times)))
+
+    def test_aliases_keywords_scope_types(self):
+        src = """$timescale 1ns $end
+$scope module top $end
+$scope task t $end
+$var wire 1 ! a $end
+$var wire 1 ! a_alias $end
+$var wire 4 " d [3:0] $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+b0000 "
+$end
+#5
+$dumpoff
+x!
+bx "
+$end
+#10
+$dumpon
+1!
+b0001 "
+$end
+#12
+0!
+"""
+        out = StringIO()
+        mergeVcdFiles([("p0", StringIO(src)), ("p1", StringIO(src))], out)
+        out = out.getvalue()
+        self.assertIn("$scope task t $end\n", out)
+        # the alias shares the id and the change is written only once
+        self.assertIn("$var wire 1 # a $end\n$var wire 1 # a_alias $end\n", out)
+        self.assertIn('$var wire 4 " d [3:0] $end\n', out)
+        self.assertEqual(out.split("$enddefinitions $end\n")[1], """\
+#0
+$dumpvars
+0!
+b0000 "
+$end
+$dumpvars
+0#
+b0000 $
+$end
+#5
+$dumpoff
+x!
+bx "
+$end
+$dumpoff
+x#
+bx $
+$end
+#10
+$dumpon
+1!
+b0001 "
+$end
+$dumpon
+1#
+b0001 $
+$end
+#12
+0!
+0#
+""")
+        vcd = VcdParser()
+        vcd.parse_str(out)
+        t = vcd.scope.children["p1"].children["top"].children["t"]
+        self.assertEqual(t.scopeType, "task")
+        self.assertEqual(t.children["d"].bitRange, "[3:0]")
+        self.assertIs(t.children["a_alias"].vcdId, t.children["a"])
+
+    def test_duplicate_name(self):
+        with self.assertRaises(ValueError):
+            mergeVcdFiles([("a", []), ("a", [])], StringIO())
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdMergeTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.query import VcdQuery, decodeVcdLogicValue
+
+
+VCD = """$timescale 1ns $end
+$scope module top $end
+$var wire 1 ! valid $end
+$var wire 1 " ready $end
+$var wire 1 # stall $end
+$var wire 8 $ addr $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+x"
+0#
+bx $
+$end
+#10
+1!
+b10 $
+#20
+1"
+#30
+1#
+b11110000 $
+#40
+0#
+#50
+0!
+bz0 $
+#60
+1!
+b10 $
+"""
+
+
+class VcdQueryTC(unittest.TestCase):
+
+    def setUp(self):
+        vcd = VcdParser()
+        vcd.parse_str(VCD)
+        self.q = VcdQuery(vcd.scope)
+
+    def test_decode(self):
+        self.assertEqual(decodeVcdLogicValue("1", 1), (1, 0))
+        self.assertEqual(decodeVcdLogicValue("z", 1), (0, 1))
+        self.assertEqual(decodeVcdLogicValue("b01x", 3), (2, 1))
+        self.assertEqual(decodeVcdLogicValue("b10", 8), (2, 0))
+        self.assertEqual(decodeVcdLogicValue("bx0", 8), (0, 0xfe))
+
+    def test_logic(self):
+        q = self.q
+        valid, ready, stall = q["top.valid"], q["top.ready"], q["top.stall"]
+        self.assertEqual(q.intervals(valid & ready & ~stall), [(20, 30), (40, 50), (60, None)])
+        self.assertEqual(q.intervals(valid & ready & ~stall, tEnd=100), [(20, 30), (40, 50), (60, 100)])
+        # ready is x until 20, 0 & x is 0
+        self.assertEqual(q.intervals(valid & ready, unknown=True), [(10, 20)])
+        self.assertEqual(q.intervals(~valid | ready), [(0, 10), (20, None)])
+        self.assertEqual(q.intervals(valid ^ stall), [(10, 30), (40, 50), (60, None)])
+
+    def test_compare(self):
+        q = self.q
+        addr = q["top.addr"]
+        self.assertEqual(q.intervals(addr == 2), [(10, 30), (60, None)])
+        self.assertEqual(q.intervals(addr == 2, unknown=True), [(0, 10), (50, 60)])
+        # known bit 0 differs
+        self.assertEqual(q.intervals(addr != 1), [(10, None)])
+        self.assertEqual(q.intervals(addr == "b11110000"), [(30, 50)])
+        self.assertEqual(q.intervals(addr > 100), [(30, 50)])
+        self.assertEqual(q.intervals(addr[7:4] == 0xf), [(30, 50)])
+        self.assertEqual(q.intervals(addr[1]), [(10, 30), (60, None)])
+        self.assertEqual(q.intervals(addr), [(10, 50), (60, None)])
+        self.assertEqual(q.intervals((addr == 2) & q["top.valid"]), [(10, 30), (60, None)])
+
+    def test_real(self):
+        vcd = VcdParser()
+        vcd.parse_str("""$scope module top $end
+$var realtime 64 ! t $end
+$var shortreal 32 " s $end
+$upscope $end
+$enddefinitions $end
+#0
+r0 !
+r1.5 "
+#10
+r2.5 !
+#20
+r0.5 !
+r0 "
+""")
+        q = VcdQuery(vcd.scope)
+        t, s = q["top.t"], q["top.s"]
+        self.assertEqual(q.intervals(t > 1), [(10, 20)])
+        self.assertEqual(q.intervals(s > 1), [(0, 20)])
+        self.assertEqual(q.intervals(t < s), [(0, 10)])
+        self.assertEqual(q.intervals(t > 1, unknown=True), [])
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdQueryTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from io import StringIO
+import os
+import unittest
+
+from pyDigitalWaveTools.vcd.header_cache import VcdHeaderCache
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.record_batch import VcdRecordBatchReader
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+FILES = ["AxiRegTC_test_write.vcd", "example0.vcd", "multiscope.vcd",
+         "verilog2005-sample0.vcd", "verilog2005-sample1.vcd"]
+
+
+class VcdRecordBatchTC(unittest.TestCase):
+
+    def _series(self, reader: VcdRecordBatchReader, batches):
+        series = {vcdId: [] for vcdId in reader.vcdIds}
+        for b in batches:
+            for t, vi, v in zip(b.times, b.varIndex, b.decodedValues()):
+                if v[0] == "s":
+                    # VcdParser stores strings without the prefix
+                    v = v[1:]
+                series[reader.vcdIds[vi]].append((t, v))
+        return series
+
+    def test_files(self):
+        for fileName in FILES:
+            fileName = os.path.join(BASE, fileName)
+            ref = VcdParser()
+            with open(fileName) as f:
+                ref.parse(f)
+            for batchSize in (1, 7, 1 << 16):
+                with open(fileName) as f:
+                    reader = VcdRecordBatchReader(f, batchSize=batchSize)
+                    batches = list(reader)
+                self.assertEqual(reader.vcdIds, list(ref.idcode2var.keys()))
+                total = sum(len(s) for s in ref.idcode2series.values())
+                self.assertEqual(sum(len(b) for b in batches), total)
+                for b in batches[:-1]:
+                    self.assertEqual(len(b), batchSize)
+                    self.assertLessEqual(len(b.dictionary), batchSize)
+                self.assertEqual(self._series(reader, batches), ref.idcode2series, (fileName, batchSize))
+
+    def test_batch(self):
+        vcd = """\
+$scope module top $end
+$var wire 1 ! a $end
+$var wire 4 " b $end
+$upscope $end
+$enddefinitions $end #0
+1! b1010 "
+$comment 0! $end
+#5
+0!
+b1010 "
+#7
+1!
+"""
+        cache = VcdHeaderCache()
+        for _ in range(2):
+            reader = VcdRecordBatchReader(StringIO(vcd), batchSize=3, headerCache=cache)
+            b0, b1 = reader
+            self.assertEqual(list(b0.times), [0, 0, 5])
+            self.assertEqual(list(b0.varIndex), [0, 1, 0])
+            self.assertEqual(list(b0.values), [0, 1, 2])
+            self.assertEqual(b0.dictionary, ["1", "b1010", "0"])
+            self.assertEqual(list(b1.times), [5, 7])
+            self.assertEqual(list(b1.varIndex), [1, 0])
+            self.assertEqual(b1.decodedValues(), ["b1010", "1"])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdRecordBatchTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
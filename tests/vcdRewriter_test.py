@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from io import StringIO
+import os
+import unittest
+
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.rewriter import VcdRewriter
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+
+
+def value_at(data, t):
+    v = None
+    for _t, _v in data:
+        if _t > t:
+            break
+        v = _v
+    return v
+
+
+class VcdRewriterTC(unittest.TestCase):
+
+    def _rewrite(self, rel_name, **kwargs):
+        out = StringIO()
+        with open(os.path.join(BASE, rel_name)) as f:
+            VcdRewriter(**kwargs).rewrite(f, out)
+        vcd = VcdParser()
+        vcd.parse_str(out.getvalue())
+        return vcd, out.getvalue()
+
+    def _parse(self, rel_name):
+        with open(os.path.join(BASE, rel_name)) as f:
+            vcd = VcdParser()
+            vcd.parse(f)
+        return vcd
+
+    def test_pass_through(self):
+        for rel_name in ["example0.vcd", "AxiRegTC_test_write.vcd", "verilog2005-sample0.vcd"]:
+            vcd, _ = self._rewrite(rel_name)
+            self.assertDictEqual(vcd.scope.toJson(), self._parse(rel_name).scope.toJson())
+
+    def test_filter_rename(self):
+        vcd, vcd_str = self._rewrite("example0.vcd", keep={"unit0.sig1", "unit0.vect0"},
+                                     rename={"unit0": "u", "unit0.vect0": "v"})
+        self.assertNotIn("0!", vcd_str)
+        ref = self._parse("example0.vcd").scope.children["unit0"]
+        u = vcd.scope.children["u"]
+        self.assertEqual(list(u.children.keys()), ["sig1", "v"])
+        self.assertEqual(u.children["sig1"].data, ref.children["sig1"].data)
+        self.assertEqual(u.children["v"].data, ref.children["vect0"].data)
+
+        vcd, _ = self._rewrite("example0.vcd", keep=lambda path: path.endswith("0"))
+        self.assertEqual(list(vcd.scope.children["unit0"].children.keys()), ["sig0", "vect0"])
+
+    def test_crop(self):
+        t0 = 520
+        t1 = 1000
+        vcd, vcd_str = self._rewrite("verilog2005-sample0.vcd", t0=t0, t1=t1)
+        ref = self._parse("verilog2005-sample0.vcd")
+        self.assertTrue(vcd_str.split("$enddefinitions $end\n")[1].startswith(f"#{t0:d}\n$dumpvars\n"))
+        for vcdId, data in vcd.idcode2series.items():
+            ref_data = ref.idcode2series[vcdId]
+            self.assertEqual(data[0], (t0, value_at(ref_data, t0 - 1)))
+            self.assertEqual(data[1:], [d for d in ref_data if t0 <= d[0] <= t1])
+
+    def test_crop_after_end(self):
+        vcd, _ = self._rewrite("example0.vcd", t0=10)
+        ref = self._parse("example0.vcd")
+        for vcdId, data in vcd.idcode2series.items():
+            self.assertEqual(data, [(10, ref.idcode2series[vcdId][-1][1])])
+
+    def test_scope_types_and_ranges(self):
+        vcd_str = """$timescale 1ns $end
+$scope module top $end
+$scope task t0 $end
+$var reg 1 ! a $end
+$upscope $end
+$scope function f0 $end
+$var reg 8 " b [7:0] $end
+$upscope $end
+$scope begin blk $end
+$scope fork frk $end
+$var wire 4 # c [3:0] $end
+$upscope $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+0!
+b0 "
+b0 #
+"""
+        out = StringIO()
+        VcdRewriter().rewrite(StringIO(vcd_str), out)
+        out = out.getvalue()
+        for line in ["$scope module top $end\n", "$scope task t0 $end\n",
+                     "$scope function f0 $end\n", "$scope begin blk $end\n",
+                     "$scope fork frk $end\n",
+                     '$var reg 8 " b [7:0] $end\n', "$var wire 4 # c [3:0] $end\n",
+                     "$var reg 1 ! a $end\n"]:
+            self.assertIn(line, out)
+
+        vcd = VcdParser()
+        vcd.parse_str(out)
+        top = vcd.scope.children["top"]
+        self.assertEqual(top.children["t0"].scopeType, "task")
+        self.assertEqual(top.children["f0"].children["b"].bitRange, "[7:0]")
+        self.assertIsNone(top.children["t0"].children["a"].bitRange)
+
+    def test_last_time(self):
+        # the last time without any kept change after it must not be lost
+        vcd, vcd_str = self._rewrite("example0.vcd", keep={"unit0.sig1"})
+        ref = self._parse("example0.vcd")
+        lastTime = max(d[-1][0] for d in ref.idcode2series.values())
+        self.assertTrue(vcd_str.endswith(f"#{lastTime:d}\n"), vcd_str[-50:])
+
+        vcd_str = """$scope module top $end
+$var wire 1 ! a $end
+$var wire 1 " b $end
+$upscope $end
+$enddefinitions $end
+#0
+0!
+0"
+#5
+1"
+#10
+0"
+#20
+1!
+#30
+1"
+"""
+        for t1, lastTime in [(None, 30), (15, 10)]:
+            out = StringIO()
+            VcdRewriter(keep={"top.a"}, t1=t1).rewrite(StringIO(vcd_str), out)
+            self.assertTrue(out.getvalue().endswith(f"#{lastTime:d}\n"), (t1, out.getvalue()))
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdRewriterTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
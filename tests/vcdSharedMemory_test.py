@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.shared_memory import publishVcdSharedMemory, \
+    VcdSharedWaves, writeVcdSharedFile
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+FILES = ["example0.vcd", "AxiRegTC_test_write.vcd", "verilog2005-sample0.vcd", "multiscope.vcd"]
+
+
+def _attachAndDump(name):
+    with VcdSharedWaves.attach(name) as waves:
+        return waves.scope.toJson()
+
+
+class VcdSharedMemoryTC(unittest.TestCase):
+
+    def _parse(self, rel_name):
+        with open(os.path.join(BASE, rel_name)) as f:
+            vcd = VcdParser()
+            vcd.parse(f)
+        return vcd
+
+    def test_file(self):
+        with TemporaryDirectory() as d:
+            for n in FILES:
+                vcd = self._parse(n)
+                fName = os.path.join(d, n + ".shm")
+                writeVcdSharedFile(vcd, fName)
+                with VcdSharedWaves.openFile(fName) as waves:
+                    self.assertDictEqual(waves.scope.toJson(), vcd.scope.toJson())
+                    self.assertEqual(getattr(waves, "timescale", None), getattr(vcd, "timescale", None))
+
+    def test_series(self):
+        vcd = self._parse("AxiRegTC_test_write.vcd")
+        shm = publishVcdSharedMemory(vcd)
+        try:
+            with VcdSharedWaves.attach(shm.name) as waves:
+                ref = vcd.scope.children["EpWithReg"].children["sig_ep_bus_w_data"].data
+                data = waves.scope.children["EpWithReg"].children["sig_ep_bus_w_data"].data
+                self.assertEqual(len(data), len(ref))
+                self.assertEqual(data[-1], ref[-1])
+                self.assertEqual(data[1:3], ref[1:3])
+                self.assertEqual(list(data.times), [t for t, _ in ref])
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_other_process(self):
+        vcd = self._parse("verilog2005-sample0.vcd")
+        shm = publishVcdSharedMemory(vcd)
+        try:
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                for res in executor.map(_attachAndDump, [shm.name, shm.name]):
+                    self.assertDictEqual(res, vcd.scope.toJson())
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdSharedMemoryTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
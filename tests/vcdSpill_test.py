@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.spill import SpilledSeries, VcdSeriesSpiller, SERIES_ITEM_SIZE_ESTIMATE
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+
+
+class VcdSpillTC(unittest.TestCase):
+
+    def test_spilled_series(self):
+        ref = [(i * 10, "b" + bin(i)[2:] if i % 3 else "") for i in range(100)]
+        spiller = VcdSeriesSpiller(SERIES_ITEM_SIZE_ESTIMATE)
+        s = SpilledSeries(spiller)
+        other = SpilledSeries(spiller)
+        try:
+            for i, item in enumerate(ref):
+                s.append(item)
+                other.append((i, str(i)))
+                if i % 16 == 15:
+                    s.flush()
+                    other.flush()
+                # reads between flushes remap the grown file
+                self.assertEqual(s[i], item)
+            self.assertEqual(len(s._tail), len(ref) % 16)
+            self.assertEqual(len(s), len(ref))
+            self.assertEqual(list(s), ref)
+            self.assertEqual(s[-1], ref[-1])
+            self.assertEqual(s[10:20], ref[10:20])
+            self.assertEqual(s[90:], ref[90:])
+            with self.assertRaises(IndexError):
+                s[len(ref)]
+            self.assertEqual(list(other), [(i, str(i)) for i in range(len(ref))])
+        finally:
+            spiller.close()
+
+    def test_parse_with_budget(self):
+        fName = os.path.join(BASE, "AxiRegTC_test_write.vcd")
+        with open(fName) as f:
+            ref = VcdParser()
+            ref.parse(f)
+
+        with open(fName) as f:
+            vcd = VcdParser(memoryBudget=50 * SERIES_ITEM_SIZE_ESTIMATE)
+            vcd.parse(f)
+        try:
+            self.assertTrue(vcd.spiller.spilled)
+            for vcdId in vcd.spiller.spilled.keys():
+                self.assertIsInstance(vcd.idcode2series[vcdId], SpilledSeries)
+                self.assertIs(vcd.idcode2var[vcdId].data, vcd.idcode2series[vcdId])
+            # the tails of spilled series are counted in the budget as well
+            inMemory = 0
+            for s in vcd.idcode2series.values():
+                inMemory += len(s._tail) if isinstance(s, SpilledSeries) else len(s)
+            self.assertLessEqual(inMemory, 50)
+            self.assertLessEqual(vcd.spiller.inMemory, 50)
+            for vcdId, var in vcd.idcode2var.items():
+                self.assertEqual(list(vcd.idcode2series[vcdId]), ref.idcode2series[vcdId], vcdId)
+            self.assertDictEqual(vcd.scope.toJson(), ref.scope.toJson())
+        finally:
+            vcd.spiller.close()
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdSpillTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from pyDigitalWaveTools.json.parser import JsonParser
+from pyDigitalWaveTools.vcd.parser import VcdParser
+from pyDigitalWaveTools.vcd.to_json import VcdToJsonColumnarParser, main
+
+
+BASE = os.path.dirname(os.path.realpath(__file__))
+
+
+class VcdToJsonTC(unittest.TestCase):
+
+    def _parse_vcd(self, rel_name):
+        with open(os.path.join(BASE, rel_name)) as f:
+            vcd = VcdParser()
+            vcd.parse(f)
+        return vcd
+
+    def test_columnar_parser(self):
+        for rel_name in ["example0.vcd", "AxiRegTC_test_write.vcd", "verilog2005-sample0.vcd"]:
+            out = StringIO()
+            with open(os.path.join(BASE, rel_name)) as f:
+                p = VcdToJsonColumnarParser(out, chunkSize=3)
+                p.parse(f)
+                # only the remainder of the last chunk is in memory
+                self.assertTrue(all(len(series) == 0 for series in p.idcode2series.values()))
+
+            j = JsonParser()
+            j.parse_str(out.getvalue())
+            self.assertDictEqual(j.scope.toJson(), self._parse_vcd(rel_name).scope.toJson())
+
+    def test_main(self):
+        inputs = [os.path.join(BASE, n) for n in ["example0.vcd", "multiscope.vcd"]]
+        with TemporaryDirectory() as d:
+            for fmt in ("tree", "columnar"):
+                for jobs in ("1", "2"):
+                    stdout = StringIO()
+                    with redirect_stdout(stdout):
+                        ret = main(["-o", d, "-j", jobs, "-f", fmt] + inputs)
+                    self.assertEqual(ret, 0)
+                    self.assertIn("2/2 files converted", stdout.getvalue())
+                    for fIn in inputs:
+                        fOut = os.path.join(d, os.path.basename(fIn)[:-len(".vcd")] + ".json")
+                        with open(fOut) as f:
+                            j = JsonParser()
+                            j.parse(f)
+                        self.assertDictEqual(j.scope.toJson(), self._parse_vcd(fIn).scope.toJson())
+
+            stdout = StringIO()
+            with redirect_stdout(stdout):
+                ret = main(["-o", d, os.path.join(d, "non_existing.vcd")])
+            self.assertEqual(ret, 1)
+            self.assertIn("FAILED", stdout.getvalue())
+
+    def test_main_output_collision(self):
+        with TemporaryDirectory() as d:
+            sub = os.path.join(d, "sub")
+            os.mkdir(sub)
+            inputs = [os.path.join(BASE, "example0.vcd"), os.path.join(sub, "example0.vcd")]
+            with open(inputs[0]) as fIn, open(inputs[1], "w") as fOut:
+                fOut.write(fIn.read())
+            out = os.path.join(d, "out")
+            os.mkdir(out)
+            stderr = StringIO()
+            with redirect_stderr(stderr), self.assertRaises(SystemExit) as cm:
+                main(["-o", out] + inputs)
+            self.assertEqual(cm.exception.code, 2)
+            self.assertIn("would be both converted to", stderr.getvalue())
+            # nothing is converted if outputs collide
+            self.assertEqual(os.listdir(out), [])
+
+            # without -o the outputs are next to the inputs
+            stdout = StringIO()
+            with redirect_stdout(stdout):
+                ret = main(["-j", "1", inputs[1]])
+            self.assertEqual(ret, 0)
+            self.assertTrue(os.path.isfile(os.path.join(sub, "example0.json")))
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(VcdToJsonTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
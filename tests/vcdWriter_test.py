@@ -3,7 +3,9 @@
 
 from datetime import datetime
 from io import StringIO
+import json
 import os
+from tempfile import TemporaryDirectory
 from typing import Union, Dict, Tuple, List
 import unittest
 
@@ -11,7 +13,8 @@ from pyDigitalWaveTools.vcd.common import VCD_SIG_TYPE, VcdVarScope
 from pyDigitalWaveTools.vcd.parser import VcdParser, VcdVarParsingInfo
 from pyDigitalWaveTools.vcd.value_format import VcdBitsFormatter, \
     LogValueFormatter
-from pyDigitalWaveTools.vcd.writer import VcdWriter, VcdVarWritingScope
+from pyDigitalWaveTools.vcd.writer import VcdWriter, VcdVarWritingScope, \
+    readCheckpointIndex, VarAlreadyRegistered, VcdVarIdScope, NameAlreadyRegistered
 
 
 BASE = os.path.dirname(os.path.realpath(__file__))
@@ -158,6 +161,305 @@ class VcdWriterTC(unittest.TestCase):
         vcd_in = VcdParser()
         vcd_in.parse_str(new_vcd_str)
 
+    def test_checkpoints(self):
+        out = StringIO()
+        index = StringIO()
+        vcd = VcdWriter(out)
+        vcd.enableCheckpoints(timeInterval=2, indexFile=index)
+        vcd.timescale(1)
+        example_dump_values0(vcd)
+        vcd_str = out.getvalue()
+
+        index.seek(0)
+        index = readCheckpointIndex(index)
+        self.assertEqual([t for t, _ in index], [2, 4])
+        for t, offset in index:
+            self.assertTrue(vcd_str.startswith(f"#{t:d}\n$dumpall\n", offset))
+        self.assertEqual(vcd_str[index[1][1]:], """\
+#4
+$dumpall
+0!
+1"
+b0000000000001010 #
+$end
+b0000000000010100 #
+""")
+
+        vcd_in = VcdParser()
+        vcd_in.parse_str(vcd_str)
+        self.assertEqual(vcd_in.scope.children["unit0"].children["sig1"].data,
+                         [(0, "X"), (2, "X"), (2, "1"), (4, "1")])
+
+    def test_checkpoints_byte_interval(self):
+        out = StringIO()
+        index = StringIO()
+        vcd = VcdWriter(out)
+        vcd.enableCheckpoints(byteInterval=1, indexFile=index)
+        example_dump_values0(vcd)
+        index.seek(0)
+        index = readCheckpointIndex(index)
+        # first time does not have any value yet
+        self.assertEqual([t for t, _ in index], [1, 2, 3, 4])
+
+    def test_segmentation(self):
+        with TemporaryDirectory() as d:
+            manifest = os.path.join(d, "manifest.json")
+            vcd = VcdWriter()
+            vcd.enableSegmentation(os.path.join(d, "dump.{:d}.vcd"), maxTime=2,
+                                   manifestFileName=manifest)
+            vcd.timescale(1)
+            example_dump_values0(vcd)
+            vcd.close()
+
+            with open(manifest) as f:
+                segments = json.load(f)["segments"]
+            self.assertEqual([(s["start"], s["end"]) for s in segments],
+                             [(0, 1), (2, 3), (4, 4)])
+
+            vect0 = []
+            for i, seg in enumerate(segments):
+                self.assertEqual(seg["file"], os.path.join(d, f"dump.{i:d}.vcd"))
+                with open(seg["file"]) as f:
+                    vcd_in = VcdParser()
+                    vcd_in.parse(f)
+                vect0.append(vcd_in.scope.children["unit0"].children["vect0"].data)
+
+        self.assertEqual(vect0, [
+            [(0, "bXXXXXXXXXXXXXXXX")],
+            [(2, "bXXXXXXXXXXXXXXXX"), (3, "b0000000000001010")],
+            [(4, "b0000000000001010"), (4, "b0000000000010100")],
+        ])
+
+    def test_segmentation_checkpoints(self):
+        for kwargs in ({"timeInterval": 1}, {"byteInterval": 10}):
+            with TemporaryDirectory() as d:
+                index = StringIO()
+                vcd = VcdWriter()
+                vcd.enableSegmentation(os.path.join(d, "dump.{:d}.vcd"), maxTime=2)
+                vcd.enableCheckpoints(indexFile=index, **kwargs)
+                vcd.timescale(1)
+                example_dump_values0(vcd)
+                vcd.close()
+
+                index.seek(0)
+                index = readCheckpointIndex(index)
+                self.assertTrue(index, kwargs)
+                # checkpoints are only in the middle of segments (segment starts with $dumpvars)
+                self.assertEqual([(t, segI) for t, _, segI in index], [(1, 0), (3, 1)], kwargs)
+                for t, offset, segI in index:
+                    with open(vcd.segments[segI]["file"]) as f:
+                        vcd_str = f.read()
+                    self.assertTrue(vcd_str.startswith(f"#{t:d}\n$dumpall\n", offset), (kwargs, t))
+
+    def _gated_example(self, configure):
+        out = StringIO()
+        vcd = VcdWriter(out)
+        with vcd.varScope("unit0") as m:
+            m.addVar("a", "a", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter())
+            with m.varScope("sub") as sub:
+                sub.addVar("b", "b", VCD_SIG_TYPE.WIRE, 4, VcdBitsFormatter())
+        vcd.enddefinitions()
+        configure(vcd, m, sub)
+        for t in range(6):
+            vcd.logChange(t, "a", MaskedValue(t & 1, 1), None)
+            vcd.logChange(t, "b", MaskedValue(t, 0xf), None)
+        return out.getvalue()
+
+    def test_dump_windows(self):
+        def configure(vcd, m, sub):
+            vcd.setDumpWindows([(1, 3), (5, 10)])
+
+        vcd_str = self._gated_example(configure)
+        # $dumpon contains values before the change in the same time
+        self.assertEqual(vcd_str.split("$enddefinitions $end\n")[1], """\
+#0
+$dumpoff
+x!
+bx "
+$end
+#1
+$dumpon
+0!
+b0000 "
+$end
+1!
+b0001 "
+#2
+0!
+b0010 "
+#3
+$dumpoff
+x!
+bx "
+$end
+#5
+$dumpon
+0!
+b0100 "
+$end
+1!
+b0101 "
+""")
+        vcd_in = VcdParser()
+        vcd_in.parse_str(vcd_str)
+        self.assertEqual(vcd_in.scope.children["unit0"].children["a"].data,
+                         [(0, "x"), (1, "0"), (1, "1"), (2, "0"), (3, "x"), (5, "0"), (5, "1")])
+
+    def test_dump_off_on(self):
+        def configure(vcd, m, sub):
+            vcd.enableDumpGating()
+            vcd.logChange(0, "a", MaskedValue(1, 1), None)
+            vcd.dumpOff(0)
+            vcd.logChange(0, "b", MaskedValue(1, 0xf), None)
+            vcd.dumpOn(0)
+
+        vcd_str = self._gated_example(configure)
+        self.assertTrue(vcd_str.split("$enddefinitions $end\n")[1].startswith("""\
+#0
+1!
+$dumpoff
+x!
+bx "
+$end
+$dumpon
+1!
+b0001 "
+$end
+"""), vcd_str)
+        VcdParser().parse_str(vcd_str)
+
+    def test_dump_off_scope(self):
+        out = StringIO()
+        vcd = VcdWriter(out)
+        with vcd.varScope("unit0") as m:
+            m.addVar("a", "a", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter())
+            with m.varScope("sub") as sub:
+                sub.addVar("b", "b", VCD_SIG_TYPE.WIRE, 4, VcdBitsFormatter())
+        vcd.enddefinitions()
+        vcd.enableDumpGating()
+        vcd.logChange(0, "b", MaskedValue(1, 0xf), None)
+        vcd.dumpOffScope(sub, 1)
+        vcd.logChange(1, "b", MaskedValue(2, 0xf), None)
+        vcd.logChange(2, "a", MaskedValue(1, 1), None)
+        vcd.dumpOnScope(sub, 3)
+        vcd.dumpOffScope(m, 4)
+        vcd.dumpOnScope(m, 5)
+        self.assertEqual(out.getvalue().split("$enddefinitions $end\n")[1], """\
+#0
+b0001 "
+#1
+bx "
+#2
+1!
+#3
+b0010 "
+#4
+x!
+bx "
+#5
+1!
+b0010 "
+""")
+
+    def test_addHierarchy(self):
+        ref = StringIO()
+        vcd = VcdWriter(ref)
+        with vcd.varScope("unit0") as m:
+            m.addVar("a", "a", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter())
+            with m.varScope("sub") as sub:
+                sub.addVar("b", "b", VCD_SIG_TYPE.WIRE, 8, VcdBitsFormatter())
+            m.addVar("c", "c", VCD_SIG_TYPE.WIRE, 2, VcdBitsFormatter())
+        vcd.enddefinitions()
+        vcd.logChange(0, "b", MaskedValue(3, 0xff), None)
+
+        for byPath in (False, True):
+            out = StringIO()
+            vcd = VcdWriter(out)
+            if byPath:
+                top = vcd.addVarsByPath([
+                    ("unit0.a", "a", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter),
+                    ("unit0.sub.b", "b", VCD_SIG_TYPE.WIRE, 8, VcdBitsFormatter),
+                    ("unit0.c", "c", VCD_SIG_TYPE.WIRE, 2, VcdBitsFormatter),
+                ])
+            else:
+                top = vcd.addHierarchy({
+                    "unit0": {
+                        "a": ("a", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter),
+                        "sub": {"b": ("b", VCD_SIG_TYPE.WIRE, 8, VcdBitsFormatter)},
+                        "c": ("c", VCD_SIG_TYPE.WIRE, 2, VcdBitsFormatter),
+                    }
+                })
+            vcd.enddefinitions()
+            vcd.logChange(0, "b", MaskedValue(3, 0xff), None)
+            self.assertEqual(out.getvalue(), ref.getvalue())
+            self.assertEqual([s.name for s in top], ["unit0"])
+            self.assertEqual(list(top[0].children.keys()), ["a", "sub", "c"])
+            with self.assertRaises(VarAlreadyRegistered):
+                vcd.addVarsByPath([("unit1.a", "a", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter)])
+
+    def test_addHierarchy_duplicate_names(self):
+        out = StringIO()
+        vcd = VcdWriter(out)
+        vcd.addHierarchy({"unit0": {"a": ("a", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter)}})
+        header = out.getvalue()
+        # top scope with the same name as existing one
+        with self.assertRaises(NameAlreadyRegistered):
+            vcd.addHierarchy({"unit0": {"b": ("b", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter)}})
+        # the same path registered twice
+        with self.assertRaises(NameAlreadyRegistered):
+            vcd.addVarsByPath([
+                ("unit1.b", "b", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter),
+                ("unit1.b", "b1", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter),
+            ])
+        # name used for variable and scope
+        with self.assertRaises(NameAlreadyRegistered):
+            vcd.addVarsByPath([
+                ("unit1.b", "b", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter),
+                ("unit1.b.c", "c", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter),
+            ])
+        # nothing is registered or written on error
+        self.assertEqual(out.getvalue(), header)
+        self.assertEqual([s.name for s in vcd.scopes], ["unit0"])
+        self.assertNotIn("b", vcd._idScope)
+
+    def test_allocateIds(self):
+        s = VcdVarIdScope()
+        ids = s.allocateIds(5) + s.allocateIds(94 * 94 + 100)
+        self.assertEqual(ids, [s._idToStr(i) for i in range(len(ids))])
+        self.assertEqual(s._nextId, len(ids))
+
+    def test_profiling(self):
+        out = StringIO()
+        report = StringIO()
+        vcd = VcdWriter(out)
+        with vcd.varScope("unit0") as m:
+            m.addVar("a", "a", VCD_SIG_TYPE.WIRE, 1, VcdBitsFormatter())
+            with m.varScope("sub") as sub:
+                sub.addVar("b", "b", VCD_SIG_TYPE.WIRE, 8, VcdBitsFormatter())
+        vcd.enddefinitions()
+        ref = out.getvalue()
+        vcd.enableProfiling(topN=1, reportFile=report)
+        for t in range(10):
+            vcd.logChange(t, "a", MaskedValue(t & 1, 1), None)
+            if t % 3 == 0:
+                vcd.logChange(t, "b", MaskedValue(t, 0xff), None)
+        vcd.close()
+
+        r = vcd.getProfilingReport()
+        self.assertEqual([(v["name"], v["changes"], v["bytes"]) for v in r["vars"]], [
+            ("unit0.sub.b", 4, 4 * len('b00000000 "\n')),
+            ("unit0.a", 10, 10 * len("0!\n")),
+        ])
+        self.assertEqual([(s["name"], s["changes"], s["bytes"]) for s in r["scopes"]], [
+            ("unit0", 14, 30 + 48),
+            ("unit0.sub", 4, 48),
+        ])
+        # profiling does not change the output
+        self.assertEqual(len(out.getvalue()) - len(ref), 78 + sum(len(f"#{t:d}\n") for t in range(10)))
+        noisiest = report.getvalue().split("Scopes:")[0]
+        self.assertIn("unit0.sub.b\n", noisiest)
+        self.assertNotIn("unit0.a\n", noisiest)
+
 
 if __name__ == "__main__":
     testLoader = unittest.TestLoader()